@@ -0,0 +1,179 @@
+"""
+Vectorized CPS recodes (scripts/data_processing/cps_recode.py) against the
+row-wise functions of notebooks/03_cps_microdata_processing.ipynb.
+
+Recodes a synthetic CPS extract (synthetic.cps_extract) both ways:
+- rowwise: the notebook's Python functions called per row with `map_elements`;
+- vectorized: the `cps_recode` expressions.
+Both must give the same columns; then the best time of each is reported.
+The notebook functions are also checked against the edge cases listed in
+`cps_recode.CHECKS`, which `cps_recode.check()` runs on the expressions.
+
+Usage (from the repository root):
+    python benchmarks/bench_cps_recode.py --rows 100000 1000000 5000000
+"""
+
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent / "scripts" / "data_processing"))
+sys.path.append(str(Path(__file__).parent))
+
+import argparse
+import math
+import time
+
+import polars as pl
+from polars.testing import assert_frame_equal
+from rich import print
+
+import synthetic
+import cps_recode
+
+
+def recode_higrade(val):
+    '''Recode HIGRADE (pre-1992) to 4 categories'''
+    try:
+        if val is None:
+            return None
+        v = float(val)
+    except Exception:
+        return None
+    if v < 31 or v == 999:
+        return None
+    elif 31 <= v < 150:
+        return 'BH'  # Below High School
+    elif v == 150:
+        return 'HS'  # High School
+    elif 150 < v < 190:
+        return 'SC'  # Some College
+    elif v >= 190:
+        return 'CG'  # College Graduate
+    return None
+
+
+def recode_educ99(val):
+    '''Recode EDUC99 (post-1992) to 4 categories'''
+    try:
+        if val is None:
+            return None
+        v = float(val)
+    except Exception:
+        return None
+    if v <= 1:
+        return None
+    elif 1 < v < 9:
+        return 'BH'
+    elif v == 10:
+        return 'HS'
+    elif 10 < v < 15:
+        return 'SC'
+    elif v >= 15:
+        return 'CG'
+    return None
+
+
+def recode_age(age):
+    if age <= 20:
+        return '01'
+    elif age <= 25:
+        return '02'
+    elif age <= 30:
+        return '03'
+    elif age <= 35:
+        return '04'
+    elif age <= 40:
+        return '05'
+    elif age <= 45:
+        return '06'
+    elif age <= 50:
+        return '07'
+    elif age <= 55:
+        return '08'
+    elif age <= 60:
+        return '09'
+    elif age <= 65:
+        return '10'
+    elif age <= 70:
+        return '11'
+    return None
+
+
+def recode_race(race):
+    if race == 100:
+        return 'W'  # White
+    elif race == 200:
+        return 'B'  # Black
+    else:
+        return 'O'  # Other
+
+
+def _to_float(x):
+    try:
+        if x is None:
+            return None
+        s = str(x).strip()
+        if s == '' or s.upper() in {'NA', 'N/A', 'NULL', '.'}:
+            return None
+        return float(s)
+    except Exception:
+        return None
+
+
+def check_notebook():
+    """The notebook functions return the outputs listed in cps_recode.CHECKS."""
+    notebook = {"recode_higrade": recode_higrade, "recode_educ99": recode_educ99,
+                "recode_age": recode_age, "recode_race": recode_race, "to_float": _to_float}
+    for name, (inputs, expected) in cps_recode.CHECKS.items():
+        # map_elements skips nulls; "NaN" text is NaN in the notebook and null in cps_recode
+        got = [None if v is None else notebook[name](v) for v in inputs]
+        got = [None if isinstance(g, float) and math.isnan(g) else g for g in got]
+        assert got == expected, f"{name}: {list(zip(inputs, got, expected))}"
+
+
+def rowwise(df):
+    return df.select(
+        pl.col("HIGRADE").map_elements(recode_higrade, return_dtype=pl.String).alias("EDUCAT_1"),
+        pl.col("EDUC99").map_elements(recode_educ99, return_dtype=pl.String).alias("EDUCAT_2"),
+        pl.col("AGE").map_elements(recode_age, return_dtype=pl.String).alias("AGEGROUP"),
+        pl.col("RACE").map_elements(recode_race, return_dtype=pl.String).alias("RACEGROUP"),
+        *[pl.col(c).map_elements(_to_float, return_dtype=pl.Float64) for c in ["WKSWORK1", "UHRSWORKLY", "INCWAGE"]],
+    )
+
+
+def vectorized(df):
+    return df.lazy().with_columns(
+        cps_recode.to_float(c) for c in ["HIGRADE", "EDUC99", "WKSWORK1", "UHRSWORKLY", "INCWAGE"]
+    ).select(
+        cps_recode.recode_higrade("HIGRADE").alias("EDUCAT_1"),
+        cps_recode.recode_educ99("EDUC99").alias("EDUCAT_2"),
+        cps_recode.recode_age("AGE").alias("AGEGROUP"),
+        cps_recode.recode_race("RACE").alias("RACEGROUP"),
+        "WKSWORK1", "UHRSWORKLY", "INCWAGE",
+    ).collect()
+
+
+def best_of(func, *args, repeat=3):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the vectorized CPS recodes against map_elements.")
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 1_000_000],
+                        help="Numbers of CPS records to recode")
+    parser.add_argument("--repeat", type=int, default=3, help="Repetitions per size (best is reported)")
+    args = parser.parse_args()
+
+    check_notebook()
+    cps_recode.check()
+    print(f"{'rows':>10} {'rowwise (s)':>12} {'vectorized (s)':>15} {'speedup':>8}")
+    for n_rows in args.rows:
+        df = pl.from_pandas(synthetic.cps_extract(n_rows))
+        assert_frame_equal(vectorized(df), rowwise(df))
+        slow = best_of(rowwise, df, repeat=args.repeat)
+        fast = best_of(vectorized, df, repeat=args.repeat)
+        print(f"{n_rows:>10} {slow:>12.3f} {fast:>15.3f} {slow / fast:>7.1f}x")
@@ -0,0 +1,70 @@
+"""
+Scaling of the labor share / output lookup in merge_al_data_industry.py.
+
+Builds synthetic labor share/output tables for an increasing number of
+production account codes and times selecting every code's L_SHARE and
+OUTPUT series:
+- scan: the previous boolean filter on "Production Account Codes" of the
+  wide tables (layout of extend_KORV/data/interim/labor_share.csv),
+  transpose and .loc[years], once per industry (quadratic in the number of
+  codes);
+- indexed: `load_klems_panel` of the long table (layout of
+  extend_KORV/data/interim/labor_share_output.csv) once, then
+  `klems_industry` per code.
+
+Usage (from the repository root):
+    python benchmarks/bench_klems_lookup.py --codes 60 300 1000 3000
+"""
+
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent / "scripts" / "data_processing"))
+sys.path.append(str(Path(__file__).parent))
+
+import argparse
+import time
+
+import pandas as pd
+from rich import print
+
+import synthetic
+from merge_al_data_industry import klems_industry, load_klems_panel
+
+
+def scan_lookup(labor_share, output, codes):
+    for code in codes:
+        labor_share_ind = labor_share.loc[labor_share["Production Account Codes"] == code]
+        output_ind = output.loc[output["Production Account Codes"] == code]
+        years = [y for y in labor_share_ind.columns if y.isdigit()]
+        pd.merge(labor_share_ind.T.loc[years], output_ind.T.loc[years], left_index=True, right_index=True)
+
+
+def indexed_lookup(long, codes):
+    panel = load_klems_panel(long)
+    for code in codes:
+        klems_industry(panel, code)
+
+
+def best_of(func, *args, repeat=3):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the per-industry labor share/output lookup.")
+    parser.add_argument("--codes", type=int, nargs="+", default=[60, 300, 1000, 3000],
+                        help="Numbers of production account codes to benchmark")
+    parser.add_argument("--repeat", type=int, default=3, help="Repetitions per size (best is reported)")
+    args = parser.parse_args()
+
+    print(f"{'codes':>7} {'scan (s)':>10} {'indexed (s)':>12} {'speedup':>8}")
+    for n_codes in args.codes:
+        codes, labor_share, output = synthetic.klems_wide_tables(n_codes)
+        _, long = synthetic.klems_long_table(n_codes)
+        scan = best_of(scan_lookup, labor_share, output, codes, repeat=args.repeat)
+        indexed = best_of(indexed_lookup, long, codes, repeat=args.repeat)
+        print(f"{n_codes:>7} {scan:>10.3f} {indexed:>12.3f} {scan / indexed:>7.1f}x")
@@ -0,0 +1,308 @@
+"""
+Benchmarks of the ETL and manuscript-table stages on synthetic data.
+
+Each stage is timed on synthetic inputs (see synthetic.py) for every
+(industries, years) size in the grid. Nothing is downloaded and nothing under
+data/ is read or written; files go to a temporary directory.
+
+Stages:
+- reshape: `process_capital_data.reshape_tables` on raw BEA tables
+- labor_share: `labor_share_and_output_by_ind` load + long table (34 years)
+- merge: the per-industry loop of `merge_al_data_industry` (capital
+  aggregation and one file per industry); the output covers the KLEMS years
+  1987-2020 whatever the number of years, like the real merge
+- trends: trend variables, stacking and batched OLS of Table 2
+- decades: `period_summary` of every industry by decade
+- io_csv, io_parquet: writing and reading the panels as one CSV per industry
+  or one Parquet file (requires pyarrow)
+
+Every measurement is appended as one JSON line to the results file with the
+git commit, sizes, rows, best-of-N seconds, rows/s and the peak memory
+allocated during one extra run (tracemalloc), so runs on different commits
+can be compared.
+
+Usage (from the repository root):
+    python benchmarks/run_benchmarks.py                                   # default grid
+    python benchmarks/run_benchmarks.py --industries 10 1000 10000 --years 30 200 --stages trends decades
+    python benchmarks/run_benchmarks.py --compare                         # last two commits in the results file
+"""
+
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent / "scripts" / "data_processing"))
+sys.path.append(str(Path(__file__).parent))
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import shutil
+import subprocess
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+from rich import print
+
+import synthetic
+
+RESULTS_FILE = Path(__file__).parent / "results" / "results.jsonl"
+DEFAULT_INDUSTRIES = [10, 100, 1000]
+DEFAULT_YEARS = [30, 100]
+
+try:
+    import pyarrow  # noqa: F401
+except ImportError:  # pragma: no cover - optional dependency
+    pyarrow = None
+
+
+@contextlib.contextmanager
+def quiet():
+    """Silence the progress prints of the stage code."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield
+
+
+@contextlib.contextmanager
+def working_directory(path):
+    """Run the enclosed block from `path` (the stages use relative paths)."""
+    previous = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+
+# ----------------------------------------------------------------------------
+# Stages. Each prepares its inputs under `workdir` and returns (rows, run),
+# where `run` is the zero-argument callable that is timed.
+# ----------------------------------------------------------------------------
+def stage_reshape(n_industries, n_years, workdir):
+    from process_capital_data import load_tables, reshape_tables
+
+    raw_dir = os.path.join(workdir, "raw", "")
+    os.makedirs(raw_dir)
+    for name, table in synthetic.bea_raw_tables(n_industries, n_years).items():
+        table.to_csv(raw_dir + name + ".csv", sep=";", index=False)
+    with quiet():
+        data_dict = load_tables(raw_dir)
+    rows = sum(len(df) for df in data_dict.values()) * n_years
+    return rows, lambda: reshape_tables(data_dict)
+
+
+def stage_labor_share(n_industries, n_years, workdir):
+    from labor_share_and_output_by_ind import TABLES, build_long, load_codes, load_tables
+
+    klems_dir = os.path.join(workdir, "klems", "")
+    os.makedirs(klems_dir)
+    with open(klems_dir + "NAICS codes.csv", "w") as f:
+        f.write("Synthetic NAICS codes\nGenerated by benchmarks/synthetic.py\n")
+        synthetic.naics_codes(n_industries).to_csv(f, index=False)
+    for name, table in synthetic.klems_account_tables(n_industries).items():
+        with open(klems_dir + TABLES[name], "w") as f:
+            f.write(f"Synthetic {name}\n")
+            table.to_csv(f)
+
+    def run():
+        codes = load_codes(klems_dir)
+        build_long(codes, *load_tables(codes, klems_dir))
+
+    return n_industries * len(synthetic.KLEMS_YEARS), run
+
+
+def stage_merge(n_industries, n_years, workdir):
+    import merge_al_data_industry as merge
+    import schema
+
+    # Years end in 2020 like the KLEMS tables; capital years before 1947 are dropped by the merge
+    start = 2021 - n_years
+    years = synthetic.years_from(start, n_years)
+    codes, long = synthetic.klems_long_table(n_industries)
+    klems = merge.load_klems_panel(long)
+    gdp_def = pd.DataFrame({"value": np.linspace(0.5, 1.2, len(years))},
+                           index=pd.Index(schema.to_years(years), name="date"))
+    components = synthetic.capital_components(n_industries, n_years, start=start)
+    labor_dir = os.path.join(workdir, "data", "interim", "ind_labor")
+    os.makedirs(labor_dir)
+    os.makedirs(os.path.join(workdir, "data", "proc", "ind"))
+    for code, df in synthetic.labor_panels(n_industries, n_years, start=start).items():
+        df.to_csv(os.path.join(labor_dir, f"{code}.csv"), index=False)
+
+    def run():
+        capital = merge.aggregate_capital(codes, components)
+        with working_directory(workdir):
+            results = merge.build_all_industries(codes, codes, klems, gdp_def, capital, workers=1)
+        errors = [r for r in results if r[1] == "error"]
+        if errors:
+            raise RuntimeError(f"merge failed for {len(errors)} industries:\n{errors[0][4]}")
+
+    return n_industries * len(set(years) & set(range(1987, 2021))), run
+
+
+def stage_trends(n_industries, n_years, workdir):
+    from generate_manuscript_tables import stack_trend_variables, trend_variables
+    from trends import trend_stats
+
+    panels = synthetic.industry_panels(n_industries, n_years)
+
+    def run():
+        series = {code: trend_variables(df.sort_values("YEAR")) for code, df in panels.items()}
+        years, values, observed = stack_trend_variables(series)
+        trend_stats(years, values, observed=observed)
+
+    return n_industries * n_years, run
+
+
+def stage_decades(n_industries, n_years, workdir):
+    from period_stats import INDUSTRY_VARIABLES, period_summary
+
+    panel = pd.concat(synthetic.industry_panels(n_industries, n_years), names=["industry", None])
+    panel = panel.reset_index(level=0)
+    panel["CAPITAL_RATIO"] = panel.K_EQ / panel.K_STR
+    return len(panel), lambda: period_summary(panel, INDUSTRY_VARIABLES, length=10, by="industry")
+
+
+def stage_io_csv(n_industries, n_years, workdir):
+    panels = synthetic.industry_panels(n_industries, n_years)
+    out_dir = os.path.join(workdir, "csv")
+    os.makedirs(out_dir)
+
+    def run():
+        for code, df in panels.items():
+            df.to_csv(os.path.join(out_dir, f"{code}.csv"), index=False)
+        for code in panels:
+            pd.read_csv(os.path.join(out_dir, f"{code}.csv"), float_precision="round_trip")
+
+    return n_industries * n_years, run
+
+
+def stage_io_parquet(n_industries, n_years, workdir):
+    panel = pd.concat(synthetic.industry_panels(n_industries, n_years), names=["industry", None])
+    panel = panel.reset_index(level=0).reset_index(drop=True)
+    path = os.path.join(workdir, "panel.parquet")
+
+    def run():
+        panel.to_parquet(path, index=False)
+        pd.read_parquet(path)
+
+    return len(panel), run
+
+
+STAGES = {
+    "reshape": stage_reshape,
+    "labor_share": stage_labor_share,
+    "merge": stage_merge,
+    "trends": stage_trends,
+    "decades": stage_decades,
+    "io_csv": stage_io_csv,
+    "io_parquet": stage_io_parquet,
+}
+
+
+def dir_size(path):
+    return sum(f.stat().st_size for f in Path(path).rglob("*") if f.is_file())
+
+
+def measure(stage, n_industries, n_years, repeat=3):
+    """Time `stage` at one size: best of `repeat` runs, then one run under tracemalloc."""
+    workdir = tempfile.mkdtemp(prefix=f"bench-{stage}-")
+    try:
+        rows, run = STAGES[stage](n_industries, n_years, workdir)
+        setup_bytes = dir_size(workdir)
+        times = []
+        with quiet():
+            for _ in range(repeat):
+                start = time.perf_counter()
+                run()
+                times.append(time.perf_counter() - start)
+            tracemalloc.start()
+            run()
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+        written = dir_size(workdir) - setup_bytes
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    seconds = min(times)
+    return {
+        "stage": stage,
+        "industries": n_industries,
+        "years": n_years,
+        "rows": rows,
+        "seconds": round(seconds, 6),
+        "rows_per_s": round(rows / seconds, 1) if seconds > 0 else None,
+        "peak_mb": round(peak / 1024**2, 3),
+        "bytes_written": written,
+    }
+
+
+def git_commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=Path(__file__).parent,
+                             capture_output=True, text=True, check=True)
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def load_results(path=RESULTS_FILE):
+    if not Path(path).is_file():
+        return []
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def compare_commits(results):
+    """Print seconds per (stage, size) for the last two commits in `results`."""
+    commits = list(dict.fromkeys(r["commit"] for r in results))
+    if len(commits) < 2:
+        print(f"[bold red]Need results from two commits to compare, found {len(commits)}")
+        return
+    before, after = commits[-2], commits[-1]
+    latest = {}
+    for r in results:
+        latest[(r["commit"], r["stage"], r["industries"], r["years"])] = r
+    print(f"{'stage':<12} {'industries':>10} {'years':>6} {before:>12} {after:>12} {'change':>8}")
+    for (commit, stage, n, t), r in latest.items():
+        if commit != after or (before, stage, n, t) not in latest:
+            continue
+        a, b = latest[(before, stage, n, t)]["seconds"], r["seconds"]
+        print(f"{stage:<12} {n:>10} {t:>6} {a:>11.3f}s {b:>11.3f}s {(b - a) / a * 100:>+7.1f}%")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the ETL and table stages on synthetic data.")
+    parser.add_argument("--industries", type=int, nargs="+", default=DEFAULT_INDUSTRIES)
+    parser.add_argument("--years", type=int, nargs="+", default=DEFAULT_YEARS)
+    parser.add_argument("--stages", nargs="+", choices=list(STAGES), default=list(STAGES))
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per measurement (best is kept)")
+    parser.add_argument("--out", default=str(RESULTS_FILE), help="JSON lines file the results are appended to")
+    parser.add_argument("--compare", action="store_true", help="Compare the last two commits in --out and exit")
+    args = parser.parse_args()
+
+    if args.compare:
+        compare_commits(load_results(args.out))
+        sys.exit(0)
+
+    stages = [s for s in args.stages if s != "io_parquet" or pyarrow is not None]
+    if len(stages) < len(args.stages):
+        print("[bold yellow]pyarrow is not installed; skipping io_parquet")
+    context = {"commit": git_commit(), "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+               "python": platform.python_version(), "pandas": pd.__version__, "machine": platform.node()}
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+    print(f"{'stage':<12} {'industries':>10} {'years':>6} {'rows':>10} {'seconds':>9} {'rows/s':>12} {'peak MB':>8}")
+    with open(args.out, "a") as out:
+        for stage in stages:
+            for n_industries in args.industries:
+                for n_years in args.years:
+                    result = measure(stage, n_industries, n_years, repeat=args.repeat)
+                    out.write(json.dumps({**context, **result}) + "\n")
+                    out.flush()
+                    print(f"{stage:<12} {n_industries:>10} {n_years:>6} {result['rows']:>10} "
+                          f"{result['seconds']:>9.3f} {result['rows_per_s'] or 0:>12,.0f} {result['peak_mb']:>8.1f}")
+    print(f"[bold green]Results appended to {args.out}")
@@ -0,0 +1,228 @@
+"""
+Synthetic inputs for the benchmarks, in the layouts the ETL stages read.
+
+Sizes are free: any number of industries (10 to 10,000 in the default grids)
+and years (30 to 200). Everything is generated from a seeded random
+generator, so the same call always gives the same data, and nothing is read
+from the network or from data/.
+
+- bea_raw_tables: raw BEA fixed-asset tables (process_capital_data.py input),
+  with decimal commas like the R fetcher writes them.
+- klems_account_tables / naics_codes: KLEMS production account tables
+  (labor_share_and_output_by_ind.py input). The real files have 34 year
+  columns (1987-2020) and are read with a fixed column range, so these
+  always have 34 years.
+- klems_long_table, labor_panels, capital_components: the inputs of the
+  per-industry merge (merge_al_data_industry.py); klems_wide_tables holds
+  the same values in the previous wide layout.
+- industry_panels: per-industry panels with the columns of data/proc/ind.
+- cps_extract: IPUMS CPS ASEC microdata with the columns of
+  data/raw/cps_00022.csv, including the blanks and NA entries of the text
+  fields.
+"""
+
+import numpy as np
+import pandas as pd
+
+KLEMS_YEARS = list(range(1987, 2021))
+PANEL_COLUMNS = ["YEAR", "L_SHARE", "OUTPUT", "K_STR", "K_EQ", "REL_P_EQ", "DPR_ST", "DPR_EQ",
+                 "L_S", "L_U", "W_S", "W_U", "SKILL_PREMIUM", "LABOR_INPUT_RATIO"]
+
+
+def industry_codes(n_industries):
+    """`n_industries` distinct four-character codes (BEAIND-like, hexadecimal)."""
+    return [f"{i:04X}" for i in range(n_industries)]
+
+
+def years_from(start, n_years):
+    return list(range(start, start + n_years))
+
+
+def _random_walks(rng, n_series, n_years, level=100.0, drift=0.02, scale=0.05):
+    """Positive series that grow at `drift` per year with lognormal noise."""
+    steps = rng.normal(drift, scale, size=(n_series, n_years))
+    return level * rng.uniform(0.5, 2.0, size=(n_series, 1)) * np.exp(np.cumsum(steps, axis=1))
+
+
+def bea_raw_tables(n_industries, n_years, tables=("FAAt401", "FAAt402", "FAAt404"), start=1947, seed=0):
+    """Raw BEA tables keyed by table name, as `process_capital_data.load_tables` reads them."""
+    rng = np.random.default_rng(seed)
+    codes = industry_codes(n_industries)
+    years = years_from(start, n_years)
+    raw = {}
+    for table in tables:
+        values = _random_walks(rng, n_industries, n_years)
+        text = np.char.replace(np.char.mod("%.3f", values), ".", ",")
+        text = pd.DataFrame(text, columns=[f"DataValue_{y}" for y in years])
+        meta = pd.DataFrame({
+            "TableName": table,
+            "SeriesCode": [f"k1n{code}0" for code in codes],
+            "LineNumber": np.arange(1, n_industries + 1),
+            "LineDescription": [f"Industry {code}" for code in codes],
+            "METRIC_NAME": "Current Dollars",
+            "CL_UNIT": "Level",
+            "UNIT_MULT": 6,
+        })
+        raw[table] = pd.concat([meta, text], axis=1)
+    return raw
+
+
+def naics_codes(n_industries):
+    """NAICS codes table: description, production account code, 2007 NAICS codes."""
+    codes = industry_codes(n_industries)
+    return pd.DataFrame({
+        "Descriptions": [f"Industry {code}" for code in codes],
+        "Production Account Codes": [f" {code}" for code in codes],  # the real file pads some codes
+        "2007 NAICS codes": codes,
+    })
+
+
+def klems_account_tables(n_industries, seed=0):
+    """KLEMS production account tables keyed by labor_share_and_output_by_ind.TABLES name."""
+    rng = np.random.default_rng(seed)
+    descriptions = [f"Industry {code}" for code in industry_codes(n_industries)]
+    n_years = len(KLEMS_YEARS)
+    value_added = _random_walks(rng, n_industries, n_years, level=1000.0)
+    college_share = rng.uniform(0.1, 0.4, size=(n_industries, 1))
+    labor = value_added * rng.uniform(0.4, 0.7, size=(n_industries, n_years))
+    values = {
+        "comp_college": labor * college_share,
+        "comp_no_college": labor * (1 - college_share),
+        "value_added": value_added,
+        "output": value_added * rng.uniform(1.5, 2.5, size=(n_industries, 1)),
+    }
+    return {
+        name: pd.DataFrame(v, index=pd.Index(descriptions, name="Industry Description"),
+                           columns=[str(y) for y in KLEMS_YEARS])
+        for (name, v) in values.items()
+    }
+
+
+def klems_wide_tables(n_industries, seed=0):
+    """Wide labor share and output tables in the layout of extend_KORV/data/interim/labor_share.csv."""
+    rng = np.random.default_rng(seed)
+    codes = industry_codes(n_industries)
+    years = [str(y) for y in KLEMS_YEARS]
+    tables = []
+    for scale in (1.0, 1000.0):
+        table = pd.DataFrame(rng.random((n_industries, len(years))) * scale, columns=years)
+        table.insert(0, "Industry Description", [f"Industry {c}" for c in codes])
+        table["Production Account Codes"] = codes
+        table["2007 NAICS codes"] = codes
+        tables.append(table)
+    return codes, tables[0], tables[1]
+
+
+def klems_long_table(n_industries, seed=0):
+    """The values of `klems_wide_tables` in the layout of extend_KORV/data/interim/labor_share_output.csv."""
+    codes, labor_share, output = klems_wide_tables(n_industries, seed)
+    years = [str(y) for y in KLEMS_YEARS]
+    long = pd.DataFrame({
+        "code": np.repeat(codes, len(years)),
+        "year": np.tile(KLEMS_YEARS, len(codes)).astype(np.int16),
+        "L_SHARE": labor_share[years].to_numpy().ravel(),
+        "OUTPUT": output[years].to_numpy().ravel(),
+    })
+    return codes, long
+
+
+def industry_panels(n_industries, n_years, start=1947, seed=0):
+    """Per-industry panels keyed by code, with the columns of data/proc/ind."""
+    rng = np.random.default_rng(seed)
+    codes = industry_codes(n_industries)
+    years = np.asarray(years_from(start, n_years))
+    walks = {c: _random_walks(rng, n_industries, n_years) for c in ["OUTPUT", "K_STR", "K_EQ", "L_S", "L_U", "W_S", "W_U"]}
+    shares = {c: rng.uniform(0.0, 1.0, size=(n_industries, n_years))
+              for c in ["L_SHARE", "REL_P_EQ", "DPR_ST", "DPR_EQ"]}
+    panels = {}
+    for i, code in enumerate(codes):
+        df = pd.DataFrame({"YEAR": years, **{c: v[i] for c, v in {**walks, **shares}.items()}})
+        df["SKILL_PREMIUM"] = df.W_S / df.W_U
+        df["LABOR_INPUT_RATIO"] = df.L_S / df.L_U
+        panels[code] = df[PANEL_COLUMNS]
+    return panels
+
+
+def labor_panels(n_industries, n_years, start=1947, seed=0):
+    """Per-industry labor files (data/interim/ind_labor layout) keyed by code."""
+    rng = np.random.default_rng(seed)
+    years = np.asarray(years_from(start, n_years))
+    columns = ["L_S", "L_U", "W_S", "W_U"]
+    values = {c: _random_walks(rng, n_industries, n_years) for c in columns}
+    panels = {}
+    for i, code in enumerate(industry_codes(n_industries)):
+        df = pd.DataFrame({"YEAR": years, **{c: values[c][i] for c in columns}})
+        df["SKILL_PREMIUM"] = df.W_S / df.W_U
+        df["LABOR_INPUT_RATIO"] = df.L_S / df.L_U
+        panels[code] = df
+    return panels
+
+
+def capital_components(n_industries, n_years, start=1947, seed=0):
+    """Capital components indexed by (code, YEAR), as `load_capital_components` returns them."""
+    rng = np.random.default_rng(seed)
+    codes = industry_codes(n_industries)
+    years = np.asarray(years_from(start, n_years), dtype=np.int16)
+    index = pd.MultiIndex.from_product([codes, years], names=["code", "YEAR"])
+    n = len(index)
+    return pd.DataFrame({
+        "K_STR": _random_walks(rng, n_industries, n_years).ravel(),
+        "K_EQ": _random_walks(rng, n_industries, n_years).ravel(),
+        "REL_P_EQ": rng.uniform(0.5, 1.5, n),
+        "DPR_ST": rng.uniform(0.01, 0.05, n),
+        "DPR_EQ": rng.uniform(0.1, 0.2, n),
+    }, index=index)
+
+
+# Codes drawn for the CPS extract, including the ones the recodes drop
+CPS_CODES = {
+    "RACE": [100, 200, 300, 651, 801],
+    "CLASSWLY": [0, 10, 13, 14, 20, 22, 24, 25, 27, 28, 29],
+    "HIGRADE": [0, 10, 31, 100, 140, 150, 160, 181, 190, 200, 999],
+    "EDUC99": [0, 1, 4, 8, 9, 10, 11, 13, 14, 15, 16, 17],
+    "IND1990": [10, 31, 40, 50, 60, 100, 171, 180, 700, 812, 940, 0],
+}
+
+
+def _text(values, missing=None, na=None, na_share=0.0, rng=None):
+    """Integers as text, blank where equal to `missing` and `na` in a `na_share` of rows."""
+    text = values.astype(str).astype(object)
+    if missing is not None:
+        text[values == missing] = ""
+    if na is not None:
+        text[rng.random(len(values)) < na_share] = na
+    return text
+
+
+def cps_extract(n_rows, start=1968, end=2019, seed=0):
+    """CPS ASEC person records (IPUMS layout): HIGRADE before 1992, EDUC99 after, HFLAG in 2014.
+
+    HIGRADE, EDUC99, WKSWORK1 and UHRSWORKLY are text with blanks and NA
+    entries, like the fields the notebook had to coerce.
+    """
+    rng = np.random.default_rng(seed)
+    year = rng.integers(start, end + 1, n_rows)
+    asecwt = np.round(rng.uniform(100, 3000, n_rows), 2)
+    asecwt[rng.random(n_rows) < 0.02] = np.nan
+    hflag = pd.array(np.where(year == 2014, rng.integers(0, 2, n_rows), -1), dtype="Int64")
+    hflag[year != 2014] = pd.NA
+    higrade = np.where(year < 1992, rng.choice(CPS_CODES["HIGRADE"], n_rows), -1)
+    educ99 = np.where(year >= 1992, rng.choice(CPS_CODES["EDUC99"], n_rows), -1)
+    return pd.DataFrame({
+        "YEAR": year,
+        "SERIAL": rng.integers(1, 10**6, n_rows),
+        "ASECWT": asecwt,
+        "HFLAG": hflag,
+        "AGE": rng.integers(0, 90, n_rows),
+        "SEX": rng.integers(1, 3, n_rows),
+        "RACE": rng.choice(CPS_CODES["RACE"], n_rows),
+        "HIGRADE": _text(higrade, missing=-1),
+        "EDUC99": _text(educ99, missing=-1),
+        "CLASSWLY": rng.choice(CPS_CODES["CLASSWLY"], n_rows),
+        "WKSWORK1": _text(rng.integers(0, 53, n_rows), na="NA", na_share=0.01, rng=rng),
+        "WKSWORK2": rng.integers(0, 7, n_rows),
+        "UHRSWORKLY": _text(rng.integers(0, 80, n_rows), na=".", na_share=0.005, rng=rng),
+        "INCWAGE": rng.integers(0, 200000, n_rows),
+        "IND1990": rng.choice(CPS_CODES["IND1990"], n_rows),
+        "CPI99": np.round(3.0 - (year - start) * 0.045, 3),
+    })
@@ -8,6 +8,9 @@ ROOT = os.path.abspath(os.path.dirname(__file__))
 # Raw data produced by the R fetcher (get_capital_data.r)
 PATH_RAW_EXTEND = os.path.join(ROOT, "extend_KORV", "data", "raw") + os.sep
 
+# Raw Census QWI pulls written by scripts/data_fetch/qwi_data.py (one file per industry)
+PATH_RAW_QWI = os.path.join(PATH_RAW_EXTEND, "qwi") + os.sep
+
 # Interim files created by older ETL steps (kept for reference)
 PATH_INTERIM_EXTEND = os.path.join(ROOT, "extend_KORV", "data", "interim") + os.sep
 
@@ -18,6 +21,70 @@ PATH_PROC_IND = os.path.join(ROOT, "data", "proc", "ind") + os.sep
 # Path for estimation outputs
 PATH_RESULTS = os.path.join(ROOT, "data", "results") + os.sep
 
+# Optional columnar store: one Parquet file per dataset with one row group per
+# industry. Built from the per-industry CSVs by
+# scripts/data_processing/industry_store.py; the CSVs remain the canonical
+# format read by the Julia estimator.
+PATH_STORE = os.path.join(ROOT, "data", "proc", "store") + os.sep
+STORE_DATASETS = {
+    # dataset name -> directory holding the per-industry CSVs it is built from
+    "ind": PATH_PROC_IND,
+    "results": PATH_RESULTS,
+}
+STORE_PARTITION = "industry"
+
+# Memory-mapped (industry, year, variable) panel of data/proc/ind shared by the
+# analysis scripts; built by scripts/data_processing/panel.py.
+PATH_PANEL = os.path.join(ROOT, "data", "proc", "panel") + os.sep
+
+# Multi-start estimation sweeps (scripts/estimation/multistart.py): the Julia
+# command (override with the JULIA env var), the worker script it runs, and
+# the default grid of starting values (the grid of estimation/runfile_ind.jl;
+# starts with sigma_0 <= rho_0 are skipped) and Nelder-Mead tolerance.
+JULIA_CMD = os.environ.get("JULIA", "julia")
+MULTISTART_WORKER = os.path.join(ROOT, "estimation", "multistart_worker.jl")
+MULTISTART_GRID = {
+    "alpha_0": [0.2],
+    "sigma_0": [0.5, -0.45],
+    "rho_0": [-0.5, 0.45],
+    "eta_0": [0.01, 0.04, 0.3],
+    "mu_0": [0.4],
+    "lambda_0": [0.4],
+    "phi_L_0": [4.0],
+    "phi_H_0": [6.0],
+}
+MULTISTART_TOL = 0.01
+
+# CPS ASEC extract (IPUMS) and the skilled/unskilled labor series built from it
+# by scripts/data_processing/cps_labor.py.
+PATH_CPS_RAW = os.path.join(ROOT, "data", "raw", "cps_00022.csv")
+PATH_LABOR_TOTL = os.path.join(ROOT, "data", "proc", "labor_totl_python.csv")
+# Year-partitioned Parquet cache of the extract (scripts/data_processing/cps_store.py)
+PATH_CPS_STORE = os.path.join(ROOT, "data", "proc", "cps") + os.sep
+# Per-industry labor series read by merge_al_data_industry.py, built from the
+# CPS with the census -> KLEMS industry crosswalk by scripts/data_processing/cps_ind_labor.py
+PATH_IND_LABOR = os.path.join(ROOT, "data", "interim", "ind_labor") + os.sep
+PATH_CROSSWALK = os.path.join(ROOT, "data", "cross_walk.csv")
+
+# Build manifests (input fingerprints per stage) used for incremental rebuilds
+PATH_MANIFEST = os.path.join(ROOT, "data", "manifest") + os.sep
+
+# JSON run logs of the ETL stages (scripts/data_processing/instrument.py). Set
+# ETL_PROFILE=cprofile or ETL_PROFILE=pyinstrument to also write a profile of
+# each run next to its log.
+PATH_RUN_LOGS = os.path.join(ROOT, "data", "logs", "runs") + os.sep
+PROFILE_ENV = "ETL_PROFILE"
+
+# On-disk cache of API responses (scripts/data_fetch/http_cache.py): TTL in
+# seconds per URL prefix (longest match wins; None never expires) and a size
+# cap above which the least recently used responses are evicted.
+PATH_HTTP_CACHE = os.path.join(ROOT, "data", "cache", "http") + os.sep
+HTTP_CACHE_TTL = {
+    "api.census.gov/data/timeseries/qwi": 30 * 86400,
+    "default": 7 * 86400,
+}
+HTTP_CACHE_MAX_BYTES = 2 * 1024**3
+
 # Default location to look for local API key files (can be overridden with env var)
 # Set environment variable CENSUS_API_KEYS_PATH to override this value.
 _DEFAULT_KEYS = os.path.expanduser("~/my_work/census_data_api/api_key/")
@@ -30,3 +97,76 @@ for p in (PATH_RAW_EXTEND, PATH_INTERIM_EXTEND, PATH_PROC_IND, PATH_RESULTS):
     except Exception:
         # Avoid failing import if running in restricted environment; scripts should handle errors.
         pass
+
+
+def store_path(dataset="ind"):
+    """Path of the Parquet file for `dataset` ("ind" or "results")."""
+    if dataset not in STORE_DATASETS:
+        raise ValueError(f"Unknown dataset {dataset!r}; expected one of {sorted(STORE_DATASETS)}")
+    return os.path.join(PATH_STORE, dataset + ".parquet")
+
+
+def store_is_fresh(dataset="ind"):
+    """True if the Parquet file holds exactly the industries of its CSVs and is newer than every CSV."""
+    path = store_path(dataset)
+    if not os.path.isfile(path):
+        return False
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        return False
+    built = os.path.getmtime(path)
+    csv_dir = STORE_DATASETS[dataset]
+    industries = {f[:-4] for f in os.listdir(csv_dir) if f.endswith(".csv")}
+    # As in industry_store.industry_files: results files count only if named
+    # after an industry, so summary tables written there do not matter
+    if dataset != "ind":
+        industries &= {f[:-4] for f in os.listdir(PATH_PROC_IND) if f.endswith(".csv")}
+    stored = pq.read_metadata(path).metadata[b"industries"].decode().split(",")
+    if set(stored) != industries:
+        return False
+    return all(os.path.getmtime(os.path.join(csv_dir, f"{code}.csv")) <= built for code in industries)
+
+
+def load_industries(codes=None, columns=None, dataset="ind"):
+    """Load industries from the Parquet store into one pandas DataFrame.
+
+    Args:
+        codes: industry code or list of codes (KLEMS codes, as in the file
+            names of data/proc/ind); None loads every industry.
+        columns: optional list of columns to read; the industry column is
+            always included.
+        dataset: "ind" for data/proc/ind or "results" for the estimation results.
+
+    Only the row groups of the requested industries are read. Requires
+    pyarrow; build the store first with
+    `python scripts/data_processing/industry_store.py build`.
+    """
+    try:
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError("The columnar store requires pyarrow (pip install pyarrow)") from e
+
+    path = store_path(dataset)
+    if not os.path.isfile(path):
+        raise FileNotFoundError(f"No Parquet store at {path}; run scripts/data_processing/industry_store.py build")
+    if columns is not None:
+        columns = [STORE_PARTITION] + [c for c in columns if c != STORE_PARTITION]
+
+    pf = pq.ParquetFile(path)
+    if codes is None:
+        table = pf.read(columns=columns)
+    else:
+        codes = [codes] if isinstance(codes, str) else list(codes)
+        stored = pf.metadata.metadata[b"industries"].decode().split(",")
+        missing = [c for c in codes if c not in stored]
+        if missing:
+            raise KeyError(f"Industries not in the {dataset} store: {missing}")
+        table = pf.read_row_groups([stored.index(c) for c in codes], columns=columns)
+    return table.to_pandas()
+
+
+def load_industry(code, columns=None, dataset="ind"):
+    """Load a single industry from the Parquet store, without the industry column."""
+    df = load_industries([code], columns=columns, dataset=dataset)
+    return df.drop(columns=STORE_PARTITION)
@@ -83,7 +83,7 @@ end # set_optim_problem
 
 # Solve optimization problem
 function solve_optim_prob(data::Data, model::Model, fixed_param::Float64, η_ω::Float64, x_0 ::Array{Float64};
-                            delta::Vector=[], tol = 1e-4, maxiter=300)
+                            delta::Vector=[], tol = 1e-4, maxiter=300, stop=nothing)
 
     ### Run optimization
     # set optimization problem
@@ -98,7 +98,7 @@ function solve_optim_prob(data::Data, model::Model, fixed_param::Float64, η_ω:
         NelderMead(), # Optimization method
         tol, # Tolerance for convergence
         maxiter, # Maximum number of iterations
-        callback # Callback function
+        stop === nothing ? callback : stop # Callback function (returning true stops the run)
     )
         
     # Solve optimization problem
@@ -254,60 +254,9 @@ function estimate_industry(ind_code, initParams::InitParams; tol = 1e-2,
 
         p = plot_results(sim, data)
 
-        T = length(data.y) # Time horizon
-        # Genrate shocks
-        shocks = generateShocks(sim.x, T);
-        # Update model
-        update_model!(model, sim.x)
-
-        # Evaluate model
-        model_results = evaluateModel(0, model, data, sim.x, shocks)
-        ω_model = model_results[:ω];
-        rr_model = model_results[:rr];
-        lbr_model = model_results[:lbr];
-        wbr_model = model_results[:wbr];
-        # Data
-        ω_data = data.w_h ./ data.w_ℓ;
-        rr_data = data.rr;
-        lbr_data = data.lsh;
-        wbr_data = data.wbr;
-
-        # Check fitness
-
-        f1 = sum((ω_model .- ω_data[2:end]).^ 2)
-        f2 = sum((rr_model .- rr_data).^ 2)
-        f3 = sum((lbr_model .- lbr_data[2:end]).^ 2)
-        f4 = sum((wbr_model .- wbr_data[2:end]).^ 2)
-
-        # # Save results
-        temp_df = DataFrame(
-            [
-                :alpha_0 => [sim.x_0.α],
-                :sigma_0 => [sim.x_0.σ],
-                :rho_0 => [sim.x_0.ρ],
-                :eta_0 => [sim.x_0.η_ω],
-                :mu_0 => [sim.x_0.μ],
-                :lambda_0 => [sim.x_0.λ],
-                :phi_L_0 => [sim.x_0.φℓ₀],
-                :phi_H_0 => [sim.x_0.φh₀],
-                :alpha => [sim.x.α],
-                :sigma => [sim.x.σ],
-                :rho => [sim.x.ρ],
-                :eta => [sim.x.η_ω],
-                :mu => [sim.x.μ],
-                :lambda => [sim.x.λ],
-                :phi_L => [sim.x.φℓ₀],
-                :phi_H => [sim.x.φh₀],
-                :fit_rr => [f2],
-                :fit_wbr => [f4],
-                :fit_lbr => [f3],
-                :fit_sp => [f1],
-                :obj_val => [sim.f],
-                :tol => [tol]
-            ]
-        )
+        fits, model_results = fit_errors(sim, data)
 
-        append!(results, temp_df)
+        append!(results, result_row(sim, fits, tol, sim.g_norm <= tol ? "converged" : "maxiter"); cols=:union)
         CSV.write(path_to_results * "/" * ind_code * ".csv", results)
 
         if return_data
@@ -317,33 +266,7 @@ function estimate_industry(ind_code, initParams::InitParams; tol = 1e-2,
         end
     catch  e
         # println(@red string(e))
-        temp_df = DataFrame(
-            [
-                :alpha_0 => [initParams.param_0[1]],
-                :sigma_0 => [initParams.param_0[2]],
-                :rho_0 => [initParams.param_0[3]],
-                :eta_0 => [initParams.η_ω_0],
-                :mu_0 => [initParams.scale_0[1]],
-                :lambda_0 => [initParams.scale_0[2]],
-                :phi_L_0 => [initParams.scale_0[3]],
-                :phi_H_0 => [initParams.scale_initial],
-                :alpha => NaN,
-                :sigma => NaN,
-                :rho => NaN,
-                :eta => NaN,
-                :mu => NaN,
-                :lambda => NaN,
-                :phi_L => NaN,
-                :phi_H => NaN,
-                :fit_rr => NaN,
-                :fit_wbr => NaN,
-                :fit_lbr => NaN,
-                :fit_sp => NaN,
-                :obj_val => NaN,
-                :tol => [tol]
-            ]
-        )
-        append!(results, temp_df)
+        append!(results, failed_row(initParams, tol); cols=:union)
         CSV.write(path_to_results * "/" * ind_code * ".csv", results)
 
         return nothing, nothing
@@ -351,3 +274,175 @@ function estimate_industry(ind_code, initParams::InitParams; tol = 1e-2,
 	
 
 end 
+
+# Sum of squared errors of the skill premium, relative price, labor share and wage bill ratio
+function fit_errors(sim::Simulation, data::Data)
+
+    T = length(data.y) # Time horizon
+    # Genrate shocks
+    shocks = generateShocks(sim.x, T);
+    # Update model
+    update_model!(model, sim.x)
+
+    # Evaluate model
+    model_results = evaluateModel(0, model, data, sim.x, shocks)
+    ω_model = model_results[:ω];
+    rr_model = model_results[:rr];
+    lbr_model = model_results[:lbr];
+    wbr_model = model_results[:wbr];
+    # Data
+    ω_data = data.w_h ./ data.w_ℓ;
+    rr_data = data.rr;
+    lbr_data = data.lsh;
+    wbr_data = data.wbr;
+
+    # Check fitness
+
+    f1 = sum((ω_model .- ω_data[2:end]).^ 2)
+    f2 = sum((rr_model .- rr_data).^ 2)
+    f3 = sum((lbr_model .- lbr_data[2:end]).^ 2)
+    f4 = sum((wbr_model .- wbr_data[2:end]).^ 2)
+
+    return (sp = f1, rr = f2, lbr = f3, wbr = f4), model_results
+end
+
+# One row of data/results/{IND}.csv for a finished estimation; `stop_reason` is
+# "converged", "maxiter" or the reason a StartMonitor stopped it
+function result_row(sim::Simulation, fits, tol, stop_reason::String)
+    return DataFrame(
+        [
+            :alpha_0 => [sim.x_0.α],
+            :sigma_0 => [sim.x_0.σ],
+            :rho_0 => [sim.x_0.ρ],
+            :eta_0 => [sim.x_0.η_ω],
+            :mu_0 => [sim.x_0.μ],
+            :lambda_0 => [sim.x_0.λ],
+            :phi_L_0 => [sim.x_0.φℓ₀],
+            :phi_H_0 => [sim.x_0.φh₀],
+            :alpha => [sim.x.α],
+            :sigma => [sim.x.σ],
+            :rho => [sim.x.ρ],
+            :eta => [sim.x.η_ω],
+            :mu => [sim.x.μ],
+            :lambda => [sim.x.λ],
+            :phi_L => [sim.x.φℓ₀],
+            :phi_H => [sim.x.φh₀],
+            :fit_rr => [fits.rr],
+            :fit_wbr => [fits.wbr],
+            :fit_lbr => [fits.lbr],
+            :fit_sp => [fits.sp],
+            :obj_val => [sim.f],
+            :tol => [tol],
+            :stop_reason => [stop_reason]
+        ]
+    )
+end
+
+# One row of data/results/{IND}.csv for an estimation that failed (NaN estimates)
+function failed_row(initParams::InitParams, tol)
+    return DataFrame(
+        [
+            :alpha_0 => [initParams.param_0[1]],
+            :sigma_0 => [initParams.param_0[2]],
+            :rho_0 => [initParams.param_0[3]],
+            :eta_0 => [initParams.η_ω_0],
+            :mu_0 => [initParams.scale_0[1]],
+            :lambda_0 => [initParams.scale_0[2]],
+            :phi_L_0 => [initParams.scale_0[3]],
+            :phi_H_0 => [initParams.scale_initial],
+            :alpha => NaN,
+            :sigma => NaN,
+            :rho => NaN,
+            :eta => NaN,
+            :mu => NaN,
+            :lambda => NaN,
+            :phi_L => NaN,
+            :phi_H => NaN,
+            :fit_rr => NaN,
+            :fit_wbr => NaN,
+            :fit_lbr => NaN,
+            :fit_sp => NaN,
+            :obj_val => NaN,
+            :tol => [tol],
+            :stop_reason => ["failed"]
+        ]
+    )
+end
+
+# Early stopping of one multi-start run, used as the Optim callback. After `warmup`
+# iterations a run is stopped as
+# - "dominated" if its objective is more than `margin` * max(|best|, 1) above the
+#   best objective of the industry and fell by less than `stall` (relative) over
+#   the last `window` iterations;
+# - "duplicate" if its simplex centroid is within `cluster_tol` (relative, per
+#   parameter) of a minimizer already found with an objective no worse than its own.
+mutable struct StartMonitor <: Function
+    best::Float64                 # lowest objective recorded for the industry
+    minimizers::Matrix{Float64}   # known minimizers, one per row: α σ ρ μ λ φℓ⁰
+    objectives::Vector{Float64}   # their objective values
+    margin::Float64
+    stall::Float64
+    window::Int
+    warmup::Int
+    cluster_tol::Float64
+    history::Vector{Float64}      # objective at each iteration
+    reason::String                # "" while the run is not stopped
+end
+
+StartMonitor(best, minimizers, objectives; margin = 0.5, stall = 0.01, window = 20, warmup = 50, cluster_tol = 0.01) =
+    StartMonitor(best, minimizers, objectives, margin, stall, window, warmup, cluster_tol, Float64[], "")
+
+function (m::StartMonitor)(os)
+    callback(os)
+    f = os.value
+    push!(m.history, f)
+    k = length(m.history)
+    k <= m.warmup && return false
+
+    if isfinite(m.best) && f > m.best + m.margin * max(abs(m.best), 1.0)
+        past = m.history[max(1, k - m.window)]
+        if (past - f) / max(abs(past), 1.0) < m.stall
+            m.reason = "dominated"
+            return true
+        end
+    end
+
+    x = os.metadata["centroid"]
+    for i in axes(m.minimizers, 1)
+        x_i = m.minimizers[i, :]
+        if m.objectives[i] <= f && all(abs.(x .- x_i) .<= m.cluster_tol .* max.(abs.(x_i), 1.0))
+            m.reason = "duplicate"
+            return true
+        end
+    end
+    return false
+end
+
+# Estimate one start of an industry without plotting or writing data/results;
+# returns its results row (NaN estimates if the estimation failed). With a
+# StartMonitor the run can stop early; the row records why it stopped.
+# Used by estimation/multistart_worker.jl.
+function estimate_start(ind_code, initParams::InitParams; tol = 1e-2, monitor = nothing)
+
+    path_data = "./data/proc/ind/$(ind_code).csv";
+    dataframe = CSV.read(path_data, DataFrame);
+
+    data = generateData(dataframe);
+    delta_e = mean(dataframe.DPR_EQ)
+    delta_s = mean(dataframe.DPR_ST)
+
+    try
+        sim = solve_optim_prob(data, model, initParams.scale_initial, initParams.η_ω_0,
+                               vcat(initParams.param_0, initParams.scale_0), tol = tol; delta=[delta_e, delta_s],
+                               stop = monitor);
+        fits, _ = fit_errors(sim, data)
+        if monitor !== nothing && !isempty(monitor.reason)
+            stop_reason = monitor.reason
+        else
+            stop_reason = sim.g_norm <= tol ? "converged" : "maxiter"
+        end
+        return result_row(sim, fits, tol, stop_reason)
+    catch e
+        return failed_row(initParams, tol)
+    end
+end
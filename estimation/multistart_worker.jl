@@ -0,0 +1,84 @@
+######################## Multi-start estimation worker ########################
+# Long-lived worker driven by scripts/estimation/multistart.py. The model is
+# initialized once; then the worker reads one start per line on stdin
+#     ind_code,alpha_0,sigma_0,rho_0,eta_0,mu_0,lambda_0,phi_L_0,phi_H_0,tol
+# estimates it with `estimate_start` and answers with one line
+#     RESULT,<the values of a data/results/{IND}.csv row, in column order>
+# The worker never writes data/results itself; the scheduler records the rows.
+#
+# Early stopping (see StartMonitor in do_estimation.jl) is set with key=value
+# arguments: margin, stall, window, warmup, cluster_tol, and early_stop=false
+# to turn it off. Before each start the worker reads the best objective and
+# the converged minimizers of the industry from data/results/{IND}.csv.
+# Run from the repository root:
+#     julia --project=. estimation/multistart_worker.jl margin=0.5 cluster_tol=0.01
+###############################################################################
+
+include("estimation.jl")
+include("do_estimation.jl")
+
+# # Define parameters and variables of the model
+begin
+	@parameters α, μ, σ, λ, ρ, δ_e, δ_s
+	@variables k_e, k_s, h, ℓ, ψ_L, ψ_H, q, y
+end
+model = intializeModel();
+
+settings = Dict(String(k) => String(v) for (k, v) in (split(a, "=", limit = 2) for a in ARGS))
+early_stop = get(settings, "early_stop", "true") == "true"
+monitor_options = (
+	margin = parse(Float64, get(settings, "margin", "0.5")),
+	stall = parse(Float64, get(settings, "stall", "0.01")),
+	window = parse(Int, get(settings, "window", "20")),
+	warmup = parse(Int, get(settings, "warmup", "50")),
+	cluster_tol = parse(Float64, get(settings, "cluster_tol", "0.01")),
+)
+
+# Best objective and converged minimizers (α σ ρ μ λ φℓ⁰) recorded for an industry
+function known_minima(ind_code; path_to_results::String="./data/results")
+	path = path_to_results * "/" * ind_code * ".csv"
+	if !isfile(path)
+		return Inf, zeros(0, 6), Float64[]
+	end
+	results = CSV.read(path, DataFrame)
+	obj_val = coalesce.(results.obj_val, NaN)
+	finite = isfinite.(obj_val)
+	if "stop_reason" in names(results)
+		# Rows written before stop reasons were recorded count as converged
+		reason = coalesce.(results.stop_reason, "")
+		converged = finite .& ((reason .== "converged") .| (reason .== ""))
+	else
+		converged = finite
+	end
+	best = any(finite) ? minimum(obj_val[finite]) : Inf
+	minimizers = Matrix{Float64}(results[converged, [:alpha, :sigma, :rho, :mu, :lambda, :phi_L]])
+	return best, minimizers, obj_val[converged]
+end
+
+# Anything else printed while estimating goes to stderr, so stdout only carries the protocol
+const protocol = stdout
+redirect_stdout(stderr)
+
+println(protocol, "READY")
+flush(protocol)
+
+for line in eachline(stdin)
+	line = strip(line)
+	isempty(line) && continue
+	fields = split(line, ",")
+	ind_code = String(fields[1])
+	values = parse.(Float64, fields[2:end])
+	alpha_0, sigma_0, rho_0, eta_0, mu_0, lambda_0, phi_L_0, phi_H_0, tol = values
+
+	params_init = InitParams(
+				phi_H_0, # scale_initial
+				eta_0, # η_ω_0
+				[alpha_0, sigma_0, rho_0], # param_0
+				[mu_0, lambda_0, phi_L_0] # scale_0
+				)
+
+	monitor = early_stop ? StartMonitor(known_minima(ind_code)...; monitor_options...) : nothing
+	row = estimate_start(ind_code, params_init, tol = tol, monitor = monitor)
+	println(protocol, "RESULT,", join(Array(row[1, :]), ","))
+	flush(protocol)
+end
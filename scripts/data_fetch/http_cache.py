@@ -0,0 +1,247 @@
+"""
+On-disk cache for API responses (Census QWI and other GET endpoints).
+
+Responses are stored under config.PATH_HTTP_CACHE, keyed on the SHA-256 of
+the request URL with its `key` parameter removed, so the same query made with
+different API keys hits the same entry. An SQLite index keeps the URL,
+status, size and the time each entry was stored and last read:
+- entries expire after a per-endpoint TTL (config.HTTP_CACHE_TTL, matched by
+  the longest URL prefix);
+- when the cache grows past `max_bytes` the least recently used entries are
+  evicted;
+- in offline mode nothing is requested: hits are served even if expired and
+  misses raise CacheMiss. A cache directory filled by an online run can be
+  used as recorded fixtures.
+
+Bodies are written to disk in chunks as they download and served from the
+file, so streamed requests (`stream=True`) keep their bounded memory.
+
+Usage:
+    cache = ResponseCache()
+    session = CachedSession(cache)          # a requests.Session
+    session.get(url, timeout=60)
+
+    python scripts/data_fetch/http_cache.py stats|prune|clear [--dir DIR]
+"""
+
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+import argparse
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+from rich import print
+
+import config
+
+# Query parameters that identify the caller rather than the data
+SECRET_PARAMS = {"key", "UserID"}
+
+
+class CacheMiss(LookupError):
+    """Raised in offline mode when a request is not in the cache."""
+
+
+def normalize_url(url):
+    """URL without API key parameters, as used for the cache key."""
+    parts = urlsplit(url)
+    query = [(k, v) for (k, v) in parse_qsl(parts.query, keep_blank_values=True) if k not in SECRET_PARAMS]
+    return urlunsplit(parts._replace(query=urlencode(query, safe=":,*")))
+
+
+def cache_key(url):
+    return hashlib.sha256(normalize_url(url).encode()).hexdigest()
+
+
+class ResponseCache:
+    """Response bodies on disk with an SQLite index for TTL and LRU eviction."""
+
+    def __init__(self, path=None, ttl=None, max_bytes=None, offline=False):
+        self.path = path or config.PATH_HTTP_CACHE
+        self.ttl = config.HTTP_CACHE_TTL if ttl is None else ttl
+        self.max_bytes = config.HTTP_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+        self.offline = offline
+        os.makedirs(self.path, exist_ok=True)
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(os.path.join(self.path, "index.sqlite"), check_same_thread=False)
+        self.db.execute("""CREATE TABLE IF NOT EXISTS entries (
+            key TEXT PRIMARY KEY, url TEXT, status INTEGER, content_type TEXT,
+            size INTEGER, stored REAL, accessed REAL)""")
+        self.db.commit()
+        self.hits = self.misses = 0
+
+    def ttl_for(self, url):
+        """TTL in seconds of the longest matching prefix in `self.ttl` (None: never expires)."""
+        if not isinstance(self.ttl, dict):
+            return self.ttl
+        plain = normalize_url(url).split("://", 1)[-1]
+        matches = [p for p in self.ttl if p != "default" and plain.startswith(p)]
+        return self.ttl[max(matches, key=len)] if matches else self.ttl.get("default")
+
+    def body_path(self, key):
+        return os.path.join(self.path, key[:2], key + ".body")
+
+    def lookup(self, url):
+        """(status, content_type, body path) of a usable entry for `url`, or None."""
+        key = cache_key(url)
+        with self.lock:
+            row = self.db.execute("SELECT status, content_type, stored FROM entries WHERE key = ?",
+                                  (key,)).fetchone()
+            if row is None or not os.path.isfile(self.body_path(key)):
+                return None
+            status, content_type, stored = row
+            ttl = self.ttl_for(url)
+            if not self.offline and ttl is not None and time.time() - stored > ttl:
+                return None
+            self.db.execute("UPDATE entries SET accessed = ? WHERE key = ?", (time.time(), key))
+            self.db.commit()
+        return status, content_type, self.body_path(key)
+
+    def store(self, url, response, chunk_size=1 << 16):
+        """Write the body of `response` to the cache in chunks; returns the body path."""
+        key = cache_key(url)
+        target = self.body_path(key)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        tmp = f"{target}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp, "wb") as f:
+                for chunk in response.iter_content(chunk_size=chunk_size):
+                    f.write(chunk)
+            os.replace(tmp, target)
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+        now = time.time()
+        with self.lock:
+            self.db.execute("INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?)",
+                            (key, normalize_url(url), response.status_code,
+                             response.headers.get("Content-Type", ""), os.path.getsize(target), now, now))
+            self.db.commit()
+        # The new entry is kept even if it alone exceeds the cap: the caller
+        # reads it next, and it is the first to go on the following eviction
+        self.evict(keep=key)
+        return target
+
+    def evict(self, keep=None):
+        """Drop least recently used entries until the cache fits in `max_bytes`.
+
+        The entry with key `keep` (the one just stored) is never dropped.
+        """
+        if not self.max_bytes:
+            return 0
+        removed = 0
+        with self.lock:
+            total = self.db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+            if total <= self.max_bytes:
+                return 0
+            for key, size in self.db.execute("SELECT key, size FROM entries ORDER BY accessed").fetchall():
+                if total <= self.max_bytes:
+                    break
+                if key == keep:
+                    continue
+                if os.path.exists(self.body_path(key)):
+                    os.remove(self.body_path(key))
+                self.db.execute("DELETE FROM entries WHERE key = ?", (key,))
+                total -= size
+                removed += 1
+            self.db.commit()
+        return removed
+
+    def prune(self):
+        """Remove expired entries; returns how many were removed."""
+        removed = 0
+        with self.lock:
+            now = time.time()
+            for key, url, stored in self.db.execute("SELECT key, url, stored FROM entries").fetchall():
+                ttl = self.ttl_for(url)
+                if ttl is not None and now - stored > ttl:
+                    if os.path.exists(self.body_path(key)):
+                        os.remove(self.body_path(key))
+                    self.db.execute("DELETE FROM entries WHERE key = ?", (key,))
+                    removed += 1
+            self.db.commit()
+        return removed
+
+    def clear(self):
+        with self.lock:
+            for (key,) in self.db.execute("SELECT key FROM entries").fetchall():
+                if os.path.exists(self.body_path(key)):
+                    os.remove(self.body_path(key))
+            self.db.execute("DELETE FROM entries")
+            self.db.commit()
+
+    def stats(self):
+        with self.lock:
+            n, size = self.db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+        return {"entries": n, "bytes": size, "max_bytes": self.max_bytes, "hits": self.hits, "misses": self.misses}
+
+
+class CachedSession(requests.Session):
+    """requests.Session that answers GET requests from a ResponseCache.
+
+    Only 200 and 204 responses are stored. Errors are returned as usual so
+    callers can retry them.
+    """
+
+    def __init__(self, cache):
+        super().__init__()
+        self.cache = cache
+
+    def request(self, method, url, *args, stream=False, **kwargs):
+        if method.upper() != "GET":
+            return super().request(method, url, *args, stream=stream, **kwargs)
+        entry = self.cache.lookup(url)
+        if entry is None:
+            if self.cache.offline:
+                raise CacheMiss(f"Not in the response cache (offline): {normalize_url(url)}")
+            self.cache.misses += 1
+            response = super().request(method, url, *args, stream=True, **kwargs)
+            if response.status_code not in (200, 204):
+                if not stream:
+                    response.content  # read the body like a regular request
+                return response
+            with response:
+                path = self.cache.store(url, response)
+            entry = (response.status_code, response.headers.get("Content-Type", ""), path)
+        else:
+            self.cache.hits += 1
+        return cached_response(url, *entry, stream=stream)
+
+
+def cached_response(url, status, content_type, path, stream=False):
+    """A requests.Response serving a cached body from disk."""
+    response = requests.Response()
+    response.status_code = status
+    response.url = url
+    response.headers["Content-Type"] = content_type
+    response.encoding = requests.utils.get_encoding_from_headers(response.headers) or "utf-8"
+    if stream:
+        response.raw = open(path, "rb")
+    else:
+        with open(path, "rb") as f:
+            response._content = f.read()
+        response._content_consumed = True
+    return response
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Inspect or clean the on-disk API response cache.")
+    parser.add_argument("command", choices=["stats", "prune", "clear"])
+    parser.add_argument("--dir", default=None, help="Cache directory (default: config.PATH_HTTP_CACHE)")
+    args = parser.parse_args()
+
+    cache = ResponseCache(args.dir)
+    if args.command == "prune":
+        print(f"[bold green]Removed {cache.prune()} expired entries")
+    elif args.command == "clear":
+        cache.clear()
+        print("[bold green]Cache cleared")
+    stats = cache.stats()
+    print(f"{stats['entries']} entries, {stats['bytes'] / 1e6:.1f} MB (cap {stats['max_bytes'] / 1e6:.0f} MB) in {cache.path}")
@@ -5,16 +5,168 @@ sys.path.append(str(Path(__file__).parent.parent.parent))
 
 from os import listdir
 import os
+import argparse
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import pandas as pd 
 import requests
 import json
+import codecs
 from rich import print
 import config
+from http_cache import CachedSession, ResponseCache
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - optional dependency
+    pa = pc = pq = None
+
+# Status codes worth retrying: rate limiting and transient server errors
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+# Compact column types for the Parquet output: QWI measures as integers,
+# geography and categorical dimensions dictionary-encoded. The quarter label
+# in `time` (e.g. "2020-Q1") is also split into YEAR and QUARTER.
+QWI_MEASURES = ["EmpS", "EarnS"]
+QWI_CATEGORIES = ["state", "county", "industry", "education", "sex", "time"]
+
+
+def qwi_schema(header):
+    """Arrow schema of the Parquet output for a response with columns `header`."""
+    category = pa.dictionary(pa.int32(), pa.string())
+    fields = []
+    for col in header:
+        if col in QWI_MEASURES:
+            fields.append(pa.field(col, pa.int32()))
+        elif col in QWI_CATEGORIES:
+            fields.append(pa.field(col, category))
+        else:
+            fields.append(pa.field(col, pa.string()))
+    if "time" in header:
+        fields += [pa.field("YEAR", pa.int16()), pa.field("QUARTER", pa.int8())]
+    return pa.schema(fields)
+
+
+def rows_to_table(header, rows, schema):
+    """Cast one batch of JSON rows (lists of strings) to an Arrow table with `schema`."""
+    raw = {col: pa.array(values, type=pa.string()) for col, values in zip(header, zip(*rows))}
+    columns = {}
+    for col, values in raw.items():
+        if col in QWI_MEASURES:
+            # Suppressed or missing cells come back as null or empty strings
+            values = pc.if_else(pc.equal(values, ""), pa.scalar(None, pa.string()), values)
+            columns[col] = pc.cast(values, pa.int32())
+        elif col in QWI_CATEGORIES:
+            columns[col] = values.dictionary_encode()
+        else:
+            columns[col] = values
+    if "time" in header:
+        time_col = raw["time"]
+        valid = pc.match_substring_regex(time_col, r"^\d{4}-Q\d$")
+        columns["YEAR"] = pc.cast(pc.if_else(valid, pc.utf8_slice_codeunits(time_col, 0, 4), None), pa.int16())
+        columns["QUARTER"] = pc.cast(pc.if_else(valid, pc.utf8_slice_codeunits(time_col, 6, 7), None), pa.int8())
+    return pa.table(columns).cast(schema)
+
+
+def iter_json_rows(chunks):
+    """Yield the elements of a top-level JSON array parsed incrementally from text `chunks`.
+
+    The Census API answers with an array of rows (the header first); only
+    the current chunk and at most one partial row are held in memory.
+    """
+    decoder = json.JSONDecoder()
+    buf, pos, started = "", 0, False
+    for chunk in chunks:
+        buf = buf[pos:] + chunk
+        pos = 0
+        bulk = True
+        while True:
+            while pos < len(buf) and buf[pos] in " \t\r\n,":
+                pos += 1
+            if pos == len(buf):
+                break
+            if not started:
+                if buf[pos] != "[":
+                    raise ValueError(f"Expected a JSON array, got {buf[pos:pos + 80]!r}")
+                started, pos = True, pos + 1
+                continue
+            if buf[pos] == "]":
+                return
+            # Fast path, once per chunk: decode every complete row up to the
+            # last "]" (or the one before, which may close the array) at once.
+            # A cut inside a string or row never parses, so on failure fall
+            # back to decoding one row at a time.
+            if bulk:
+                bulk = False
+                end = buf.rfind("]") + 1
+                for _ in range(2):
+                    if end <= pos:
+                        break
+                    try:
+                        rows = json.loads("[" + buf[pos:end] + "]")
+                    except json.JSONDecodeError:
+                        end = buf.rfind("]", pos, end - 1) + 1
+                        continue
+                    yield from rows
+                    pos = end
+                    break
+                continue
+            try:
+                row, pos = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                break  # the row continues in the next chunk
+            yield row
+    if started:
+        raise ValueError("Truncated JSON response")
+
+
+class ParquetSink:
+    """Appends Arrow tables as row groups to one Parquet file.
+
+    Writes go to `{path}.tmp`, which replaces `path` on `close()`; `abort()`
+    discards it, so a failed download never leaves a partial file behind.
+    Safe to share between threads.
+    """
+
+    def __init__(self, path):
+        if pq is None:
+            raise ImportError("Parquet output requires pyarrow (pip install pyarrow)")
+        self.path = path
+        self.writer = None
+        self.rows = 0
+        self.lock = threading.Lock()
+
+    def append(self, table):
+        with self.lock:
+            if self.writer is None:
+                self.writer = pq.ParquetWriter(self.path + ".tmp", table.schema)
+            self.writer.write_table(table)
+            self.rows += table.num_rows
+
+    def close(self):
+        """Finish the file; returns False if nothing was written."""
+        with self.lock:
+            if self.writer is None:
+                return False
+            self.writer.close()
+            os.replace(self.path + ".tmp", self.path)
+            return True
+
+    def abort(self):
+        with self.lock:
+            if self.writer is not None:
+                self.writer.close()
+                os.remove(self.path + ".tmp")
+                self.writer = None
 
 class CensusAPI:
     """_summary_
     """
-    def __init__(self, api_key, states, industry_code):
+    def __init__(self, api_key, states, industry_code, base_url="https://api.census.gov/data/timeseries/qwi/"):
         """_summary_
 
         Initialize the CensusAPI helper.
@@ -22,11 +174,12 @@ class CensusAPI:
             api_key: Census API key string
             states: list or iterable of state FIPS (or single value)
             industry_code: industry code string
+            base_url: QWI endpoint root (point it at a local stub server for testing)
         """
         self.api_key = api_key
         self.time_init = '2000'
         self.time_final = '2030'
-        self.base_url = "https://api.census.gov/data/timeseries/qwi/"
+        self.base_url = base_url
         self.endpoint = "se"
         self.variables = {
             "EmpS": "Full-Quarter Employment (Stable): Counts",
@@ -48,15 +201,58 @@ class CensusAPI:
         education = "&education=E" + "&education=E".join(map(str, self.education))
         variables = ",".join(self.variables.keys())
         states =  ",".join(map(str, self.states))
-        self.request_url = self.base_url + f"{self.endpoint}?get={variables}&for=state:{states}&time=from{self.time_init}to{self.time_final}{education}&industry={self.industry}&key="+self.api_key
+        time_final = self.time_final
+        if "-Q" in str(self.time_init) and "-Q" not in str(time_final):
+            # Both ends of the range must use the same (year or quarter) format
+            time_final = f"{time_final}-Q4"
+        self.request_url = self.base_url + f"{self.endpoint}?get={variables}&for=state:{states}&time=from{self.time_init}to{time_final}{education}&industry={self.industry}&key="+self.api_key
 
-    def get_data(self):
-        """_summary_
+    def get_data(self, session=None, timeout=60):
+        """Request `request_url` and store the parsed JSON rows in `self.data`.
+
+        Args:
+            session: optional requests.Session to reuse connections.
+            timeout: seconds to wait for the server.
         """
         if self.request_url == "":
             self.contruct_url()
-        response = requests.get(self.request_url)
-        self.data = response.json()
+        response = (session or requests).get(self.request_url, timeout=timeout)
+        response.raise_for_status()
+        # The API answers 204 (no content) when a query matches no rows
+        self.data = response.json() if response.status_code != 204 else []
+
+    def iter_batches(self, session=None, timeout=60, batch_size=50_000):
+        """Stream the response as (header, rows) batches of at most `batch_size` rows.
+
+        Unlike `get_data`, the body is parsed while it downloads, so memory
+        is bounded by one batch regardless of the size of the request.
+        """
+        if self.request_url == "":
+            self.contruct_url()
+        with (session or requests).get(self.request_url, timeout=timeout, stream=True) as response:
+            response.raise_for_status()
+            if response.status_code == 204:
+                return
+            decoder = codecs.getincrementaldecoder(response.encoding or "utf-8")()
+            chunks = (decoder.decode(c) for c in response.iter_content(chunk_size=1 << 16))
+            rows = iter_json_rows(chunks)
+            header = next(rows, None)
+            batch = []
+            for row in rows:
+                batch.append(row)
+                if len(batch) == batch_size:
+                    yield header, batch
+                    batch = []
+            if batch:
+                yield header, batch
+
+    def stream_to_parquet(self, sink, session=None, timeout=60, batch_size=50_000):
+        """Append the response to a ParquetSink, one row group per batch; returns the row count."""
+        n_rows = 0
+        for header, rows in self.iter_batches(session=session, timeout=timeout, batch_size=batch_size):
+            sink.append(rows_to_table(header, rows, qwi_schema(header)))
+            n_rows += len(rows)
+        return n_rows
 
     def get_dataframe(self, return_dataframe=False):
         """_summary_
@@ -68,7 +264,7 @@ class CensusAPI:
             _type_: _description_
         """        
         self.get_data()
-        df = pd.DataFrame(self.data[1:], columns=self.data[0])
+        df = pd.DataFrame(self.data[1:], columns=self.data[0] if self.data else None)
 
         if return_dataframe:
             return df
@@ -86,20 +282,396 @@ class CensusAPI:
                 self.data_frame.to_csv(filename, index=False)
         
 
-if __name__ == "__main__":
-    # Read the api key from a file (path configured in config.py or via
-    # env var CENSUS_API_KEYS_PATH). Update that setting if keys live
-    # elsewhere on your machine/CI.
-    api_keys_path = config.CENSUS_API_KEYS
-    api_keys = [f for f in listdir(api_keys_path) if "key" in f]
+def load_api_keys(api_keys_path=None):
+    """Read every API key file (name containing "key") in `api_keys_path`.
 
-    if len(api_keys) == 0:
+    Defaults to config.CENSUS_API_KEYS (env var CENSUS_API_KEYS_PATH).
+    """
+    api_keys_path = api_keys_path or config.CENSUS_API_KEYS
+    files = sorted(f for f in listdir(api_keys_path) if "key" in f) if os.path.isdir(api_keys_path) else []
+    if len(files) == 0:
         raise FileNotFoundError(f"No API key files found in {api_keys_path}; set CENSUS_API_KEYS_PATH to point to a directory containing your key file(s).")
+    keys = []
+    for file in files:
+        with open(os.path.join(api_keys_path, file), 'r') as f:
+            keys.append(f.read().strip())
+    return keys
+
+
+class RateLimiter:
+    """Spaces out requests made with one API key to at most `rate` per second."""
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate else 0.0
+        self.next_slot = 0.0
+        self.lock = threading.Lock()
+
+    def reserve(self):
+        """Book the next free slot and return how long to wait for it."""
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slot)
+            self.next_slot = slot + self.interval
+            return slot - now
+
+    def penalize(self, seconds):
+        """Push the next slot back, e.g. after the server answered 429."""
+        with self.lock:
+            self.next_slot = max(self.next_slot, time.monotonic() + seconds)
+
+
+class QWIFetcher:
+    """Concurrent QWI downloader for many (industry, states) queries.
+
+    Runs up to `workers` requests at once over reused HTTP connections. Each
+    API key is rate limited to `rate` requests per second, and queries rotate
+    across the keys, always taking the one whose next slot comes first.
+    Failed requests (connection errors, timeouts, 429 and 5xx) are retried up
+    to `retries` times with exponential backoff and jitter, honoring
+    Retry-After. A key the server rejects (401/403) is dropped from the
+    rotation.
+
+    With a ResponseCache, queries already in the cache are answered from disk
+    without taking a rate-limit slot; in offline mode queries missing from the
+    cache fail with CacheMiss. Queries made with use_cache=False go to the
+    API and are not stored (unless offline, where the cache is all there is).
+    """
+
+    def __init__(self, api_keys, workers=8, rate=5.0, retries=5, backoff=1.0, timeout=60,
+                 base_url="https://api.census.gov/data/timeseries/qwi/", cache=None):
+        if isinstance(api_keys, str):
+            api_keys = [api_keys]
+        if not api_keys:
+            raise ValueError("At least one API key is required")
+        self.keys = {key: RateLimiter(rate) for key in api_keys}
+        self.rejected = set()
+        self.workers = workers
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.base_url = base_url
+        self.cache = cache
+        self.local = threading.local()
+        self.lock = threading.Lock()
+
+    def uses_cache(self, use_cache=True):
+        """True if a query is read from (and stored in) the cache."""
+        return self.cache is not None and (use_cache or self.cache.offline)
+
+    def session(self, use_cache=True):
+        """One requests.Session per worker thread (cached or not), reused across its requests."""
+        if not self.uses_cache(use_cache):
+            if not hasattr(self.local, "plain"):
+                self.local.plain = requests.Session()
+            return self.local.plain
+        if not hasattr(self.local, "session"):
+            self.local.session = CachedSession(self.cache)
+        return self.local.session
+
+    def census_api(self, key, industry, states, since=None):
+        """CensusAPI for one query with its URL built; `since` is the first quarter (e.g. "2021-Q3")."""
+        api = CensusAPI(key, states, industry, base_url=self.base_url)
+        if since is not None:
+            api.time_init = since
+        api.contruct_url()
+        return api
+
+    def is_cached(self, industry, states, since=None, use_cache=True):
+        """True if the query can be answered from the cache (always assumed offline)."""
+        if not self.uses_cache(use_cache):
+            return False
+        if self.cache.offline:
+            return True
+        api = self.census_api(next(iter(self.keys)), industry, states, since)
+        return self.cache.lookup(api.request_url) is not None
+
+    def next_key(self):
+        """Pick the usable key with the earliest free slot and wait for that slot."""
+        with self.lock:
+            usable = [k for k in self.keys if k not in self.rejected]
+            if not usable:
+                raise RuntimeError("Every API key was rejected by the server")
+            key = min(usable, key=lambda k: self.keys[k].next_slot)
+            wait = self.keys[key].reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return key
+
+    def fetch(self, industry, states, sink=None, since=None, use_cache=True):
+        """Download one (industry, states) query, from quarter `since` if given.
+
+        Returns the JSON rows (header first), or with a ParquetSink streams
+        them into it and returns the number of rows. A streamed request that
+        fails after some of its rows were written is not retried. With
+        use_cache=False the response cache is bypassed.
+        """
+        for attempt in range(self.retries + 1):
+            # The cache key ignores the API key, so a cached query needs no slot
+            cached = self.is_cached(industry, states, since, use_cache)
+            key = next(iter(self.keys)) if cached else self.next_key()
+            api = self.census_api(key, industry, states, since)
+            delay = self.backoff * 2 ** attempt * (1 + random.random())
+            n_rows = 0
+            try:
+                if sink is None:
+                    api.get_data(session=self.session(use_cache), timeout=self.timeout)
+                    return api.data
+                for header, rows in api.iter_batches(session=self.session(use_cache), timeout=self.timeout):
+                    sink.append(rows_to_table(header, rows, qwi_schema(header)))
+                    n_rows += len(rows)
+                return n_rows
+            except requests.HTTPError as e:
+                status = e.response.status_code
+                if status in (401, 403):
+                    with self.lock:
+                        self.rejected.add(key)
+                    continue
+                if status not in RETRY_STATUS or attempt == self.retries:
+                    raise
+                retry_after = e.response.headers.get("Retry-After", "")
+                if retry_after.isdigit():
+                    delay = max(delay, float(retry_after))
+                if status == 429:
+                    self.keys[key].penalize(delay)
+            except (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError):
+                if n_rows or attempt == self.retries:
+                    raise
+            time.sleep(delay)
+        raise RuntimeError(f"Giving up on industry {industry} after {self.retries + 1} attempts")
+
+    def fetch_all(self, industries, state_sets, sinks=None, since=None, use_cache=True):
+        """Fetch every industry x state set; yields (industry, states, data, error) as they finish.
+
+        With `sinks` (industry -> ParquetSink) responses are streamed into
+        the sink of their industry and `data` is the number of rows.
+        `since` maps (industry, states) to the first quarter to request.
+        """
+        queries = [(ind, tuple(states)) for ind in industries for states in state_sets]
+        sinks = sinks or {}
+        since = since or {}
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            futures = {pool.submit(self.fetch, ind, states, sinks.get(ind), since.get((ind, states)), use_cache):
+                       (ind, states) for (ind, states) in queries}
+            for future in as_completed(futures):
+                ind, states = futures[future]
+                try:
+                    yield ind, states, future.result(), None
+                except Exception as e:
+                    yield ind, states, None, e
+
+
+def download_industries(fetcher, industries, state_sets, out_dir=None, fmt="csv"):
+    """Fetch all queries and write one file per industry into `out_dir`.
+
+    With fmt="csv" the responses of an industry are collected and written to
+    {industry}.csv. With fmt="parquet" they are streamed into
+    {industry}.parquet with compact dtypes, one row group per batch, so
+    memory does not grow with the number of states or quarters requested.
+
+    Returns a dict industry -> error message for the industries that failed.
+    """
+    out_dir = out_dir or config.PATH_RAW_QWI
+    os.makedirs(out_dir, exist_ok=True)
+    remaining = {ind: len(state_sets) for ind in industries}
+    frames = {ind: [] for ind in industries}
+    sinks = ({ind: ParquetSink(os.path.join(out_dir, f"{ind}.parquet")) for ind in industries}
+             if fmt == "parquet" else None)
+    errors = {}
+    start = time.perf_counter()
+    for ind, states, data, error in fetcher.fetch_all(industries, state_sets, sinks=sinks):
+        if error is not None:
+            errors[ind] = f"states {','.join(map(str, states))}: {error}"
+            print(f"[bold red]Error fetching {ind} ({','.join(map(str, states))}): {error}")
+        elif data and sinks is None:
+            frames[ind].append(pd.DataFrame(data[1:], columns=data[0]))
+        remaining[ind] -= 1
+        if remaining[ind] > 0:
+            continue
+        if sinks is not None:
+            # Only finish the file once every query of the industry is done
+            if ind in errors:
+                sinks[ind].abort()
+            elif sinks[ind].close():
+                print(f"[bold green] Saved [bold white]{ind}.parquet[/] ({sinks[ind].rows} rows)")
+            else:
+                print(f"[bold yellow] No QWI data for {ind}")
+        elif ind not in errors:
+            parts = frames.pop(ind)
+            if not parts:
+                print(f"[bold yellow] No QWI data for {ind}")
+                continue
+            df = pd.concat(parts, ignore_index=True)
+            df.to_csv(os.path.join(out_dir, f"{ind}.csv"), index=False)
+            print(f"[bold green] Saved [bold white]{ind}.csv[/] ({len(df)} rows)")
+    n_queries = len(industries) * len(state_sets)
+    print(f"[bold green]Fetched {n_queries} queries for {len(industries)} industries "
+          f"in {time.perf_counter() - start:.1f}s ({len(errors)} failed)")
+    return errors
+
+
+def next_quarter(label, n=1):
+    """Quarter label `n` quarters after `label`, e.g. next_quarter("2020-Q4") == "2021-Q1"."""
+    index = int(label[:4]) * 4 + int(label[-1]) - 1 + n
+    return f"{index // 4}-Q{index % 4 + 1}"
+
+
+def stored_file(out_dir, industry, fmt):
+    return os.path.join(out_dir, f"{industry}.{fmt}")
+
+
+def read_stored(path):
+    """An industry's stored QWI data (None if there is none yet); CSV values stay strings."""
+    if not os.path.isfile(path):
+        return None
+    if path.endswith(".parquet"):
+        return pd.read_parquet(path)
+    return pd.read_csv(path, dtype=str, keep_default_na=False)
+
+
+def latest_quarters(df):
+    """Latest quarter stored for each state, e.g. {"01": "2023-Q2"}."""
+    if df is None or df.empty:
+        return {}
+    return df.astype({"state": str, "time": str}).groupby("state")["time"].max().to_dict()
+
+
+def refresh_start(df, states, overlap=0):
+    """First quarter to request for `states` given the stored data, or None for the full history.
+
+    The request starts after the oldest of the latest quarters stored for
+    these states (all stored states for "*"), minus `overlap` quarters to pick
+    up revisions. A state with no stored data needs the full history.
+    """
+    latest = latest_quarters(df)
+    states = list(latest) if tuple(states) == ("*",) else [str(st) for st in states]
+    if not states or any(st not in latest for st in states):
+        return None
+    return next_quarter(min(latest[st] for st in states), 1 - overlap)
+
+
+def upsert(old, new):
+    """Rows of `old` updated and extended by `new`, matched on every non-measure column.
+
+    Returns (merged frame, rows inserted, rows updated).
+    """
+    if old is None or old.empty:
+        return new.reset_index(drop=True), len(new), 0
+    # YEAR and QUARTER are derived from `time`, so they are not part of the key
+    keys = [c for c in new.columns if c not in QWI_MEASURES + ["YEAR", "QUARTER"]]
+    merged = pd.concat([old.astype({k: str for k in keys}), new.astype({k: str for k in keys})],
+                       ignore_index=True)
+    merged = merged.drop_duplicates(subset=keys, keep="last")
+    merged = merged.sort_values([c for c in ["state", "time"] if c in keys], kind="stable")
+    inserted = len(merged) - len(old)
+    return merged.reset_index(drop=True), inserted, len(new) - inserted
+
+
+def write_stored(df, path, header):
+    """Replace an industry's stored file with `df` (written next to it and swapped in)."""
+    tmp = path + ".tmp"
+    if path.endswith(".parquet"):
+        if pq is None:
+            raise ImportError("Parquet output requires pyarrow (pip install pyarrow)")
+        pq.write_table(pa.Table.from_pandas(df, schema=qwi_schema(header), preserve_index=False), tmp)
+    else:
+        df.to_csv(tmp, index=False)
+    os.replace(tmp, path)
+
+
+def refresh_industries(fetcher, industries, state_sets, out_dir=None, fmt="csv", overlap=0):
+    """Request only the quarters missing from each industry's stored file and upsert them.
+
+    For every (industry, state set) the request starts at the quarter after
+    the latest one already stored (see `refresh_start`); queries with nothing
+    stored fetch the full history. New rows are inserted and rows for
+    quarters already stored are replaced.
+
+    The queries bypass the response cache (except offline): they run to an
+    open-ended last quarter, so a cached answer, in particular a 204 "no
+    content", would hide quarters published since it was stored.
+
+    Returns a dict industry -> error message for the industries that failed.
+    """
+    out_dir = out_dir or config.PATH_RAW_QWI
+    os.makedirs(out_dir, exist_ok=True)
+    since = {}
+    for ind in industries:
+        stored = read_stored(stored_file(out_dir, ind, fmt))
+        for states in state_sets:
+            since[(ind, tuple(states))] = refresh_start(stored, states, overlap)
+    n_delta = sum(v is not None for v in since.values())
+    print(f"[bold blue]Refreshing {len(since)} queries ({n_delta} incremental, {len(since) - n_delta} full history)")
+
+    remaining = {ind: len(state_sets) for ind in industries}
+    responses = {ind: [] for ind in industries}
+    errors = {}
+    start = time.perf_counter()
+    for ind, states, data, error in fetcher.fetch_all(industries, state_sets, since=since, use_cache=False):
+        if error is not None:
+            errors[ind] = f"states {','.join(map(str, states))}: {error}"
+            print(f"[bold red]Error fetching {ind} ({','.join(map(str, states))}): {error}")
+        elif data:
+            responses[ind].append(data)
+        remaining[ind] -= 1
+        if remaining[ind] > 0 or ind in errors:
+            continue
+        parts = responses.pop(ind)
+        if not parts:
+            print(f"[bold green] {ind} is up to date")
+            continue
+        header = parts[0][0]
+        rows = [row for data in parts for row in data[1:]]
+        new = (rows_to_table(header, rows, qwi_schema(header)).to_pandas() if fmt == "parquet"
+               else pd.DataFrame(rows, columns=header))
+        path = stored_file(out_dir, ind, fmt)
+        merged, inserted, updated = upsert(read_stored(path), new)
+        write_stored(merged, path, header)
+        print(f"[bold green] Updated [bold white]{os.path.basename(path)}[/] "
+              f"({inserted} rows inserted, {updated} updated, {len(merged)} total)")
+    print(f"[bold green]Refreshed {len(industries)} industries in {time.perf_counter() - start:.1f}s "
+          f"({len(errors)} failed)")
+    return errors
+
+
+if __name__ == "__main__":
+    # API keys are read from every key file in config.CENSUS_API_KEYS (or env
+    # var CENSUS_API_KEYS_PATH); requests rotate across them.
+    parser = argparse.ArgumentParser(description="Download QWI employment and earnings by industry and state.")
+    parser.add_argument("industries", nargs="+", help="NAICS industry codes")
+    parser.add_argument("--states", action="append", default=None,
+                        help="Comma-separated state FIPS codes for one request (repeatable; default: all states)")
+    parser.add_argument("--workers", type=int, default=8, help="Concurrent requests")
+    parser.add_argument("--rate", type=float, default=5.0, help="Maximum requests per second per API key")
+    parser.add_argument("--retries", type=int, default=5)
+    parser.add_argument("--backoff", type=float, default=1.0, help="Base delay in seconds for exponential backoff")
+    parser.add_argument("--out", default=config.PATH_RAW_QWI, help="Directory for the per-industry files")
+    parser.add_argument("--format", default="csv", choices=["csv", "parquet"],
+                        help="csv, or parquet to stream responses to disk with compact dtypes (requires pyarrow)")
+    parser.add_argument("--base-url", default="https://api.census.gov/data/timeseries/qwi/",
+                        help="API root (e.g. a local stub server)")
+    parser.add_argument("--api-keys", default=None, help="Directory with API key files (default: config.CENSUS_API_KEYS)")
+    parser.add_argument("--cache-dir", default=config.PATH_HTTP_CACHE, help="Response cache directory")
+    parser.add_argument("--no-cache", action="store_true", help="Always request from the API")
+    parser.add_argument("--offline", action="store_true", help="Only read responses from the cache")
+    parser.add_argument("--refresh", action="store_true",
+                        help="Only request quarters after those already stored and upsert them into the stored files")
+    parser.add_argument("--overlap", type=int, default=0,
+                        help="With --refresh, also re-request this many stored quarters to pick up revisions")
+    args = parser.parse_args()
 
-    with open(os.path.join(api_keys_path, api_keys[0]), 'r') as f:
-        api_key = f.read().strip()
-    ind_code = "1121"
-    a = CensusAPI(api_key, ind_code)
-    a.contruct_url()
-    # print(a.request_url)
-    print(a.get_dataframe())
\ No newline at end of file
+    state_sets = [s.split(",") for s in args.states] if args.states else [["*"]]
+    cache = None if args.no_cache else ResponseCache(args.cache_dir, offline=args.offline)
+    # Offline runs need no real key; the cache ignores it
+    api_keys = ["offline"] if args.offline and args.api_keys is None else load_api_keys(args.api_keys)
+    fetcher = QWIFetcher(api_keys, workers=args.workers, rate=args.rate, retries=args.retries,
+                         backoff=args.backoff, base_url=args.base_url, cache=cache)
+    if args.refresh:
+        errors = refresh_industries(fetcher, args.industries, state_sets, args.out, fmt=args.format,
+                                    overlap=args.overlap)
+    else:
+        errors = download_industries(fetcher, args.industries, state_sets, args.out, fmt=args.format)
+    if cache is not None:
+        stats = cache.stats()
+        print(f"Response cache: {stats['hits']} hits, {stats['misses']} requests "
+              f"({stats['entries']} entries, {stats['bytes'] / 1e6:.1f} MB)")
+    sys.exit(1 if errors else 0)
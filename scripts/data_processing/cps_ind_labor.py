@@ -0,0 +1,123 @@
+"""
+Skilled/unskilled labor series by KLEMS industry from the CPS ASEC microdata.
+
+Builds every data/interim/ind_labor/{klems}.csv read by
+merge_al_data_industry.py, replacing the per-industry Julia passes of
+scripts/estimation/segment_labor_data_by ind.jl (one subset of the CPS per
+industry) and proc_labor_data_bulk.jl (one aggregation per subset):
+- one streaming pass over the CPS (the Parquet store of cps_store.py when it
+  is fresh) sums the sample of cps_labor.py by (year, IND1990, cell);
+- the census industries are mapped to KLEMS industries with
+  data/cross_walk.csv (code_census lists the IND1990 codes of each
+  code_klems) and their sums added up;
+- cps_labor.labor_series aggregates all industries at once: weights
+  normalized within industry and year, cells valued at the industry's 1980
+  group wages, skilled/unskilled totals.
+
+The sample and aggregation are those of the national series
+(labor_totl_python.csv); the Julia scripts kept >= 35 hours a week, used
+half the 1999 minimum wage as the floor and scaled L by the 1980 CPI99. YEAR
+is the income year (survey year - 1), as in the files the Julia scripts
+wrote: the ASEC reports the previous year's earnings. Industries with no
+workers in 1980 get a file with the header only, which
+merge_al_data_industry.py skips.
+
+Usage (from the repository root):
+    python scripts/data_processing/cps_ind_labor.py [--cps PATH] [--out DIR] [--crosswalk PATH]
+"""
+
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+import argparse
+import os
+import time
+
+import polars as pl
+from rich import print
+
+import config
+import cps_store
+from cps_labor import group_sums, labor_series, scan_cps, select_sample
+from instrument import RunLog
+
+INCOME_YEAR_LAG = 1  # the ASEC of year t reports earnings of year t - 1
+COLUMNS = ["YEAR", "L_S", "L_U", "W_S", "W_U", "SKILL_PREMIUM", "LABOR_INPUT_RATIO"]
+
+
+def read_crosswalk(path=None):
+    """(IND1990, KLEMS) pairs of the crosswalk, one row per census code, in crosswalk order."""
+    xwalk = pl.read_csv(path or config.PATH_CROSSWALK, infer_schema=False)
+    return xwalk.select(
+        pl.col("code_census").str.split(",").alias("IND1990"),
+        pl.col("code_klems").alias("KLEMS"),
+    ).explode("IND1990").with_columns(
+        pl.col("IND1990").str.strip_chars().cast(pl.Int64, strict=True)
+    )
+
+
+def industry_sums(lf, crosswalk):
+    """Cell sums of the sample per (YEAR, KLEMS) industry; census codes outside the crosswalk are dropped."""
+    sums = group_sums(select_sample(lf), by=["IND1990"]).collect(engine="streaming")
+    return sums.join(crosswalk, on="IND1990", how="inner").group_by(["YEAR", "KLEMS", "GROUP", "SKILL"]).agg(
+        pl.col("L_sum").sum(), pl.col("W_sum").sum(), pl.col("weight").sum()
+    )
+
+
+def industry_series(sums):
+    """Labor series of every industry in one frame, with YEAR as the income year."""
+    return labor_series(sums, by=["KLEMS"]).with_columns(pl.col("YEAR") - INCOME_YEAR_LAG)
+
+
+def write_industries(series, industries, out=None):
+    """Write one CSV per industry (header only for industries without a series); returns rows per industry."""
+    out = out or config.PATH_IND_LABOR
+    os.makedirs(out, exist_ok=True)
+    frames = series.partition_by("KLEMS", as_dict=True, include_key=False)
+    empty = pl.DataFrame(schema={c: series.schema[c] for c in COLUMNS})
+    rows = {}
+    for klems in industries:
+        df = frames.get((klems,), empty).select(COLUMNS)
+        df.write_csv(os.path.join(out, f"{klems}.csv"))
+        rows[klems] = len(df)
+    return rows
+
+
+def main(cps=None, out=None, crosswalk=None):
+    if cps is None:
+        cps = config.PATH_CPS_STORE if cps_store.is_fresh() else config.PATH_CPS_RAW
+    out = out or config.PATH_IND_LABOR
+    with RunLog("cps_ind_labor") as run:
+        run.info["cps"] = str(cps)
+        start = time.perf_counter()
+        xwalk = read_crosswalk(crosswalk)
+        industries = xwalk["KLEMS"].unique(maintain_order=True).to_list()
+        with run.step("industry_sums") as step:
+            sums = industry_sums(scan_cps(cps), xwalk)
+            step.rows_out = run.rows_in = len(sums)
+        with run.step("aggregate") as step:
+            series = industry_series(sums)
+            step.rows_in, step.rows_out = len(sums), len(series)
+        with run.step("write") as step:
+            rows = write_industries(series, industries, out)
+            step.rows_out = run.rows_out = sum(rows.values())
+        run.info["industry_rows"] = rows
+
+    empty = [klems for (klems, n) in rows.items() if n == 0]
+    if empty:
+        print(f"[bold yellow]No 1980 workers, written empty: {', '.join(empty)}")
+    print(f"[bold green]Labor series of {len(rows) - len(empty)} industries written to {out} "
+          f"[{time.perf_counter() - start:.2f}s]")
+    return series
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Aggregate the CPS ASEC extract to labor series by KLEMS industry.")
+    parser.add_argument("--cps", default=None,
+                        help="CPS extract CSV or Parquet store directory (default: data/proc/cps if fresh, "
+                             "else data/raw/cps_00022.csv)")
+    parser.add_argument("--out", default=None, help="Output directory (default: data/interim/ind_labor)")
+    parser.add_argument("--crosswalk", default=None, help="Industry crosswalk (default: data/cross_walk.csv)")
+    args = parser.parse_args()
+    main(args.cps, args.out, args.crosswalk)
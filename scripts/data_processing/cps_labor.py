@@ -0,0 +1,280 @@
+"""
+Skilled/unskilled labor series from the CPS ASEC microdata.
+
+Module version of notebooks/03_cps_microdata_processing.ipynb, built on a
+lazy Polars scan so the raw extract (data/raw/cps_00022.csv, several GB) is
+never loaded whole: only the columns used are parsed (projection pushdown),
+the filters on raw columns run inside the scan (predicate pushdown) and the
+group sums are collected with the streaming engine. Only the (year, cell)
+sums, a few thousand rows, are held in memory.
+
+Steps:
+- sample selection: valid ASECWT, 2014 redesign weight adjustment,
+  wage/salary workers, weeks worked reported, age 16-70, education reported,
+  1976+, weeks/hours/wage reported, >= 40 weeks, >= 30 hours, wage floor;
+- demographic cells: GROUP = education + age group + race + sex, SKILL;
+- aggregation: weights normalized within year, group hours and wages,
+  efficiency units at 1980 group wages, skilled/unskilled totals.
+
+Reads the year-partitioned Parquet store of the extract (cps_store.py) when
+it has been built from the current extract, so only the years from 1976 on
+and the columns above are decoded; otherwise the CSV is scanned.
+
+Usage (from the repository root):
+    python scripts/data_processing/cps_labor.py [--cps PATH] [--out PATH] [--flow]
+
+Writes data/proc/labor_totl_python.csv (YEAR, L_S, L_U, W_S, W_U,
+SKILL_PREMIUM, LABOR_INPUT_RATIO). The peak memory of the run (anonymous
+memory, plus the pages of the memory-mapped CSV, which the kernel reclaims
+under pressure) is printed and recorded in the run log.
+"""
+
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+import argparse
+import os
+import time
+
+import polars as pl
+from rich import print
+
+import config
+import cps_store
+from cps_recode import recode_age, recode_educ99, recode_higrade, recode_race
+from instrument import MemorySampler, RunLog, peak_rss_mb
+
+# Columns read from the extract. The fields that can hold NA entries ("NA",
+# ".") are parsed as floats with those entries as nulls; any other text in a
+# numeric column fails the scan instead of being dropped silently.
+CPS_SCHEMA = {
+    "YEAR": pl.Int64,
+    "ASECWT": pl.Float64,
+    "HFLAG": pl.Int64,
+    "CLASSWLY": pl.Int64,
+    "WKSWORK2": pl.Int64,
+    "AGE": pl.Int64,
+    "SEX": pl.Int64,
+    "RACE": pl.Int64,
+    "HIGRADE": pl.Float64,
+    "EDUC99": pl.Float64,
+    "WKSWORK1": pl.Float64,
+    "UHRSWORKLY": pl.Float64,
+    "INCWAGE": pl.Float64,
+    "CPI99": pl.Float64,
+    "IND1990": pl.Int64,
+}
+NA_VALUES = cps_store.NA_VALUES
+
+# CLASSWLY: 20=private, 22=federal, 24=state, 25=local, 27=nonprofit, 28=public
+WAGE_SALARY_CLASSES = [20, 22, 24, 25, 27, 28]
+AGE_RANGE = (16, 70)
+FIRST_YEAR = 1976  # weeks and hours are not reported before 1976
+MIN_WEEKS = 40
+MIN_HOURS = 30
+# Hourly wage floor in 1999 dollars: a quarter of the 1999 minimum wage
+# ($5.65/hr), as in the notebook (the Julia scripts use half)
+WAGE_FLOOR = 5.65 / 4
+BASE_YEAR = 1980  # group wages used as efficiency-unit weights
+
+
+def scan_cps(path=None):
+    """Lazy scan of the CPS data, projected to the columns and dtypes of CPS_SCHEMA.
+
+    `path` is the CSV extract or a Parquet store directory (cps_store.py). By
+    default the store is read when it is fresh, and the extract otherwise.
+    """
+    if path is None and cps_store.is_fresh():
+        path = config.PATH_CPS_STORE
+    path = path or config.PATH_CPS_RAW
+    if os.path.isdir(path):
+        # Compact store dtypes are widened so the sums match the CSV path
+        lf = cps_store.scan_store(columns=list(CPS_SCHEMA), path=path)
+        return lf.select(pl.col(c).cast(dtype) for (c, dtype) in CPS_SCHEMA.items())
+    lf = pl.scan_csv(path, schema_overrides=CPS_SCHEMA, null_values=NA_VALUES)
+    return lf.select(list(CPS_SCHEMA))
+
+
+def adjust_2014_weights(lf):
+    """Reweight the 2014 split sample (IPUMS: 5/8 of the traditional, 3/8 of the redesigned questions)."""
+    hflag = pl.col("HFLAG")
+    return lf.with_columns(
+        pl.when(pl.col("YEAR") == 2014)
+        .then(pl.col("ASECWT") * (5 / 8 * (1 - hflag) + 3 / 8 * hflag))
+        .otherwise(pl.col("ASECWT"))
+        .alias("ASECWT")
+    )
+
+
+def add_recodes(lf):
+    """Education, hours worked and hourly wage."""
+    return lf.with_columns(
+        recode_higrade("HIGRADE").alias("EDUCAT_1"),
+        recode_educ99("EDUC99").alias("EDUCAT_2"),
+    ).with_columns(
+        # HIGRADE if available, else EDUC99
+        pl.coalesce("EDUCAT_1", "EDUCAT_2").alias("EDUCAT"),
+        (pl.col("WKSWORK1") * pl.col("UHRSWORKLY")).alias("HOURS_WORKED"),
+    ).with_columns(
+        (pl.col("INCWAGE") / pl.col("HOURS_WORKED")).alias("WAGE"),
+    )
+
+
+def add_cells(lf):
+    """Demographic cell (education, age group, race, sex) and skill of each worker."""
+    return lf.with_columns(
+        recode_age("AGE").alias("AGEGROUP"),
+        recode_race("RACE").alias("RACEGROUP"),
+    ).with_columns(
+        (pl.col("EDUCAT") + pl.col("AGEGROUP") + pl.col("RACEGROUP") + pl.col("SEX").cast(pl.String)).alias("GROUP"),
+        pl.when(pl.col("EDUCAT") == "CG").then(pl.lit("S")).otherwise(pl.lit("U")).alias("SKILL"),
+    )
+
+
+# Filters applied after the valid-weight filter, in the order of the notebook.
+# The ones on raw columns are pushed down into the scan by Polars.
+SAMPLE_STEPS = [
+    ("Wage/salary workers", pl.col("CLASSWLY").is_in(WAGE_SALARY_CLASSES)),
+    ("Weeks worked reported", pl.col("WKSWORK2") != 0),
+    ("Age 16-70", pl.col("AGE").is_between(*AGE_RANGE)),
+    ("Education reported", pl.col("EDUCAT").is_not_null()),
+    (f"Years with complete data ({FIRST_YEAR}+)", pl.col("YEAR") >= FIRST_YEAR),
+    ("Has weeks/hours/wage reported",
+     pl.col("WKSWORK1").is_not_null() & pl.col("UHRSWORKLY").is_not_null() & pl.col("INCWAGE").is_not_null()),
+    (f">= {MIN_WEEKS} weeks worked", pl.col("WKSWORK1") >= MIN_WEEKS),
+    (f">= {MIN_HOURS} hours/week", pl.col("UHRSWORKLY") >= MIN_HOURS),
+    ("Positive hours worked", pl.col("HOURS_WORKED") > 0),
+    ("Wage floor", pl.col("WAGE") * pl.col("CPI99") >= WAGE_FLOOR),
+]
+
+
+def select_sample(lf):
+    """Workers kept by the sample selection, with their cell, skill, hours and wage."""
+    # Weights are checked before the 2014 adjustment, as in the notebook
+    lf = adjust_2014_weights(lf.filter(pl.col("ASECWT").is_not_null()))
+    lf = add_recodes(lf)
+    for _, predicate in SAMPLE_STEPS:
+        lf = lf.filter(predicate)
+    return add_cells(lf)
+
+
+def sample_flow(lf):
+    """Observations left after each sample selection step, counted in one streaming pass."""
+    lf = lf.with_columns(pl.col("ASECWT").is_not_null().alias("_kept"))
+    lf = add_recodes(adjust_2014_weights(lf))
+    kept = pl.col("_kept")
+    counts = [pl.len().alias("Raw CPS extract"), kept.sum().alias("Valid ASECWT")]
+    for label, predicate in SAMPLE_STEPS:
+        kept = kept & predicate
+        counts.append(kept.sum().alias(label))
+    row = lf.select(counts).collect(engine="streaming").row(0, named=True)
+    n = row["Raw CPS extract"]
+    return pl.DataFrame({
+        "Step": [f"{i}. {label}" for i, label in enumerate(row, start=1)],
+        "N": list(row.values()),
+        "Percent": [100 * v / n if n else None for v in row.values()],
+    })
+
+
+def group_sums(sample, by=()):
+    """Weighted hours, wages and weights per (YEAR, *by, GROUP, SKILL) cell."""
+    return sample.group_by(["YEAR", *by, "GROUP", "SKILL"]).agg(
+        (pl.col("HOURS_WORKED") * pl.col("ASECWT")).sum().alias("L_sum"),
+        (pl.col("WAGE") * pl.col("ASECWT")).sum().alias("W_sum"),
+        pl.col("ASECWT").sum().alias("weight"),
+    )
+
+
+def labor_series(sums, base_year=BASE_YEAR, by=()):
+    """Skilled/unskilled labor in efficiency units and average wages per year.
+
+    `sums` holds the cell sums of `group_sums`, with the same `by` columns
+    (e.g. an industry), which split the series: weights are normalized within
+    year and `by`, and cells are valued at their base-year wage within `by`.
+    Cells not observed in the base year are left out.
+    """
+    by = list(by)
+    grouped = sums.with_columns(pl.col("weight").sum().over(["YEAR", *by]).alias("_year_weight")).select(
+        "YEAR", *by, "GROUP", "SKILL",
+        (pl.col("L_sum") / pl.col("_year_weight")).alias("L_group"),
+        (pl.col("W_sum") / pl.col("_year_weight")).alias("W_group"),
+        (pl.col("weight") / pl.col("_year_weight")).alias("weight"),
+    ).with_columns(
+        (pl.col("W_group") / pl.col("weight")).alias("W_avg"),
+    )
+
+    # Efficiency units: group hours valued at the group's base-year wage
+    wages_base = grouped.filter(pl.col("YEAR") == base_year).select(*by, "GROUP", pl.col("W_avg").alias("W_1980"))
+    grouped = grouped.join(wages_base, on=[*by, "GROUP"], how="inner").with_columns(
+        (pl.col("L_group") * pl.col("W_1980")).alias("L_efficiency")
+    )
+
+    series = grouped.group_by(["YEAR", *by, "SKILL"]).agg(
+        pl.col("L_efficiency").sum().alias("L"),
+        (pl.col("W_avg") * pl.col("L_efficiency")).sum().alias("W_weighted"),
+    ).with_columns(
+        (pl.col("W_weighted") / pl.col("L")).alias("W")
+    )
+
+    wide = series.pivot(on="SKILL", index=["YEAR", *by], values=["L", "W"]).sort([*by, "YEAR"])
+    # A split with no skilled (or unskilled) workers has no column for them
+    wide = wide.with_columns(
+        pl.lit(None, dtype=pl.Float64).alias(c) for c in ["L_S", "L_U", "W_S", "W_U"] if c not in wide.columns
+    )
+    return wide.select(
+        "YEAR", *by, "L_S", "L_U", "W_S", "W_U",
+        (pl.col("W_S") / pl.col("W_U")).alias("SKILL_PREMIUM"),
+        (pl.col("L_S") / pl.col("L_U")).alias("LABOR_INPUT_RATIO"),
+    )
+
+
+def main(cps=None, out=None, flow=False):
+    if cps is None:
+        cps = config.PATH_CPS_STORE if cps_store.is_fresh() else config.PATH_CPS_RAW
+    out = out or config.PATH_LABOR_TOTL
+    with RunLog("cps_labor") as run, MemorySampler() as memory:
+        run.info["cps"] = str(cps)
+        start = time.perf_counter()
+        if flow:
+            with run.step("sample_flow") as step:
+                counts = sample_flow(scan_cps(cps))
+                step.rows_in = counts["N"][0]
+                step.rows_out = counts["N"][-1]
+            with pl.Config(tbl_rows=-1, fmt_str_lengths=60):
+                print(counts)
+
+        with run.step("group_sums") as step:
+            sums = group_sums(select_sample(scan_cps(cps))).collect(engine="streaming")
+            step.rows_out = run.rows_in = len(sums)
+        with run.step("aggregate") as step:
+            labor = labor_series(sums)
+            step.rows_in, step.rows_out = len(sums), len(labor)
+        with run.step("write") as step:
+            Path(out).parent.mkdir(parents=True, exist_ok=True)
+            labor.write_csv(out)
+            step.rows_out = run.rows_out = len(labor)
+        run.info["peak_anon_mb"] = memory.peak_anon_mb
+        run.info["peak_file_mb"] = memory.peak_file_mb
+
+    # The scanned CSV is memory-mapped: its pages count in the RSS but are
+    # reclaimed under memory pressure, so the anonymous peak is what the run needs
+    if memory.peak_anon_mb is not None:
+        peak = f"peak memory {memory.peak_anon_mb:.0f} MB + {memory.peak_file_mb:.0f} MB of mapped files"
+    else:
+        peak = f"peak RSS {peak_rss_mb():.0f} MB"
+    print(f"[bold green]Labor series for {labor['YEAR'].min()}-{labor['YEAR'].max()} "
+          f"from {sums['GROUP'].n_unique()} cells written to {out} "
+          f"[{time.perf_counter() - start:.2f}s, {peak}]")
+    return labor
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Aggregate the CPS ASEC extract to skilled/unskilled labor series.")
+    parser.add_argument("--cps", default=None,
+                        help="CPS extract CSV or Parquet store directory (default: data/proc/cps if fresh, "
+                             "else data/raw/cps_00022.csv)")
+    parser.add_argument("--out", default=None, help="Output CSV (default: data/proc/labor_totl_python.csv)")
+    parser.add_argument("--flow", action="store_true", help="Also count the observations kept at each selection step")
+    args = parser.parse_args()
+    main(args.cps, args.out, args.flow)
@@ -0,0 +1,147 @@
+"""
+Vectorized recodes of the CPS ASEC variables used by cps_labor.py.
+
+Each function returns a Polars expression, so the recodes run inside the
+query plan (in parallel and in the streaming engine) instead of calling a
+Python function per row through `map_elements`:
+- to_float: text fields (HIGRADE, EDUC99, WKSWORK1, UHRSWORKLY, INCWAGE) to
+  Float64; blanks and NA tokens become null, anything else that is not a
+  number is an error;
+- recode_higrade / recode_educ99: numeric education codes (pre-1992
+  HIGRADE, 1992+ EDUC99) to BH / HS / SC / CG, null when not reported;
+- recode_age: 5-year age groups "01" (up to 20) to "11" (66-70);
+- recode_race: W / B / O from a lookup table.
+
+Convert text columns once with `to_float`, then recode the numeric columns:
+
+    lf.with_columns(to_float("HIGRADE")).with_columns(recode_higrade().alias("EDUCAT_1"))
+
+cps_labor.py skips `to_float`: its scan parses those fields as floats
+directly, with NA_TOKENS as the CSV null values.
+
+The results match the row-wise functions of
+notebooks/03_cps_microdata_processing.ipynb on every value they accept
+(see benchmarks/bench_cps_recode.py), except that "NaN" text is null rather
+than NaN. CHECKS lists the edge cases (NaN, the code boundaries, ages outside
+16-70, nulls) with what the notebook functions return for them; run them
+with:
+
+    python scripts/data_processing/cps_recode.py
+"""
+
+import polars as pl
+
+# Compared after stripping and upper-casing; "NAN" keeps NaN out of the
+# comparisons below, where Polars orders it above every number
+NA_TOKENS = ["", "NA", "N/A", "NULL", ".", "NAN"]
+
+AGE_MIN, AGE_WIDTH, AGE_MAX = 16, 5, 70  # "01" is 16-20 (and any younger age), "11" is 66-70
+
+RACE_GROUPS = {100: "W", 200: "B"}  # everything else is "O"
+
+
+def to_float(column):
+    """`column` as Float64: blanks and NA tokens become null; other non-numeric text raises."""
+    text = pl.col(column).cast(pl.String).str.strip_chars()
+    return (
+        pl.when(text.str.to_uppercase().is_in(NA_TOKENS)).then(None).otherwise(text)
+        .cast(pl.Float64, strict=True)
+        .alias(column)
+    )
+
+
+def _number(column):
+    """`column` as Float64 with NaN as null (Polars orders NaN above every number, so it would pass `v >= x`)."""
+    return pl.col(column).cast(pl.Float64).fill_nan(None)
+
+
+def recode_higrade(column="HIGRADE"):
+    """Numeric HIGRADE (pre-1992) to BH (below high school), HS, SC (some college), CG (college graduate)."""
+    v = _number(column)
+    return (
+        pl.when((v < 31) | (v == 999)).then(None)
+        .when(v < 150).then(pl.lit("BH"))
+        .when(v == 150).then(pl.lit("HS"))
+        .when(v < 190).then(pl.lit("SC"))
+        .when(v >= 190).then(pl.lit("CG"))
+        .alias(column)
+    )
+
+
+def recode_educ99(column="EDUC99"):
+    """Numeric EDUC99 (1992+) to BH, HS, SC, CG; codes <= 1 and 9 are null, as in the notebook."""
+    v = _number(column)
+    return (
+        pl.when(v <= 1).then(None)
+        .when(v < 9).then(pl.lit("BH"))
+        .when(v == 10).then(pl.lit("HS"))
+        .when((v > 10) & (v < 15)).then(pl.lit("SC"))
+        .when(v >= 15).then(pl.lit("CG"))
+        .alias(column)
+    )
+
+
+def recode_age(column="AGE"):
+    """Age group "01" (up to 20), "02" (21-25), ..., "11" (66-70); null above 70."""
+    age = pl.col(column)
+    group = ((age - AGE_MIN) // AGE_WIDTH + 1).clip(lower_bound=1)
+    return pl.when(age <= AGE_MAX).then(group.cast(pl.String).str.zfill(2)).alias(column)
+
+
+def recode_race(column="RACE"):
+    """W (100), B (200) or O (any other code); null stays null."""
+    race = pl.col(column)
+    groups = race.replace_strict(RACE_GROUPS, default="O", return_dtype=pl.String)
+    return pl.when(race.is_not_null()).then(groups).alias(column)
+
+
+NAN = float("nan")
+
+# Edge cases: recode -> (inputs, outputs of the notebook's row-wise function).
+# "NaN" text is the one difference: the notebook's _to_float returns NaN.
+CHECKS = {
+    "recode_higrade": (
+        [None, NAN, 0, 30, 31, 149, 150, 151, 189, 190, 998, 999],
+        [None, None, None, None, "BH", "BH", "HS", "SC", "SC", "CG", "CG", None],
+    ),
+    "recode_educ99": (
+        [None, NAN, 0, 1, 2, 8, 9, 10, 11, 14, 15, 18],
+        [None, None, None, None, "BH", "BH", None, "HS", "SC", "SC", "CG", "CG"],
+    ),
+    "recode_age": (
+        [None, 0, 15, 16, 20, 21, 25, 26, 65, 66, 70, 71, 90],
+        [None, "01", "01", "01", "01", "02", "02", "03", "10", "11", "11", None, None],
+    ),
+    "recode_race": (
+        [None, 100, 200, 300, 651, 801],
+        [None, "W", "B", "O", "O", "O"],
+    ),
+    "to_float": (
+        ["12", " 7 ", "-2.5", "1e3", "", " ", "NA", "na", "N/A", "NULL", ".", "NaN", None],
+        [12.0, 7.0, -2.5, 1000.0, None, None, None, None, None, None, None, None, None],
+    ),
+}
+CHECK_DTYPES = {"recode_age": pl.Int64, "recode_race": pl.Int64, "to_float": pl.String}  # else Float64
+# Text that is neither a number nor an NA token: to_float must raise
+INVALID_TEXT = ["abc", "12a", "1,5"]
+
+
+def check():
+    """Run CHECKS and INVALID_TEXT; raises AssertionError on the first mismatch."""
+    recodes = {"recode_higrade": recode_higrade, "recode_educ99": recode_educ99,
+               "recode_age": recode_age, "recode_race": recode_race, "to_float": to_float}
+    for name, (inputs, expected) in CHECKS.items():
+        column = pl.Series("x", inputs, dtype=CHECK_DTYPES.get(name, pl.Float64))
+        got = column.to_frame().select(recodes[name]("x"))["x"].to_list()
+        assert got == expected, f"{name}: {list(zip(inputs, got, expected))}"
+    for text in INVALID_TEXT:
+        try:
+            pl.DataFrame({"x": [text]}).select(to_float("x"))
+        except pl.exceptions.InvalidOperationError:
+            continue
+        raise AssertionError(f"to_float accepted {text!r}")
+
+
+if __name__ == "__main__":
+    check()
+    print(f"cps_recode: {sum(len(i) for (i, _) in CHECKS.values()) + len(INVALID_TEXT)} edge cases ok")
@@ -0,0 +1,233 @@
+"""
+Year-partitioned Parquet cache of the CPS ASEC extract.
+
+The raw extract (data/raw/cps_00022.csv) is text: every read re-parses
+several GB and has to override dtypes (HFLAG, the NA entries of WKSWORK1,
+UHRSWORKLY, ...). `build` parses it once, streaming, with the fixed schema of
+STORE_SCHEMA (int8/int16/int32 codes, float32 weights and CPI) and writes
+data/proc/cps/YEAR={year}/part-0.parquet, plus a JSON header with the
+source file, row count, years and schema. Later reads only open the files of
+the years they need and only decode the columns they select:
+
+    from cps_store import scan_store
+    scan_store(years=range(1976, 2020), columns=["ASECWT", "IND1990"])   # LazyFrame
+
+NA entries ("NA", ".", blanks) become nulls during the ingest; any other
+text in a numeric column, or a value that does not fit its dtype, fails the
+build. Schema columns missing from the extract are stored as nulls, so every
+store has the same columns; extract columns not in the schema are dropped.
+
+Usage (from the repository root):
+    python scripts/data_processing/cps_store.py build [--cps PATH]
+    python scripts/data_processing/cps_store.py info
+
+cps_labor.py reads the store instead of the CSV when it is fresh (built from
+the current extract).
+"""
+
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+import argparse
+import json
+import os
+import shutil
+import time
+
+import polars as pl
+from rich import print
+
+import config
+from cps_recode import NA_TOKENS
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+    import pyarrow.dataset as pads
+except ImportError:  # pragma: no cover - optional dependency
+    pa = pacsv = pads = None
+
+HEADER = "cps.json"
+PARTITION = "YEAR"
+
+# IPUMS CPS variables kept in the store. Codes use the smallest integer type
+# that holds every code (including NIU codes such as 999 or 9999999); weights
+# and CPI99 are float32 and are summed in float64 by the readers.
+STORE_SCHEMA = {
+    "YEAR": pl.Int16,
+    "SERIAL": pl.Int32,
+    "MONTH": pl.Int8,
+    "ASECWT": pl.Float32,
+    "ASECWTH": pl.Float32,
+    "HFLAG": pl.Int8,
+    "CPI99": pl.Float32,
+    "AGE": pl.Int8,
+    "SEX": pl.Int8,
+    "RACE": pl.Int16,
+    "EMPSTAT": pl.Int8,
+    "OCC1990": pl.Int16,
+    "OCC2010": pl.Int16,
+    "IND1990": pl.Int16,
+    "AHRSWORKT": pl.Int16,
+    "EDUC": pl.Int16,
+    "HIGRADE": pl.Int16,
+    "EDUC99": pl.Int8,
+    "CLASSWLY": pl.Int8,
+    "WKSWORK1": pl.Int8,
+    "WKSWORK2": pl.Int8,
+    "UHRSWORKLY": pl.Int16,
+    "INCWAGE": pl.Int32,
+}
+# The CSV readers match null values exactly, so list the usual spellings of the tokens
+NA_VALUES = NA_TOKENS + [token.lower() for token in NA_TOKENS if token.lower() != token] + ["NaN"]
+
+
+def header_path(path=None):
+    return os.path.join(path or config.PATH_CPS_STORE, HEADER)
+
+
+def read_header(path=None):
+    with open(header_path(path)) as f:
+        return json.load(f)
+
+
+def is_fresh(path=None, cps=None):
+    """True if the store exists and was built from the current extract.
+
+    A store whose extract has since been removed (the raw file is large) is
+    still considered fresh.
+    """
+    if not os.path.isfile(header_path(path)):
+        return False
+    source = Path(cps or config.PATH_CPS_RAW)
+    if not source.is_file():
+        return True
+    header = read_header(path)
+    stat = source.stat()
+    return header["source_size"] == stat.st_size and header["source_mtime"] == stat.st_mtime
+
+
+def arrow_schema(columns=None):
+    """STORE_SCHEMA (or the listed columns of it) as a pyarrow schema."""
+    columns = columns or list(STORE_SCHEMA)
+    return pl.DataFrame(schema={c: STORE_SCHEMA[c] for c in columns}).to_arrow().schema
+
+
+def build_store(cps=None, path=None, block_mb=64):
+    """Parse the CSV extract once into the year-partitioned store; returns the header path."""
+    if pa is None:
+        raise ImportError("The CPS store requires pyarrow (pip install pyarrow)")
+    cps = Path(cps or config.PATH_CPS_RAW)
+    path = Path(path or config.PATH_CPS_STORE)
+    start = time.perf_counter()
+
+    with open(cps) as f:
+        header_columns = f.readline().strip().split(",")
+    columns = [c.strip('"') for c in header_columns]
+    dropped = [c for c in columns if c not in STORE_SCHEMA]
+    missing = [c for c in STORE_SCHEMA if c not in columns]
+    if PARTITION in missing:
+        raise ValueError(f"{cps} has no {PARTITION} column")
+
+    schema = arrow_schema()
+    reader = pacsv.open_csv(
+        cps,
+        read_options=pacsv.ReadOptions(block_size=block_mb * 1024**2),
+        convert_options=pacsv.ConvertOptions(
+            column_types=schema,
+            include_columns=list(STORE_SCHEMA),
+            include_missing_columns=True,  # as nulls of the schema dtype
+            null_values=NA_VALUES,
+            strings_can_be_null=True,
+        ),
+    )
+    counts = {"rows": 0, "years": set()}
+
+    def batches():
+        for batch in reader:
+            counts["rows"] += batch.num_rows
+            counts["years"].update(pl.from_arrow(batch.column(PARTITION)).drop_nulls().unique().to_list())
+            yield batch
+
+    # Write into a sibling directory and swap it in, so readers never see a partial store
+    tmp = path.with_name(path.name + ".tmp")
+    shutil.rmtree(tmp, ignore_errors=True)
+    try:
+        pads.write_dataset(
+            batches(), tmp, schema=schema, format="parquet",
+            partitioning=pads.partitioning(pa.schema([schema.field(PARTITION)]), flavor="hive"),
+            basename_template="part-{i}.parquet",
+            file_options=pads.ParquetFileFormat().make_write_options(compression="zstd"),
+            min_rows_per_group=256 * 1024,
+            max_partitions=4096,
+        )
+    except BaseException:
+        shutil.rmtree(tmp, ignore_errors=True)
+        raise
+    header = {
+        "source": str(cps),
+        "source_size": cps.stat().st_size,
+        "source_mtime": cps.stat().st_mtime,
+        "rows": counts["rows"],
+        "years": sorted(counts["years"]),
+        "schema": {c: str(dtype) for (c, dtype) in STORE_SCHEMA.items()},
+        "missing": missing,
+        "dropped": dropped,
+    }
+    with open(tmp / HEADER, "w") as f:
+        json.dump(header, f, indent=1)
+
+    old = path.with_name(path.name + ".old")
+    if path.exists():
+        os.replace(path, old)
+    os.replace(tmp, path)
+    shutil.rmtree(old, ignore_errors=True)
+
+    if missing:
+        print(f"[bold yellow]Not in the extract (stored as nulls): {', '.join(missing)}")
+    if dropped:
+        print(f"[bold yellow]Not in the store schema (dropped): {', '.join(dropped)}")
+    size = sum(f.stat().st_size for f in path.rglob("*.parquet"))
+    print(f"[bold green]CPS store of {counts['rows']:,} rows, {len(header['years'])} years "
+          f"({size / 1024**2:.0f} MB, from {cps.stat().st_size / 1024**2:.0f} MB of CSV) in "
+          f"{os.path.relpath(path, config.ROOT)} [{time.perf_counter() - start:.2f}s]")
+    return header_path(path)
+
+
+def scan_store(years=None, columns=None, path=None):
+    """Lazy scan of the store, with the dtypes of STORE_SCHEMA.
+
+    `years` (an iterable of years) and any later filter on YEAR prune the
+    partitions that are opened; `columns` selects the columns decoded (YEAR
+    is always included).
+    """
+    path = path or config.PATH_CPS_STORE
+    if not os.path.isfile(header_path(path)):
+        raise FileNotFoundError(f"No CPS store at {path}; run scripts/data_processing/cps_store.py build")
+    lf = pl.scan_parquet(
+        os.path.join(path, "**", "*.parquet"),
+        hive_partitioning=True,
+        hive_schema={PARTITION: STORE_SCHEMA[PARTITION]},
+    )
+    if columns is not None:
+        lf = lf.select([PARTITION] + [c for c in columns if c != PARTITION])
+    if years is not None:
+        lf = lf.filter(pl.col(PARTITION).is_in(list(years)))
+    return lf
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build or inspect the Parquet cache of the CPS extract.")
+    parser.add_argument("command", choices=["build", "info"])
+    parser.add_argument("--cps", default=None, help="CPS extract (default: data/raw/cps_00022.csv)")
+    parser.add_argument("--path", default=None, help="Store directory (default: data/proc/cps)")
+    args = parser.parse_args()
+
+    if args.command == "build":
+        build_store(args.cps, args.path)
+    else:
+        header = read_header(args.path)
+        print(f"{header['rows']:,} rows, years {header['years'][0]}-{header['years'][-1]}, from {header['source']}")
+        print(", ".join(f"{c}: {dtype}" for (c, dtype) in header["schema"].items()))
+        print(f"Fresh: {is_fresh(args.path, args.cps)}")
@@ -0,0 +1,173 @@
+"""
+Fit statistics and parameter distributions from the multi-start estimation results.
+
+The multi-start results of every industry (data/results/{IND}.csv: starting
+values alpha_0..phi_H_0, estimates alpha..phi_H, fit_rr/fit_wbr/fit_lbr/fit_sp
+and obj_val, one row per start) are loaded into one frame, the best start of
+each industry is picked by obj_val and the tables are computed column-wise
+over all industries at once:
+
+    runs = load_multistart()          # one row per (industry, start)
+    best = best_starts(runs)          # one row per industry
+    fits = industry_fit_table(best)   # = data/results/industry_fit_statistics.csv
+
+`industry_fit_table` reproduces the industry part of
+scripts/estimation/compute_fit_statistics.jl (SSE from the fit columns and
+RMSE = sqrt(SSE / 30)). RMSE/R^2/MAE against the model predictions
+(expand_fit_statistics.jl, compute_aggregate_fit.jl) need the model solution
+and stay in Julia.
+
+Usage (from the repository root), writing industry_fit_statistics.csv,
+industry_fit_summary.csv and multistart_parameter_summary.csv to data/results:
+    python scripts/data_processing/fit_stats.py
+"""
+
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+from rich import print
+
+import config
+import schema
+from industry_store import industry_files, read_industry_csv
+
+PARAMETERS = ["alpha", "sigma", "rho", "eta", "mu", "lambda", "phi_L", "phi_H"]
+START_COLUMNS = [p + "_0" for p in PARAMETERS]
+# Fitted series: short name -> column with its sum of squared errors
+FIT_COLUMNS = {"sp": "fit_sp", "wbr": "fit_wbr", "lbr": "fit_lbr", "rr": "fit_rr"}
+FIT_NAMES = {"sp": "Skill Premium", "wbr": "Wage Bill Ratio", "lbr": "Labor Share", "rr": "Relative Price"}
+N_OBS = 30  # years per industry (1988-2018), as in compute_fit_statistics.jl
+
+# Rows of the parameter distribution table: label -> function of the estimates
+PARAMETER_ROWS = {
+    "α (structures)": lambda p: p["alpha"],
+    "σ (equip-unskilled)": lambda p: p["sigma"],
+    "ρ (equip-skilled)": lambda p: p["rho"],
+    "σ - ρ (CSC)": lambda p: p["sigma"] - p["rho"],
+    "σₛ (elasticity)": lambda p: 1.0 / (1.0 - p["rho"]),
+    "σᵤ (elasticity)": lambda p: 1.0 / (1.0 - p["sigma"]),
+    "μ (unskilled share)": lambda p: p["mu"],
+    "λ (equipment share)": lambda p: p["lambda"],
+    "η_ω (shock var)": lambda p: p["eta"],
+}
+
+
+def load_multistart(codes=None):
+    """Multi-start results of all industries (or `codes`) in one frame.
+
+    Columns: `industry`, `start` (row number within the industry's file) and
+    the columns of the result files as float64. Reads the columnar store when
+    it is up to date and the CSVs otherwise.
+    """
+    partition = config.STORE_PARTITION
+    if config.store_is_fresh("results"):
+        runs = config.load_industries(codes, dataset="results")
+    else:
+        files = industry_files("results")
+        if codes is not None:
+            codes = [codes] if isinstance(codes, str) else list(codes)
+            missing = [c for c in codes if c not in files]
+            if missing:
+                raise KeyError(f"No multi-start results for industries {missing}")
+            files = {c: files[c] for c in codes}
+        if not files:
+            raise FileNotFoundError(f"No multi-start result files in {config.PATH_RESULTS}")
+        runs = pd.concat({code: read_industry_csv(path) for (code, path) in files.items()},
+                         names=[partition, None]).reset_index(level=0).reset_index(drop=True)
+        runs = schema.enforce(runs)
+    runs.insert(1, "start", runs.groupby(partition, sort=False, observed=True).cumcount())
+    return runs
+
+
+def best_starts(runs):
+    """The start with the lowest obj_val of each industry, one row per industry.
+
+    Starts with a missing or infinite obj_val are ignored; ties keep the first
+    start, like `argmin` in the Julia scripts. Adds `n_starts` (rows in the
+    file) and `n_valid` (starts with a finite obj_val). Industries without a
+    valid start are dropped.
+    """
+    partition = config.STORE_PARTITION
+    n_starts = runs.groupby(partition, observed=True).size()
+    valid = runs[np.isfinite(runs["obj_val"].to_numpy())]
+    n_valid = valid.groupby(partition, observed=True).size()
+    best = valid.sort_values([partition, "obj_val"], kind="stable").drop_duplicates(partition)
+    best = best.set_index(partition)
+    best["n_starts"] = n_starts.reindex(best.index)
+    best["n_valid"] = n_valid.reindex(best.index)
+    return best.reset_index()
+
+
+def industry_fit_table(best, n_obs=N_OBS):
+    """SSE and RMSE of each fitted series and the objective at the best start.
+
+    Same layout as data/results/industry_fit_statistics.csv; industries whose
+    best start has a NaN or infinite fit value are left out.
+    """
+    sse = best[list(FIT_COLUMNS.values())].to_numpy()
+    finite = np.isfinite(sse).all(axis=1) & np.isfinite(best["obj_val"].to_numpy())
+    table = pd.DataFrame({"Industry": best[config.STORE_PARTITION].astype(str).to_numpy()[finite]})
+    for i, name in enumerate(FIT_COLUMNS):
+        table[f"SSE_{name}"] = sse[finite, i]
+    rmse = np.sqrt(sse[finite] / n_obs)
+    for i, name in enumerate(FIT_COLUMNS):
+        table[f"RMSE_{name}"] = rmse[:, i]
+    table["Obj_Val"] = best["obj_val"].to_numpy()[finite]
+    return table
+
+
+def describe(values, index):
+    """Mean, median, sample std, min and max of each column of `values` (NaNs ignored)."""
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return pd.DataFrame({
+            "Mean": np.nanmean(values, axis=0),
+            "Median": np.nanmedian(values, axis=0),
+            "Std": np.nanstd(values, axis=0, ddof=1),
+            "Min": np.nanmin(values, axis=0),
+            "Max": np.nanmax(values, axis=0),
+        }, index=pd.Index(index, name="Variable"))
+
+
+def fit_summary(fits):
+    """Distribution across industries of the RMSE of each series and of the objective."""
+    columns = [f"RMSE_{name}" for name in FIT_COLUMNS] + ["Obj_Val"]
+    labels = [f"{FIT_NAMES[name]} ({name}) RMSE" for name in FIT_COLUMNS] + ["Objective"]
+    summary = describe(fits[columns].to_numpy(), labels)
+    summary.insert(0, "N", len(fits))
+    return summary
+
+
+def parameter_distribution(best, digits=3):
+    """Distribution of the estimates at the best start across industries.
+
+    Same rows and columns as data/results/parameter_distribution_summary.csv
+    (plot_parameter_distributions.jl, which reads data/results/ind_est), with
+    values rounded to `digits`.
+    """
+    params = {p: best[p].to_numpy() for p in PARAMETERS}
+    with np.errstate(divide="ignore"):
+        values = np.column_stack([row(params) for row in PARAMETER_ROWS.values()])
+    values = np.where(np.isfinite(values), values, np.nan)
+    summary = describe(values, list(PARAMETER_ROWS)).round(digits)
+    summary.index.name = "Parameter"
+    return summary.reset_index()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fit statistics and parameter distributions from the multi-start results.")
+    parser.add_argument("--n-obs", type=int, default=N_OBS, help="Observations per industry for the RMSE")
+    parser.add_argument("--out", default=config.PATH_RESULTS, help="Output directory")
+    args = parser.parse_args()
+
+    best = best_starts(load_multistart())
+    fits = industry_fit_table(best, n_obs=args.n_obs)
+    fits.to_csv(os.path.join(args.out, "industry_fit_statistics.csv"), index=False)
+    fit_summary(fits).to_csv(os.path.join(args.out, "industry_fit_summary.csv"))
+    parameter_distribution(best).to_csv(os.path.join(args.out, "multistart_parameter_summary.csv"), index=False)
+    print(f"[bold green]Fit statistics for {len(fits)} of {len(best)} industries written to {args.out}")
@@ -5,33 +5,55 @@ This script creates publication-ready LaTeX tables from processed data:
 1. Aggregate summary statistics by decade
 2. Industry-level trend correlations
 3. Labor share heterogeneity groups
-4. Slope distribution figure
+4. Model fit and parameter distribution across industries (best of the
+   multi-start estimation results, see fit_stats.py)
+5. Slope distribution figure
 
 Inputs:
 - data/Data_KORV.csv: Aggregate time series
-- data/proc/ind/*.csv: Industry-level data
+- data/proc/ind/*.csv: Industry-level data (read from the Parquet store
+  data/proc/store/ind.parquet instead when it is up to date)
 - data/results/labor_share_by_industry.csv: Labor share statistics
+- data/results/{IND}.csv: Multi-start estimation results
 - data/cross_walk.csv: Industry name mappings
 
 Outputs:
 - documents/tables/*.tex: LaTeX table files
 - documents/images/slope_distribution.pdf: Slope distribution figure
 - data/results/*.csv: Summary statistics CSVs
+
+Each table and figure is a job in JOBS with declared inputs and outputs.
+Only jobs whose inputs or code (CODE_FILES) changed since the last run are
+rebuilt; pass --force to regenerate everything. Usage (from the repository root):
+    python scripts/data_processing/generate_manuscript_tables.py [JOB ...] [--workers N] [--force]
+    python scripts/data_processing/generate_manuscript_tables.py --list
+
+Independent jobs run concurrently with --workers > 1, and figures are
+always rendered in a separate process. matplotlib and seaborn are imported
+only by the figure jobs.
 """
 
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+import argparse
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-from pathlib import Path
-from scipy.stats import linregress
+import config
+import schema
+from instrument import RunLog
+from manifest import Manifest, fingerprint
+from trends import trend_stats
+from period_stats import period_summary
+from fit_stats import N_OBS, best_starts, fit_summary, industry_fit_table, load_multistart, parameter_distribution
+from industry_store import industry_files
+from panel import Panel, is_fresh as panel_is_fresh
 import warnings
 warnings.filterwarnings('ignore')
 
-# Set seaborn style for sleek plots
-sns.set_style("whitegrid")
-sns.set_context("paper", font_scale=1.2)
-
 # Setup paths
 ROOT = Path(__file__).resolve().parents[2]
 DATA_DIR = ROOT / 'data'
@@ -45,88 +67,84 @@ RESULTS_DIR.mkdir(exist_ok=True, parents=True)
 TABLES_DIR.mkdir(exist_ok=True, parents=True)
 IMAGES_DIR.mkdir(exist_ok=True, parents=True)
 
-print("="*100)
-print("GENERATING MANUSCRIPT TABLES FOR DATA DESCRIPTION SECTION")
-print("="*100)
-print(f"\nRoot directory: {ROOT}")
-print(f"Data directory: {DATA_DIR}")
-print(f"Output directories created")
+TRENDS_CSV = RESULTS_DIR / 'industry_trends.csv'
+
+# The code the tables are computed with: a change to any of these files
+# rebuilds every job, as a change to this script does
+CODE_FILES = [Path(__file__)] + [Path(__file__).parent / f"{module}.py" for module in
+                                 ("schema", "trends", "period_stats", "fit_stats", "panel", "industry_store")]
+
+
+def iter_industry_frames():
+    """Yield (file stem, DataFrame) for each industry in data/proc/ind.
+
+    Uses the memory-mapped panel or else the columnar store when it is newer
+    than every industry CSV, and falls back to parsing the CSVs otherwise.
+    """
+    if panel_is_fresh():
+        ind_panel = Panel.open()
+        for code in ind_panel.industries:
+            yield code, ind_panel.frame(code)
+    elif config.store_is_fresh("ind"):
+        panel = config.load_industries()
+        for code, df in panel.groupby(config.STORE_PARTITION, sort=False, observed=True):
+            yield code, df.drop(columns=config.STORE_PARTITION).reset_index(drop=True)
+    else:
+        for file in sorted(DATA_IND.glob('*.csv')):
+            yield file.stem, schema.read_csv(file, float_precision='round_trip')
 
 
 # ============================================================================
 # TABLE 1: AGGREGATE SUMMARY STATISTICS BY DECADE
 # ============================================================================
-print("\n" + "="*100)
-print("TABLE 1: AGGREGATE SUMMARY STATISTICS BY DECADE")
-print("="*100)
-
-# Load aggregate data
-korv_data = pd.read_csv(DATA_DIR / 'Data_KORV.csv', skipinitialspace=True)
-
-# Add year column (KORV data covers 1963-1992, but file might be extended)
-korv_data['YEAR'] = range(1963, 1963 + len(korv_data))
-
-# Calculate derived variables
-korv_data['SKILL_PREMIUM'] = korv_data['W_S'] / korv_data['W_U']
-korv_data['LABOR_INPUT_RATIO'] = korv_data['L_S'] / korv_data['L_U']
-korv_data['CAPITAL_RATIO'] = korv_data['K_EQ'] / korv_data['K_STR']
-korv_data['TOTAL_CAPITAL'] = korv_data['K_EQ'] + korv_data['K_STR']
-
-print(f"Loaded aggregate data: {korv_data['YEAR'].min()}-{korv_data['YEAR'].max()} ({len(korv_data)} years)")
-
-# Create decade groupings
-korv_data['DECADE'] = (korv_data['YEAR'] // 10) * 10
-
-def decade_growth(group, var):
-    """Calculate annualized growth rate for a decade"""
-    if len(group) < 2:
-        return np.nan
-    initial = group[var].iloc[0]
-    final = group[var].iloc[-1]
-    years = len(group) - 1
-    if initial > 0 and years > 0:
-        return ((final / initial) ** (1/years) - 1) * 100
-    return np.nan
-
-# Calculate decade statistics
-decade_stats = []
-
-for decade in sorted(korv_data['DECADE'].unique()):
-    decade_data = korv_data[korv_data['DECADE'] == decade]
-    
-    stats = {
-        'Decade': f"{decade}s",
-        'Years': f"{decade_data['YEAR'].min()}-{decade_data['YEAR'].max()}",
-        'N': len(decade_data),
-        
-        # Means
-        'SP_mean': decade_data['SKILL_PREMIUM'].mean(),
-        'LIR_mean': decade_data['LABOR_INPUT_RATIO'].mean(),
-        'K_EQ_mean': decade_data['K_EQ'].mean(),
-        'K_STR_mean': decade_data['K_STR'].mean(),
-        'K_RATIO_mean': decade_data['CAPITAL_RATIO'].mean(),
-        'L_SHARE_mean': decade_data['L_SHARE'].mean(),
-        'OUTPUT_mean': decade_data['OUTPUT'].mean(),
-        
-        # Growth rates (annualized %)
-        'SP_growth': decade_growth(decade_data, 'SKILL_PREMIUM'),
-        'LIR_growth': decade_growth(decade_data, 'LABOR_INPUT_RATIO'),
-        'K_EQ_growth': decade_growth(decade_data, 'K_EQ'),
-        'K_STR_growth': decade_growth(decade_data, 'K_STR'),
-        'K_RATIO_growth': decade_growth(decade_data, 'CAPITAL_RATIO'),
-        'L_SHARE_growth': decade_growth(decade_data, 'L_SHARE'),
-        'OUTPUT_growth': decade_growth(decade_data, 'OUTPUT'),
-    }
-    decade_stats.append(stats)
-
-decade_summary = pd.DataFrame(decade_stats)
-
-print(f"\nComputed statistics for {len(decade_summary)} decades")
-print("\nMeans:")
-print(decade_summary[['Decade', 'SP_mean', 'LIR_mean', 'K_RATIO_mean', 'L_SHARE_mean']].to_string(index=False))
-
-# Generate LaTeX table with two-row structure
-latex_agg = r"""\begin{table}[H]
+DECADE_VARIABLES = {
+    'SP': 'SKILL_PREMIUM',
+    'LIR': 'LABOR_INPUT_RATIO',
+    'K_EQ': 'K_EQ',
+    'K_STR': 'K_STR',
+    'K_RATIO': 'CAPITAL_RATIO',
+    'L_SHARE': 'L_SHARE',
+    'OUTPUT': 'OUTPUT',
+}
+
+
+def table_aggregate_summary():
+    """Table 1: aggregate summary statistics by decade from Data_KORV.csv."""
+    print("\n" + "="*100)
+    print("TABLE 1: AGGREGATE SUMMARY STATISTICS BY DECADE")
+    print("="*100)
+
+    # Load aggregate data
+    korv_data = pd.read_csv(DATA_DIR / 'Data_KORV.csv', skipinitialspace=True)
+
+    # Add year column (KORV data covers 1963-1992, but file might be extended)
+    korv_data['YEAR'] = schema.to_years(range(1963, 1963 + len(korv_data)))
+
+    # Calculate derived variables
+    korv_data['SKILL_PREMIUM'] = korv_data['W_S'] / korv_data['W_U']
+    korv_data['LABOR_INPUT_RATIO'] = korv_data['L_S'] / korv_data['L_U']
+    korv_data['CAPITAL_RATIO'] = korv_data['K_EQ'] / korv_data['K_STR']
+    korv_data['TOTAL_CAPITAL'] = korv_data['K_EQ'] + korv_data['K_STR']
+
+    print(f"Loaded aggregate data: {korv_data['YEAR'].min()}-{korv_data['YEAR'].max()} ({len(korv_data)} years)")
+
+    # Decade means and annualized growth rates in one grouped pass
+    summary = period_summary(korv_data, list(DECADE_VARIABLES.values()), length=10)
+    decade_summary = pd.DataFrame({
+        'Decade': summary['WINDOW'].astype(str) + 's',
+        'Years': summary['START'].astype(str) + '-' + summary['END'].astype(str),
+        'N': summary['N'],
+    })
+    for stat in ['mean', 'growth']:
+        for short, var in DECADE_VARIABLES.items():
+            decade_summary[f'{short}_{stat}'] = summary[f'{var}_{stat}']
+
+    print(f"\nComputed statistics for {len(decade_summary)} decades")
+    print("\nMeans:")
+    print(decade_summary[['Decade', 'SP_mean', 'LIR_mean', 'K_RATIO_mean', 'L_SHARE_mean']].to_string(index=False))
+
+    # Generate LaTeX table with two-row structure
+    latex_agg = r"""\begin{table}[H]
 \centering
 \caption{Aggregate Summary Statistics by Decade}
 \label{tab:aggregate_summary_stats}
@@ -139,25 +157,25 @@ Decade & Skill Premium & Labor Input Ratio & Capital Ratio \\
 \midrule
 """
 
-for _, row in decade_summary.iterrows():
-    latex_agg += f"{row['Decade']} & "
-    latex_agg += f"{row['SP_mean']:.3f} ({row['SP_growth']:+.2f}\\%) & "
-    latex_agg += f"{row['LIR_mean']:.3f} ({row['LIR_growth']:+.2f}\\%) & "
-    latex_agg += f"{row['K_RATIO_mean']:.3f} ({row['K_RATIO_growth']:+.2f}\\%) \\\\\n"
+    for _, row in decade_summary.iterrows():
+        latex_agg += f"{row['Decade']} & "
+        latex_agg += f"{row['SP_mean']:.3f} ({row['SP_growth']:+.2f}\\%) & "
+        latex_agg += f"{row['LIR_mean']:.3f} ({row['LIR_growth']:+.2f}\\%) & "
+        latex_agg += f"{row['K_RATIO_mean']:.3f} ({row['K_RATIO_growth']:+.2f}\\%) \\\\\n"
 
-latex_agg += r"""\midrule
+    latex_agg += r"""\midrule
 \multicolumn{4}{c}{\textbf{Panel B: Labor and Output}} \\
 \midrule
 Decade & Labor Share & Output Growth & \\
 \midrule
 """
 
-for _, row in decade_summary.iterrows():
-    latex_agg += f"{row['Decade']} & "
-    latex_agg += f"{row['L_SHARE_mean']:.3f} ({row['L_SHARE_growth']:+.2f}\\%) & "
-    latex_agg += f"{row['OUTPUT_growth']:+.2f}\\% & \\\\\n"
+    for _, row in decade_summary.iterrows():
+        latex_agg += f"{row['Decade']} & "
+        latex_agg += f"{row['L_SHARE_mean']:.3f} ({row['L_SHARE_growth']:+.2f}\\%) & "
+        latex_agg += f"{row['OUTPUT_growth']:+.2f}\\% & \\\\\n"
 
-latex_agg += r"""\bottomrule
+    latex_agg += r"""\bottomrule
 \end{tabular}
 \begin{minipage}{\textwidth}
 \vspace{0.2cm}
@@ -168,147 +186,168 @@ Labor Share is labor's share of national income. Growth rates are annualized per
 \end{minipage}
 \end{table}"""
 
-# Save
-output_file = TABLES_DIR / 'aggregate_summary_stats.tex'
-with open(output_file, 'w') as f:
-    f.write(latex_agg)
+    # Save
+    output_file = TABLES_DIR / 'aggregate_summary_stats.tex'
+    with open(output_file, 'w') as f:
+        f.write(latex_agg)
 
-# Save CSV
-decade_summary.to_csv(RESULTS_DIR / 'aggregate_decade_summary.csv', index=False)
+    # Save CSV
+    decade_summary.to_csv(RESULTS_DIR / 'aggregate_decade_summary.csv', index=False)
 
-print(f"✅ LaTeX table: {output_file.relative_to(ROOT)}")
-print(f"✅ CSV data: {(RESULTS_DIR / 'aggregate_decade_summary.csv').relative_to(ROOT)}")
+    print(f"✅ LaTeX table: {output_file.relative_to(ROOT)}")
+    print(f"✅ CSV data: {(RESULTS_DIR / 'aggregate_decade_summary.csv').relative_to(ROOT)}")
 
 
 # ============================================================================
 # TABLE 2: INDUSTRY-LEVEL TREND ANALYSIS
 # ============================================================================
-print("\n" + "="*100)
-print("TABLE 2: INDUSTRY-LEVEL TREND ANALYSIS")
-print("="*100)
-
-# Load crosswalk for industry names
-crosswalk = pd.read_csv(DATA_DIR / 'cross_walk.csv')
-# Map KLEMS codes to BEA codes and industry names
-klems_to_bea = dict(zip(crosswalk['code_klems'].str.upper(), crosswalk['code_bea'].str.upper()))
-code_to_name = dict(zip(crosswalk['code_bea'].str.upper(), crosswalk['ind_desc']))
-
-print(f"Loaded crosswalk with {len(crosswalk)} industries")
-
-# Process each industry to calculate trend slopes
-industry_trends = []
-
-for file in sorted(DATA_IND.glob('*.csv')):
-    try:
-        klems_code = file.stem.upper()  # File uses KLEMS code
-        ind_code = klems_to_bea.get(klems_code, klems_code)  # Convert to BEA code
-        df = pd.read_csv(file)
-        
-        if len(df) < 5:  # Need sufficient data for trend
-            continue
-        
-        df = df.sort_values('YEAR')
-        years = df['YEAR'].values
-        
-        # Calculate slopes using linear regression
-        slopes = {}
-        
-        # Skill premium slope (prefer pre-computed column, else compute safely)
-        if 'SKILL_PREMIUM' in df.columns:
-            skill_prem = df['SKILL_PREMIUM'].values
-        elif 'W_S' in df.columns and 'W_U' in df.columns:
-            # avoid division by zero
-            denom = df['W_U'].replace(0, np.nan)
-            skill_prem = (df['W_S'] / denom).values
-        else:
-            skill_prem = np.array([])
-
-        if len(skill_prem) > 0 and not np.all(np.isnan(skill_prem)):
-            try:
-                slope, _, _, _, _ = linregress(years, skill_prem)
-                slopes['SP_slope'] = slope
-            except Exception:
-                pass
-
-        # Labor input ratio slope (prefer pre-computed column, else compute safely)
-        if 'LABOR_INPUT_RATIO' in df.columns:
-            labor_ratio = df['LABOR_INPUT_RATIO'].values
-        elif 'L_S' in df.columns and 'L_U' in df.columns:
-            denom = df['L_U'].replace(0, np.nan)
-            labor_ratio = (df['L_S'] / denom).values
-        else:
-            labor_ratio = np.array([])
-
-        if len(labor_ratio) > 0 and not np.all(np.isnan(labor_ratio)):
-            try:
-                slope, _, _, _, _ = linregress(years, labor_ratio)
-                slopes['LIR_slope'] = slope
-            except Exception:
-                pass
-        
-        # Capital ratio slope
-        if 'K_EQ' in df.columns and 'K_STR' in df.columns:
-            capital_ratio = (df['K_EQ'] / df['K_STR']).values
-            if len(capital_ratio) > 0 and not np.all(np.isnan(capital_ratio)):
-                slope, _, _, _, _ = linregress(years, capital_ratio)
-                slopes['KR_slope'] = slope
-        
-        # Labor share slope
-        if 'L_SHARE' in df.columns:
-            l_share = df['L_SHARE'].values
-            if len(l_share) > 0 and not np.all(np.isnan(l_share)):
-                slope, _, _, _, _ = linregress(years, l_share)
-                slopes['LS_slope'] = slope
-        
-        if slopes:  # Only add if we calculated at least one slope
-            slopes['Industry'] = code_to_name.get(ind_code, ind_code)
-            slopes['Code'] = ind_code
-            industry_trends.append(slopes)
-            
-    except Exception as e:
-        print(f"Warning: Error processing {file.name}: {e}")
-
-trends_df = pd.DataFrame(industry_trends)
-
-print(f"✅ Calculated trends for {len(trends_df)} industries")
-
-# Print distribution statistics
-print("\nDistribution Statistics:")
-for var in ['SP_slope', 'LIR_slope', 'KR_slope', 'LS_slope']:
-    if var in trends_df.columns:
-        data = trends_df[var].dropna()
-        n_positive = (data > 0).sum()
-        pct_positive = (n_positive / len(data)) * 100
+TREND_VARIABLES = ['SP', 'LIR', 'KR', 'LS']
+TREND_STATS = ['slope', 'intercept', 'stderr', 'intercept_stderr', 'r2', 'nobs']
+
+
+def trend_variables(df):
+    """Variables regressed on year in Table 2, indexed by YEAR.
+
+    Variables whose source columns are missing are left out.
+    """
+    variables = {}
+    # Skill premium (prefer pre-computed column, else compute safely)
+    if 'SKILL_PREMIUM' in df.columns:
+        variables['SP'] = df['SKILL_PREMIUM']
+    elif 'W_S' in df.columns and 'W_U' in df.columns:
+        # avoid division by zero
+        variables['SP'] = df['W_S'] / df['W_U'].replace(0, np.nan)
+    # Labor input ratio (prefer pre-computed column, else compute safely)
+    if 'LABOR_INPUT_RATIO' in df.columns:
+        variables['LIR'] = df['LABOR_INPUT_RATIO']
+    elif 'L_S' in df.columns and 'L_U' in df.columns:
+        variables['LIR'] = df['L_S'] / df['L_U'].replace(0, np.nan)
+    # Capital ratio
+    if 'K_EQ' in df.columns and 'K_STR' in df.columns:
+        variables['KR'] = df['K_EQ'] / df['K_STR']
+    # Labor share
+    if 'L_SHARE' in df.columns:
+        variables['LS'] = df['L_SHARE']
+    return pd.DataFrame(variables, dtype=float).set_axis(df['YEAR'].values)
+
+
+def stack_trend_variables(industry_series):
+    """Stack per-industry trend variables into an (industry, variable, year) array.
+
+    Returns (years, values, observed): the union of all years, the values
+    (NaN where missing) and a mask of the cells present in the source data.
+    """
+    years = np.unique(np.concatenate([s.index.values for s in industry_series.values()] or [[]]))
+    shape = (len(industry_series), len(TREND_VARIABLES), len(years))
+    values = np.full(shape, np.nan)
+    observed = np.zeros(shape, dtype=bool)
+    for i, s in enumerate(industry_series.values()):
+        pos = np.searchsorted(years, s.index.values)
+        for v, var in enumerate(TREND_VARIABLES):
+            if var in s.columns:
+                values[i, v, pos] = s[var].values
+                observed[i, v, pos] = True
+    return years, values, observed
+
+
+def table_industry_trends():
+    """Table 2: OLS trend slopes by industry; returns the trends dataframe."""
+    print("\n" + "="*100)
+    print("TABLE 2: INDUSTRY-LEVEL TREND ANALYSIS")
+    print("="*100)
+
+    # Load crosswalk for industry names
+    crosswalk = schema.read_csv(DATA_DIR / 'cross_walk.csv')
+    # Map KLEMS codes to BEA codes and industry names
+    klems_to_bea = dict(zip(crosswalk['code_klems'].str.upper(), crosswalk['code_bea'].str.upper()))
+    code_to_name = dict(zip(crosswalk['code_bea'].str.upper(), crosswalk['ind_desc']))
+
+    print(f"Loaded crosswalk with {len(crosswalk)} industries")
+
+    # Stack the trend variables of all industries into one
+    # (industry, variable, year) array and regress them on year in one pass
+    industry_series = {}
+    for stem, df in iter_industry_frames():
+        try:
+            if len(df) < 5:  # Need sufficient data for trend
+                continue
+            industry_series[stem.upper()] = trend_variables(df.sort_values('YEAR'))  # File uses KLEMS code
+        except Exception as e:
+            print(f"Warning: Error processing {stem}: {e}")
+
+    years, values, observed = stack_trend_variables(industry_series)
+    stats = trend_stats(years, values, observed=observed)
+
+    # A slope is reported when the variable has at least one non-missing value;
+    # NaNs inside a series make its slope NaN, as with scipy's linregress
+    computed = (observed & ~np.isnan(values)).any(axis=-1)
+    keep = computed.any(axis=1)
+    codes = [klems_to_bea.get(k, k) for k in industry_series]  # Convert to BEA code
+    trends_df = pd.DataFrame(np.where(computed, stats['slope'], np.nan)[keep],
+                             columns=[f"{var}_slope" for var in TREND_VARIABLES])
+    trends_df = trends_df.loc[:, computed[keep].any(axis=0)]
+    trends_df['Industry'] = [code_to_name.get(c, c) for (c, k) in zip(codes, keep) if k]
+    trends_df['Code'] = [c for (c, k) in zip(codes, keep) if k]
+
+    # Full regression output (intercepts, standard errors, R^2) in long form
+    ind_idx, var_idx = np.nonzero(computed)
+    trend_stats_df = pd.DataFrame({
+        'Code': np.array(codes, dtype=object)[ind_idx],
+        'Variable': np.array(TREND_VARIABLES, dtype=object)[var_idx],
+        **{key: stats[key][ind_idx, var_idx] for key in TREND_STATS},
+    })
+
+    print(f"✅ Calculated trends for {len(trends_df)} industries")
+
+    # Print distribution statistics
+    print("\nDistribution Statistics:")
+    for var in ['SP_slope', 'LIR_slope', 'KR_slope', 'LS_slope']:
+        if var in trends_df.columns:
+            data = trends_df[var].dropna()
+            n_positive = (data > 0).sum()
+            pct_positive = (n_positive / len(data)) * 100
         
-        print(f"\n  {var.replace('_slope', '')}:")
-        print(f"    N industries: {len(data)}")
-        print(f"    Increasing: {n_positive} ({pct_positive:.1f}%)")
-        print(f"    Median: {data.median():.6f}")
-        print(f"    IQR: [{data.quantile(0.25):.6f}, {data.quantile(0.75):.6f}]")
+            print(f"\n  {var.replace('_slope', '')}:")
+            print(f"    N industries: {len(data)}")
+            print(f"    Increasing: {n_positive} ({pct_positive:.1f}%)")
+            print(f"    Median: {data.median():.6f}")
+            print(f"    IQR: [{data.quantile(0.25):.6f}, {data.quantile(0.75):.6f}]")
 
-# Save industry trends
-trends_df.to_csv(RESULTS_DIR / 'industry_trends.csv', index=False)
-print(f"\n✅ CSV data: {(RESULTS_DIR / 'industry_trends.csv').relative_to(ROOT)}")
+    # Save industry trends
+    trends_df.to_csv(RESULTS_DIR / 'industry_trends.csv', index=False)
+    trend_stats_df.to_csv(RESULTS_DIR / 'industry_trend_stats.csv', index=False)
+    print(f"\n✅ CSV data: {(RESULTS_DIR / 'industry_trends.csv').relative_to(ROOT)}")
+    print(f"✅ CSV data: {(RESULTS_DIR / 'industry_trend_stats.csv').relative_to(ROOT)}")
+    return trends_df
 
 
 # ============================================================================
 # TABLE 3: CORRELATION MATRIX
 # ============================================================================
-print("\n" + "="*100)
-print("TABLE 3: CORRELATION MATRIX OF INDUSTRY TRENDS")
-print("="*100)
+def load_trends():
+    """The Table 2 output read back from industry_trends.csv."""
+    return pd.read_csv(TRENDS_CSV, float_precision='round_trip')
 
-corr_data = trends_df[['SP_slope', 'LIR_slope', 'KR_slope', 'LS_slope']].dropna()
 
-if len(corr_data) > 0:
-    corr_matrix = corr_data.corr()
+def table_correlations(trends_df=None):
+    """Table 3: correlation matrix of the industry trend slopes."""
+    if trends_df is None:
+        trends_df = load_trends()
+    print("\n" + "="*100)
+    print("TABLE 3: CORRELATION MATRIX OF INDUSTRY TRENDS")
+    print("="*100)
+
+    corr_data = trends_df[['SP_slope', 'LIR_slope', 'KR_slope', 'LS_slope']].dropna()
+
+    if len(corr_data) > 0:
+        corr_matrix = corr_data.corr()
     
-    print(f"Computing correlations for {len(corr_data)} industries with complete data")
-    print("\nPearson correlations:")
-    print(corr_matrix.to_string())
+        print(f"Computing correlations for {len(corr_data)} industries with complete data")
+        print("\nPearson correlations:")
+        print(corr_matrix.to_string())
     
-    # Generate LaTeX correlation matrix
-    latex_corr = r"""\begin{table}[H]
+        # Generate LaTeX correlation matrix
+        latex_corr = r"""\begin{table}[H]
 \centering
 \caption{Correlation Matrix of Industry-Level Trends}
 \label{tab:correlations_matrix}
@@ -319,24 +358,24 @@ if len(corr_data) > 0:
 \midrule
 """
     
-    var_names = {
-        'SP_slope': 'Skill Premium',
-        'LIR_slope': 'Labor Input Ratio',
-        'KR_slope': 'Capital Ratio',
-        'LS_slope': 'Labor Share'
-    }
+        var_names = {
+            'SP_slope': 'Skill Premium',
+            'LIR_slope': 'Labor Input Ratio',
+            'KR_slope': 'Capital Ratio',
+            'LS_slope': 'Labor Share'
+        }
     
-    for var in ['SP_slope', 'LIR_slope', 'KR_slope', 'LS_slope']:
-        latex_corr += var_names[var]
-        for var2 in ['SP_slope', 'LIR_slope', 'KR_slope', 'LS_slope']:
-            corr_val = corr_matrix.loc[var, var2]
-            if var == var2:
-                latex_corr += " & 1.00"
-            else:
-                latex_corr += f" & {corr_val:.2f}"
-        latex_corr += " \\\\\n"
+        for var in ['SP_slope', 'LIR_slope', 'KR_slope', 'LS_slope']:
+            latex_corr += var_names[var]
+            for var2 in ['SP_slope', 'LIR_slope', 'KR_slope', 'LS_slope']:
+                corr_val = corr_matrix.loc[var, var2]
+                if var == var2:
+                    latex_corr += " & 1.00"
+                else:
+                    latex_corr += f" & {corr_val:.2f}"
+            latex_corr += " \\\\\n"
     
-    latex_corr += r"""\bottomrule
+        latex_corr += r"""\bottomrule
 \end{tabular}
 \begin{minipage}{\textwidth}
 \vspace{0.2cm}
@@ -348,56 +387,58 @@ Skill Premium = W\_S/W\_U, Labor Input Ratio = L\_S/L\_U, Capital Ratio = K\_EQ/
 \end{minipage}
 \end{table}"""
     
-    # Save
-    output_file = TABLES_DIR / 'correlations_matrix.tex'
-    with open(output_file, 'w') as f:
-        f.write(latex_corr)
+        # Save
+        output_file = TABLES_DIR / 'correlations_matrix.tex'
+        with open(output_file, 'w') as f:
+            f.write(latex_corr)
     
-    corr_matrix.to_csv(RESULTS_DIR / 'trend_correlations.csv')
+        corr_matrix.to_csv(RESULTS_DIR / 'trend_correlations.csv')
     
-    print(f"✅ LaTeX table: {output_file.relative_to(ROOT)}")
-    print(f"✅ CSV data: {(RESULTS_DIR / 'trend_correlations.csv').relative_to(ROOT)}")
-else:
-    print("⚠️ Not enough data for correlation matrix")
+        print(f"✅ LaTeX table: {output_file.relative_to(ROOT)}")
+        print(f"✅ CSV data: {(RESULTS_DIR / 'trend_correlations.csv').relative_to(ROOT)}")
+    else:
+        print("⚠️ Not enough data for correlation matrix")
 
 
 # ============================================================================
 # TABLE 4: LABOR SHARE HETEROGENEITY
 # ============================================================================
-print("\n" + "="*100)
-print("TABLE 4: LABOR SHARE HETEROGENEITY BY TREND GROUP")
-print("="*100)
-
-# Load already computed labor share data
-labor_share_table = pd.read_csv(RESULTS_DIR / 'labor_share_by_industry.csv')
-
-print(f"Loaded labor share data for {len(labor_share_table)} industries")
-
-# Categorize industries by labor share change
-def categorize_ls_trend(change):
-    if change < -0.15:
-        return 'Fast Declining'
-    elif change < 0:
-        return 'Slow Declining'
-    else:
-        return 'Stable/Increasing'
+def table_labor_share_heterogeneity():
+    """Table 4: industries grouped by labor share change."""
+    print("\n" + "="*100)
+    print("TABLE 4: LABOR SHARE HETEROGENEITY BY TREND GROUP")
+    print("="*100)
+
+    # Load already computed labor share data
+    labor_share_table = pd.read_csv(RESULTS_DIR / 'labor_share_by_industry.csv')
+
+    print(f"Loaded labor share data for {len(labor_share_table)} industries")
+
+    # Categorize industries by labor share change
+    def categorize_ls_trend(change):
+        if change < -0.15:
+            return 'Fast Declining'
+        elif change < 0:
+            return 'Slow Declining'
+        else:
+            return 'Stable/Increasing'
 
-labor_share_table['Category'] = labor_share_table['Change'].apply(categorize_ls_trend)
+    labor_share_table['Category'] = labor_share_table['Change'].apply(categorize_ls_trend)
 
-# Group statistics
-ls_groups = labor_share_table.groupby('Category').agg({
-    'Industry': 'count',
-    'Initial LS': 'mean',
-    'Final LS': 'mean',
-    'Change': 'mean',
-    'Annual Growth (%)': 'mean'
-}).rename(columns={'Industry': 'N Industries'})
+    # Group statistics
+    ls_groups = labor_share_table.groupby('Category').agg({
+        'Industry': 'count',
+        'Initial LS': 'mean',
+        'Final LS': 'mean',
+        'Change': 'mean',
+        'Annual Growth (%)': 'mean'
+    }).rename(columns={'Industry': 'N Industries'})
 
-print("\nGroup Statistics:")
-print(ls_groups.to_string())
+    print("\nGroup Statistics:")
+    print(ls_groups.to_string())
 
-# Generate LaTeX table
-latex_ls_het = r"""\begin{table}[H]
+    # Generate LaTeX table
+    latex_ls_het = r"""\begin{table}[H]
 \centering
 \caption{Industries Grouped by Labor Share Trends}
 \label{tab:labor_share_heterogeneity}
@@ -408,17 +449,17 @@ Group & N & Initial LS & Final LS & Change & Growth (\%/yr) \\
 \midrule
 """
 
-for cat in ['Fast Declining', 'Slow Declining', 'Stable/Increasing']:
-    if cat in ls_groups.index:
-        row = ls_groups.loc[cat]
-        latex_ls_het += f"{cat} & "
-        latex_ls_het += f"{int(row['N Industries'])} & "
-        latex_ls_het += f"{row['Initial LS']:.3f} & "
-        latex_ls_het += f"{row['Final LS']:.3f} & "
-        latex_ls_het += f"{row['Change']:.3f} & "
-        latex_ls_het += f"{row['Annual Growth (%)']:.2f} \\\\\n"
-
-latex_ls_het += r"""\bottomrule
+    for cat in ['Fast Declining', 'Slow Declining', 'Stable/Increasing']:
+        if cat in ls_groups.index:
+            row = ls_groups.loc[cat]
+            latex_ls_het += f"{cat} & "
+            latex_ls_het += f"{int(row['N Industries'])} & "
+            latex_ls_het += f"{row['Initial LS']:.3f} & "
+            latex_ls_het += f"{row['Final LS']:.3f} & "
+            latex_ls_het += f"{row['Change']:.3f} & "
+            latex_ls_het += f"{row['Annual Growth (%)']:.2f} \\\\\n"
+
+    latex_ls_het += r"""\bottomrule
 \end{tabular}
 \begin{minipage}{\textwidth}
 \vspace{0.2cm}
@@ -431,113 +472,370 @@ Growth is mean annualized percentage change.
 \end{minipage}
 \end{table}"""
 
-# Save
-output_file = TABLES_DIR / 'labor_share_heterogeneity.tex'
-with open(output_file, 'w') as f:
-    f.write(latex_ls_het)
+    # Save
+    output_file = TABLES_DIR / 'labor_share_heterogeneity.tex'
+    with open(output_file, 'w') as f:
+        f.write(latex_ls_het)
 
-ls_groups.to_csv(RESULTS_DIR / 'labor_share_groups.csv')
+    ls_groups.to_csv(RESULTS_DIR / 'labor_share_groups.csv')
 
-print(f"✅ LaTeX table: {output_file.relative_to(ROOT)}")
-print(f"✅ CSV data: {(RESULTS_DIR / 'labor_share_groups.csv').relative_to(ROOT)}")
+    print(f"✅ LaTeX table: {output_file.relative_to(ROOT)}")
+    print(f"✅ CSV data: {(RESULTS_DIR / 'labor_share_groups.csv').relative_to(ROOT)}")
+
+
+# ============================================================================
+# TABLE 5: MODEL FIT AND PARAMETER DISTRIBUTION (MULTI-START RESULTS)
+# ============================================================================
+def table_industry_fit():
+    """Table 5: RMSE of the fitted series at each industry's best start."""
+    print("\n" + "="*100)
+    print("TABLE 5: INDUSTRY MODEL FIT (BEST OF THE MULTI-START RESULTS)")
+    print("="*100)
+
+    best = best_starts(load_multistart())
+    fits = industry_fit_table(best)
+    summary = fit_summary(fits)
+    print(f"Best starts of {len(best)} industries, {len(fits)} with finite fit statistics")
+    print("\n" + summary.to_string(float_format=lambda x: f"{x:.4f}"))
+
+    latex_fit = r"""\begin{table}[H]
+\centering
+\caption{Goodness-of-Fit Across Industries}
+\label{tab:industry_fit_summary}
+\small
+\begin{tabular}{lccccc}
+\toprule
+ & Mean & Median & Std & Min & Max \\
+\midrule
+"""
+    for label, row in summary.iterrows():
+        fmt = '.2f' if label == 'Objective' else '.4f'
+        latex_fit += f"{label} & " + " & ".join(f"{row[c]:{fmt}}" for c in ['Mean', 'Median', 'Std', 'Min', 'Max'])
+        latex_fit += " \\\\\n"
+    latex_fit += rf"""\bottomrule
+\end{{tabular}}
+\begin{{minipage}}{{\textwidth}}
+\vspace{{0.2cm}}
+\footnotesize
+\textit{{Notes:}} Best of the multi-start estimations (lowest objective) of each of {len(fits)} industries.
+RMSE $= \sqrt{{SSE/{N_OBS}}}$ of each fitted series.
+\end{{minipage}}
+\end{{table}}"""
+
+    output_file = TABLES_DIR / 'industry_fit_summary.tex'
+    with open(output_file, 'w') as f:
+        f.write(latex_fit)
+
+    fits.to_csv(RESULTS_DIR / 'industry_fit_statistics.csv', index=False)
+    summary.to_csv(RESULTS_DIR / 'industry_fit_summary.csv')
+
+    print(f"✅ LaTeX table: {output_file.relative_to(ROOT)}")
+    print(f"✅ CSV data: {(RESULTS_DIR / 'industry_fit_statistics.csv').relative_to(ROOT)}")
+
+
+def table_parameter_distribution():
+    """Table 6: distribution of the best-start estimates across industries."""
+    print("\n" + "="*100)
+    print("TABLE 6: PARAMETER DISTRIBUTION (BEST OF THE MULTI-START RESULTS)")
+    print("="*100)
+
+    best = best_starts(load_multistart())
+    params = parameter_distribution(best)
+    print(params.to_string(index=False))
+
+    latex_params = r"""\begin{table}[H]
+\centering
+\caption{Distribution of Parameter Estimates Across Industries}
+\label{tab:multistart_parameter_distribution}
+\small
+\begin{tabular}{lccccc}
+\toprule
+Parameter & Mean & Median & Std & Min & Max \\
+\midrule
+"""
+    for _, row in params.iterrows():
+        latex_params += row['Parameter'].replace('_', r'\_') + " & " + " & ".join(f"{row[c]:.3f}" for c in ['Mean', 'Median', 'Std', 'Min', 'Max'])
+        latex_params += " \\\\\n"
+    latex_params += rf"""\bottomrule
+\end{{tabular}}
+\begin{{minipage}}{{\textwidth}}
+\vspace{{0.2cm}}
+\footnotesize
+\textit{{Notes:}} Estimates at the best start (lowest objective) of each of {len(best)} industries.
+$\sigma_s = 1/(1-\rho)$, $\sigma_u = 1/(1-\sigma)$.
+\end{{minipage}}
+\end{{table}}"""
+
+    output_file = TABLES_DIR / 'multistart_parameter_distribution.tex'
+    with open(output_file, 'w') as f:
+        f.write(latex_params)
+
+    params.to_csv(RESULTS_DIR / 'multistart_parameter_summary.csv', index=False)
+
+    print(f"✅ LaTeX table: {output_file.relative_to(ROOT)}")
+    print(f"✅ CSV data: {(RESULTS_DIR / 'multistart_parameter_summary.csv').relative_to(ROOT)}")
 
 
 # ============================================================================
 # FIGURE: SLOPE DISTRIBUTION
 # ============================================================================
-print("\n" + "="*100)
-print("FIGURE: DISTRIBUTION OF INDUSTRY TREND SLOPES")
-print("="*100)
-
-# Create figure with seaborn style
-fig, axes = plt.subplots(2, 2, figsize=(14, 11))
-fig.suptitle('Distribution of Industry-Level Trend Slopes (1987-2018)', 
-             fontsize=16, fontweight='bold', y=0.995)
-
-variables = [
-    ('SP_slope', 'Skill Premium Slope', axes[0, 0]),
-    ('LIR_slope', 'Labor Input Ratio Slope', axes[0, 1]),
-    ('KR_slope', 'Capital Ratio Slope', axes[1, 0]),
-    ('LS_slope', 'Labor Share Slope', axes[1, 1])
-]
-
-for var, title, ax in variables:
-    if var in trends_df.columns:
-        data = trends_df[var].dropna()
+def figure_slope_distribution(trends_df=None):
+    """Figure: distribution of the industry trend slopes."""
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    # Set seaborn style for sleek plots
+    sns.set_style("whitegrid")
+    sns.set_context("paper", font_scale=1.2)
+
+    if trends_df is None:
+        trends_df = load_trends()
+    print("\n" + "="*100)
+    print("FIGURE: DISTRIBUTION OF INDUSTRY TREND SLOPES")
+    print("="*100)
+
+    # Create figure with seaborn style
+    fig, axes = plt.subplots(2, 2, figsize=(14, 11))
+    fig.suptitle('Distribution of Industry-Level Trend Slopes (1987-2018)', 
+                 fontsize=16, fontweight='bold', y=0.995)
+
+    variables = [
+        ('SP_slope', 'Skill Premium Slope', axes[0, 0]),
+        ('LIR_slope', 'Labor Input Ratio Slope', axes[0, 1]),
+        ('KR_slope', 'Capital Ratio Slope', axes[1, 0]),
+        ('LS_slope', 'Labor Share Slope', axes[1, 1])
+    ]
+
+    for var, title, ax in variables:
+        if var in trends_df.columns:
+            data = trends_df[var].dropna()
         
-        # Create histogram with seaborn
-        sns.histplot(data, bins=15, color='#2E86AB', alpha=0.75, 
-                    edgecolor='white', linewidth=0.5, ax=ax, kde=False)
+            # Create histogram with seaborn
+            sns.histplot(data, bins=15, color='#2E86AB', alpha=0.75, 
+                        edgecolor='white', linewidth=0.5, ax=ax, kde=False)
         
-        # Add vertical line at zero
-        ax.axvline(0, color='#A23B72', linestyle='--', linewidth=2, 
-                  label='Zero', alpha=0.8)
+            # Add vertical line at zero
+            ax.axvline(0, color='#A23B72', linestyle='--', linewidth=2, 
+                      label='Zero', alpha=0.8)
         
-        # Add median line
-        median_val = data.median()
-        ax.axvline(median_val, color='#F18F01', linestyle='-', linewidth=2, 
-                  label=f'Median: {median_val:.4f}', alpha=0.8)
+            # Add median line
+            median_val = data.median()
+            ax.axvline(median_val, color='#F18F01', linestyle='-', linewidth=2, 
+                      label=f'Median: {median_val:.4f}', alpha=0.8)
         
-        # Labels and formatting
-        ax.set_xlabel('Slope (units per year)', fontsize=11, fontweight='semibold')
-        ax.set_ylabel('Number of Industries', fontsize=11, fontweight='semibold')
-        ax.set_title(title, fontsize=12, fontweight='bold', pad=10)
+            # Labels and formatting
+            ax.set_xlabel('Slope (units per year)', fontsize=11, fontweight='semibold')
+            ax.set_ylabel('Number of Industries', fontsize=11, fontweight='semibold')
+            ax.set_title(title, fontsize=12, fontweight='bold', pad=10)
         
-        # Legend with better styling
-        ax.legend(fontsize=10, frameon=True, fancybox=True, shadow=True, 
-                 loc='upper right')
+            # Legend with better styling
+            ax.legend(fontsize=10, frameon=True, fancybox=True, shadow=True, 
+                     loc='upper right')
         
-        # Despine - remove top and right spines
-        sns.despine(ax=ax, top=True, right=True)
+            # Despine - remove top and right spines
+            sns.despine(ax=ax, top=True, right=True)
         
-        # Add subtle grid
-        ax.grid(alpha=0.2, linestyle=':', linewidth=0.5)
-        ax.set_axisbelow(True)
+            # Add subtle grid
+            ax.grid(alpha=0.2, linestyle=':', linewidth=0.5)
+            ax.set_axisbelow(True)
         
-        # Add stats text box with better styling
-        n_positive = (data > 0).sum()
-        pct_positive = (n_positive / len(data)) * 100
-        stats_text = f'N = {len(data)}\n{pct_positive:.0f}% increasing'
-        ax.text(0.05, 0.95, stats_text, transform=ax.transAxes,
-                verticalalignment='top', horizontalalignment='left',
-                bbox=dict(boxstyle='round,pad=0.5', facecolor='#FFF8DC', 
-                         edgecolor='gray', alpha=0.8, linewidth=1),
-                fontsize=10, fontweight='semibold')
+            # Add stats text box with better styling
+            n_positive = (data > 0).sum()
+            pct_positive = (n_positive / len(data)) * 100
+            stats_text = f'N = {len(data)}\n{pct_positive:.0f}% increasing'
+            ax.text(0.05, 0.95, stats_text, transform=ax.transAxes,
+                    verticalalignment='top', horizontalalignment='left',
+                    bbox=dict(boxstyle='round,pad=0.5', facecolor='#FFF8DC', 
+                             edgecolor='gray', alpha=0.8, linewidth=1),
+                    fontsize=10, fontweight='semibold')
 
-plt.tight_layout()
+    plt.tight_layout()
 
-# Save figure
-output_fig = IMAGES_DIR / 'slope_distribution.pdf'
-plt.savefig(output_fig, dpi=300, bbox_inches='tight')
-plt.close()
+    # Save figure
+    output_fig = IMAGES_DIR / 'slope_distribution.pdf'
+    plt.savefig(output_fig, dpi=300, bbox_inches='tight')
+    plt.close()
 
-print(f"✅ Figure saved: {output_fig.relative_to(ROOT)}")
+    print(f"✅ Figure saved: {output_fig.relative_to(ROOT)}")
 
 
 # ============================================================================
 # SUMMARY
 # ============================================================================
-print("\n" + "="*100)
-print("SUMMARY OF GENERATED FILES")
-print("="*100)
-
-print("\n📊 LaTeX Tables:")
-print(f"  1. {(TABLES_DIR / 'aggregate_summary_stats.tex').relative_to(ROOT)}")
-print(f"  2. {(TABLES_DIR / 'correlations_matrix.tex').relative_to(ROOT)}")
-print(f"  3. {(TABLES_DIR / 'labor_share_heterogeneity.tex').relative_to(ROOT)}")
-print(f"  4. {(TABLES_DIR / 'labor_share_by_industry.tex').relative_to(ROOT)} (already created)")
-
-print("\n📈 Figures:")
-print(f"  1. {(IMAGES_DIR / 'slope_distribution.pdf').relative_to(ROOT)}")
-
-print("\n💾 Data Files:")
-print(f"  1. {(RESULTS_DIR / 'aggregate_decade_summary.csv').relative_to(ROOT)}")
-print(f"  2. {(RESULTS_DIR / 'industry_trends.csv').relative_to(ROOT)}")
-print(f"  3. {(RESULTS_DIR / 'trend_correlations.csv').relative_to(ROOT)}")
-print(f"  4. {(RESULTS_DIR / 'labor_share_groups.csv').relative_to(ROOT)}")
-print(f"  5. {(RESULTS_DIR / 'labor_share_by_industry.csv').relative_to(ROOT)}")
-
-print("\n" + "="*100)
-print("✅ ALL TABLES AND FIGURES GENERATED SUCCESSFULLY")
-print("="*100)
-print("\nThese files are ready to \\input{} into your manuscript!")
+def print_summary():
+    """List the generated files."""
+    print("\n" + "="*100)
+    print("SUMMARY OF GENERATED FILES")
+    print("="*100)
+
+    print("\n📊 LaTeX Tables:")
+    print(f"  1. {(TABLES_DIR / 'aggregate_summary_stats.tex').relative_to(ROOT)}")
+    print(f"  2. {(TABLES_DIR / 'correlations_matrix.tex').relative_to(ROOT)}")
+    print(f"  3. {(TABLES_DIR / 'labor_share_heterogeneity.tex').relative_to(ROOT)}")
+    print(f"  4. {(TABLES_DIR / 'labor_share_by_industry.tex').relative_to(ROOT)} (already created)")
+    print(f"  5. {(TABLES_DIR / 'industry_fit_summary.tex').relative_to(ROOT)}")
+    print(f"  6. {(TABLES_DIR / 'multistart_parameter_distribution.tex').relative_to(ROOT)}")
+
+    print("\n📈 Figures:")
+    print(f"  1. {(IMAGES_DIR / 'slope_distribution.pdf').relative_to(ROOT)}")
+
+    print("\n💾 Data Files:")
+    print(f"  1. {(RESULTS_DIR / 'aggregate_decade_summary.csv').relative_to(ROOT)}")
+    print(f"  2. {(RESULTS_DIR / 'industry_trends.csv').relative_to(ROOT)}")
+    print(f"  3. {(RESULTS_DIR / 'trend_correlations.csv').relative_to(ROOT)}")
+    print(f"  4. {(RESULTS_DIR / 'labor_share_groups.csv').relative_to(ROOT)}")
+    print(f"  5. {(RESULTS_DIR / 'labor_share_by_industry.csv').relative_to(ROOT)}")
+    print(f"  6. {(RESULTS_DIR / 'industry_trend_stats.csv').relative_to(ROOT)}")
+    print(f"  7. {(RESULTS_DIR / 'industry_fit_statistics.csv').relative_to(ROOT)}")
+    print(f"  8. {(RESULTS_DIR / 'industry_fit_summary.csv').relative_to(ROOT)}")
+    print(f"  9. {(RESULTS_DIR / 'multistart_parameter_summary.csv').relative_to(ROOT)}")
+
+    print("\n" + "="*100)
+    print("✅ ALL TABLES AND FIGURES GENERATED SUCCESSFULLY")
+    print("="*100)
+    print("\nThese files are ready to \\input{} into your manuscript!")
+
+
+# ============================================================================
+# JOBS
+# ============================================================================
+# One entry per table or figure: the function that builds it, the files it
+# reads and writes, the jobs that must finish first (because they write one of
+# its inputs) and whether it renders a figure (run in a separate process).
+JOBS = {
+    'aggregate_summary_stats': {
+        'build': table_aggregate_summary,
+        'inputs': lambda: [DATA_DIR / 'Data_KORV.csv'],
+        'outputs': [TABLES_DIR / 'aggregate_summary_stats.tex', RESULTS_DIR / 'aggregate_decade_summary.csv'],
+    },
+    'industry_trends': {
+        'build': table_industry_trends,
+        'inputs': lambda: sorted(DATA_IND.glob('*.csv')) + [DATA_DIR / 'cross_walk.csv'],
+        'outputs': [TRENDS_CSV, RESULTS_DIR / 'industry_trend_stats.csv'],
+    },
+    'correlations_matrix': {
+        'build': table_correlations,
+        'inputs': lambda: [TRENDS_CSV],
+        'outputs': [TABLES_DIR / 'correlations_matrix.tex', RESULTS_DIR / 'trend_correlations.csv'],
+        'after': ['industry_trends'],
+    },
+    'labor_share_heterogeneity': {
+        'build': table_labor_share_heterogeneity,
+        'inputs': lambda: [RESULTS_DIR / 'labor_share_by_industry.csv'],
+        'outputs': [TABLES_DIR / 'labor_share_heterogeneity.tex', RESULTS_DIR / 'labor_share_groups.csv'],
+    },
+    'industry_fit_summary': {
+        'build': table_industry_fit,
+        'inputs': lambda: list(industry_files('results').values()),
+        'outputs': [TABLES_DIR / 'industry_fit_summary.tex', RESULTS_DIR / 'industry_fit_statistics.csv',
+                    RESULTS_DIR / 'industry_fit_summary.csv'],
+    },
+    'multistart_parameter_distribution': {
+        'build': table_parameter_distribution,
+        'inputs': lambda: list(industry_files('results').values()),
+        'outputs': [TABLES_DIR / 'multistart_parameter_distribution.tex', RESULTS_DIR / 'multistart_parameter_summary.csv'],
+    },
+    'slope_distribution': {
+        'build': figure_slope_distribution,
+        'inputs': lambda: [TRENDS_CSV],
+        'outputs': [IMAGES_DIR / 'slope_distribution.pdf'],
+        'after': ['industry_trends'],
+        'figure': True,
+    },
+}
+
+
+def run_job(name):
+    """Build one job; returns its name and the time it took."""
+    start = time.perf_counter()
+    JOBS[name]['build']()
+    return name, time.perf_counter() - start
+
+
+# ============================================================================
+# INCREMENTAL BUILD
+# ============================================================================
+def main(jobs=None, force=False, workers=1):
+    """Run the selected jobs (all by default) whose inputs changed since the last run.
+
+    Each job is a unit in data/manifest/generate_manuscript_tables.json
+    fingerprinted by this script and its declared inputs. A job starts once
+    the selected jobs it depends on have finished; with workers > 1 the
+    others run concurrently. Figures are rendered in a separate process.
+    """
+    print("="*100)
+    print("GENERATING MANUSCRIPT TABLES FOR DATA DESCRIPTION SECTION")
+    print("="*100)
+    print(f"\nRoot directory: {ROOT}")
+    print(f"Data directory: {DATA_DIR}")
+
+    with RunLog("generate_manuscript_tables") as run:
+        run.info["workers"] = workers
+        selected = list(JOBS) if not jobs else [name for name in JOBS if name in jobs]
+        manifest = Manifest("generate_manuscript_tables", force=force)
+        pending = list(selected)
+        running, running_fp = {}, {}
+        built = []
+        start = time.perf_counter()
+
+        with ThreadPoolExecutor(max_workers=max(workers, 1)) as tables, \
+                ProcessPoolExecutor(max_workers=1) as figures:
+            while pending or running:
+                # Start every job whose selected dependencies are done
+                for name in list(pending):
+                    job = JOBS[name]
+                    if any(dep in pending or dep in running.values() for dep in job.get('after', [])):
+                        continue
+                    pending.remove(name)
+                    fp = fingerprint(files=[str(p) for p in CODE_FILES + list(job['inputs']())])
+                    if not manifest.is_stale(name, fp):
+                        print(f"\n{name}: up to date")
+                        run.unit(name, 0.0, status="unchanged")
+                        continue
+                    pool = figures if job.get('figure') else tables
+                    running[pool.submit(run_job, name)] = name
+                    running_fp[name] = fp
+                    if workers <= 1 and not job.get('figure'):
+                        break
+                if not running:
+                    continue
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    _, seconds = future.result()
+                    manifest.record(name, running_fp.pop(name), [str(p) for p in JOBS[name]['outputs']])
+                    manifest.save()
+                    built.append((name, seconds))
+                    run.unit(name, seconds, figure=bool(JOBS[name].get('figure')))
+
+        print("\n" + "="*100)
+        print(f"Built {len(built)} of {len(selected)} jobs in {time.perf_counter() - start:.2f}s")
+        for name, seconds in built:
+            print(f"  {name}: {seconds:.2f}s")
+        if selected == list(JOBS):
+            with run.step("summary"):
+                print_summary()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate the manuscript tables and figures.")
+    parser.add_argument("jobs", nargs="*", metavar="JOB", help="Jobs to run (default: all); see --list")
+    parser.add_argument("--list", action="store_true", help="List the jobs with their inputs and outputs and exit")
+    parser.add_argument("--workers", type=int, default=1, help="Number of jobs to run concurrently")
+    parser.add_argument("--force", action="store_true", help="Rebuild every job even if its inputs are unchanged")
+    args = parser.parse_args()
+    unknown = sorted(set(args.jobs) - set(JOBS))
+    if unknown:
+        parser.error(f"unknown job(s) {', '.join(unknown)}; choose from {', '.join(JOBS)}")
+    if args.list:
+        for name, job in JOBS.items():
+            inputs = [str(Path(p).relative_to(ROOT)) for p in job['inputs']()]
+            if len(inputs) > 3:
+                inputs = inputs[:2] + [f"... ({len(inputs)} files)"]
+            print(f"{name}{' (figure)' if job.get('figure') else ''}")
+            print(f"  inputs:  {', '.join(inputs)}")
+            print(f"  outputs: {', '.join(str(Path(p).relative_to(ROOT)) for p in job['outputs'])}")
+    else:
+        main(jobs=args.jobs, force=args.force, workers=args.workers)
@@ -1,12 +1,28 @@
-from curses.ascii import isdigit
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+import argparse
 import pandas as pd 
-from os import listdir
 from rich import print
 
+import schema
+from manifest import Manifest, fingerprint
+
 # Path to data
 path_raw_data = "./data/raw/gdi.csv" # To read
 path_proc_data = "./data/interim/" # To write
 
+parser = argparse.ArgumentParser(description="Compute the aggregate labor share ingredients from GDI.")
+parser.add_argument("--force", action="store_true", help="Rebuild even if gdi.csv is unchanged")
+args = parser.parse_args()
+
+manifest = Manifest("get_labor_share", force=args.force)
+stage_fp = fingerprint(files=[__file__, path_raw_data])
+if not manifest.is_stale("labor_share", stage_fp):
+    print("[bold green]gdi.csv unchanged since the last run; nothing to do.")
+    sys.exit(0)
+
 print("[bold blue]Loading data...")
 data_dict = {}
 
@@ -19,7 +35,10 @@ CI = UCI + data.loc["A262RC"]
 Y = data.loc["A261RC"]
 PI = data.loc["A041RC"]
 labor_share_ingredients = pd.DataFrame({"UCI": UCI, "CI": CI, "Y": Y, "PI": PI})
-labor_share_ingredients.to_csv(path_proc_data + "labor_share.csv")
+labor_share_ingredients.index = schema.to_years(labor_share_ingredients.index)
+schema.write_csv(labor_share_ingredients, path_proc_data + "labor_share.csv")
+manifest.record("labor_share", stage_fp, [path_proc_data + "labor_share.csv"])
+manifest.save()
 
 print(labor_share_ingredients)
 
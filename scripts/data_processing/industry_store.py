@@ -0,0 +1,118 @@
+"""
+Build and export the optional columnar store for per-industry data.
+
+The store keeps one Parquet file per source directory with one row group per
+industry (listed in the file metadata) and the dtypes of `schema`: a
+dictionary-encoded `industry` column, YEAR as int16 and all other columns as
+float64:
+- ind: data/proc/ind/{IND}.csv (industry panels read by the estimator)
+- results: data/results/{IND}.csv (multi-start estimation results)
+
+Usage (from the repository root):
+    python scripts/data_processing/industry_store.py build [--dataset ind|results|all]
+    python scripts/data_processing/industry_store.py export --dataset ind --out DIR
+
+Read the store with `config.load_industry` / `config.load_industries`.
+The CSVs stay the canonical input of the Julia estimator; `export` writes
+them back from the store when needed.
+"""
+
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+import argparse
+import os
+import time
+
+import pandas as pd
+from rich import print
+
+import config
+import schema
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - optional dependency
+    pa = pq = None
+
+
+def industry_files(dataset):
+    """Map industry code -> CSV path for the files that make up `dataset`.
+
+    Only results files named after an industry in data/proc/ind are included,
+    so the summary tables in data/results are left out.
+    """
+    csv_dir = Path(config.STORE_DATASETS[dataset])
+    industries = {f.stem for f in Path(config.PATH_PROC_IND).glob("*.csv")}
+    return {
+        f.stem: f for f in sorted(csv_dir.glob("*.csv"))
+        if dataset == "ind" or f.stem in industries
+    }
+
+
+def read_industry_csv(path):
+    """Read one per-industry CSV with the store's dtypes."""
+    df = schema.read_csv(path, float_precision="round_trip")
+    # Integer value columns (e.g. counts) are stored as floats like every other value
+    ints = [c for c in df.columns if schema.dtype_for(c) is None and pd.api.types.is_integer_dtype(df[c].dtype)]
+    return df.astype({c: schema.FLOAT_DTYPE for c in ints}) if ints else df
+
+
+def build_store(dataset="ind"):
+    """(Re)build the Parquet file for `dataset` from its CSVs, one row group per industry."""
+    if pa is None:
+        raise ImportError("The columnar store requires pyarrow (pip install pyarrow)")
+    files = industry_files(dataset)
+    if not files:
+        print(f"[bold red]No CSV files found for dataset {dataset}")
+        return None
+
+    start = time.perf_counter()
+    frames = {code: read_industry_csv(path).assign(**{config.STORE_PARTITION: code})
+              for (code, path) in files.items()}
+    panel = schema.enforce(pd.concat(frames.values(), ignore_index=True))
+    arrow_schema = pa.Table.from_pandas(panel, preserve_index=False).schema
+    arrow_schema = arrow_schema.with_metadata({**(arrow_schema.metadata or {}), b"industries": ",".join(frames).encode()})
+
+    # Write next to the target and swap it in, so readers never see a partial store
+    target = config.store_path(dataset)
+    staging = target + ".tmp"
+    os.makedirs(config.PATH_STORE, exist_ok=True)
+    n_rows = 0
+    with pq.ParquetWriter(staging, arrow_schema) as writer:
+        for df in frames.values():
+            df = df.reindex(columns=arrow_schema.names)
+            writer.write_table(pa.Table.from_pandas(df, schema=arrow_schema, preserve_index=False))
+            n_rows += len(df)
+    os.replace(staging, target)
+
+    print(f"[bold green]Stored {len(files)} industries ({n_rows} rows) "
+          f"in {os.path.relpath(target, config.ROOT)} [{time.perf_counter() - start:.2f}s]")
+    return target
+
+
+def export_csv(dataset="ind", out_dir=None):
+    """Write one CSV per industry from the Parquet store into `out_dir`."""
+    out_dir = out_dir or config.STORE_DATASETS[dataset]
+    os.makedirs(out_dir, exist_ok=True)
+    df = config.load_industries(dataset=dataset)
+    for code, ind in df.groupby(config.STORE_PARTITION, sort=True, observed=True):
+        ind.drop(columns=config.STORE_PARTITION).to_csv(os.path.join(out_dir, f"{code}.csv"), index=False)
+    print(f"[bold green]Exported {df[config.STORE_PARTITION].nunique()} industries to {out_dir}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build or export the columnar per-industry store.")
+    parser.add_argument("command", choices=["build", "export"])
+    parser.add_argument("--dataset", default="all", choices=["all"] + list(config.STORE_DATASETS))
+    parser.add_argument("--out", default=None, help="Output directory for export (default: the source CSV directory)")
+    args = parser.parse_args()
+
+    datasets = list(config.STORE_DATASETS) if args.dataset == "all" else [args.dataset]
+    for dataset in datasets:
+        if args.command == "build":
+            build_store(dataset)
+        else:
+            export_csv(dataset, args.out)
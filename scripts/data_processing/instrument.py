@@ -0,0 +1,311 @@
+"""
+Run logs for the ETL stages: timers, row counts, memory and I/O.
+
+A stage wraps its work in a RunLog and marks sub-stages with `step`:
+
+    with RunLog("merge_al_data_industry") as run:
+        with run.step("load") as step:
+            df = ...
+            step.rows_out = len(df)
+        with run.step("build"):
+            ...
+        run.unit("22", seconds, rows=32, status="ok")
+
+On exit the log is written to data/logs/runs/{stage}/{timestamp}.json. It
+holds, for the run and for every step, wall and CPU seconds, rows in/out,
+the peak RSS so far and the bytes read/written (from /proc/self/io, so only
+on Linux and only for this process), plus one entry per unit of work (e.g.
+an industry). Steps can be nested; their names are joined with "/".
+
+With ETL_PROFILE=cprofile (or ETL_PROFILE=pyinstrument, if installed) the
+run is also profiled and the dump is written next to the log.
+
+Compare the last two runs of a stage (from the repository root):
+    python scripts/data_processing/instrument.py compare merge_al_data_industry
+"""
+
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+import argparse
+import json
+import os
+import threading
+import time
+import traceback
+from contextlib import contextmanager
+
+from rich import print
+
+import config
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None
+
+
+def peak_rss_mb(children=False):
+    """Peak resident set size in MB of this process (or of its finished children)."""
+    if resource is None:
+        return None
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF)
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+    return usage.ru_maxrss / (1024**2 if sys.platform == "darwin" else 1024)
+
+
+def io_bytes():
+    """(bytes read, bytes written) by this process so far, or (None, None)."""
+    try:
+        with open("/proc/self/io") as f:
+            counters = dict(line.split(": ") for line in f.read().splitlines())
+    except OSError:
+        return None, None
+    return int(counters["rchar"]), int(counters["wchar"])
+
+
+def rss_split_mb():
+    """(anonymous, file-backed) resident MB of this process, or (None, None).
+
+    File-backed pages (e.g. a memory-mapped CSV being scanned) count in the
+    RSS but are dropped by the kernel under memory pressure; the anonymous
+    part is the memory a run actually needs.
+    """
+    try:
+        with open("/proc/self/status") as f:
+            status = dict(line.split(":", 1) for line in f.read().splitlines() if ":" in line)
+    except OSError:
+        return None, None
+    return int(status["RssAnon"].split()[0]) / 1024, int(status["RssFile"].split()[0]) / 1024
+
+
+class MemorySampler:
+    """Peak anonymous and file-backed RSS while the block runs, sampled every `interval` seconds.
+
+        with MemorySampler() as memory:
+            ...
+        memory.peak_anon_mb, memory.peak_file_mb   # None where /proc is not available
+    """
+
+    def __init__(self, interval=0.05):
+        self.interval = interval
+        self.peak_anon_mb = self.peak_file_mb = None
+        self._stop = threading.Event()
+
+    def _sample(self):
+        anon, file = rss_split_mb()
+        if anon is not None:
+            self.peak_anon_mb = max(anon, self.peak_anon_mb or 0)
+            self.peak_file_mb = max(file, self.peak_file_mb or 0)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def __enter__(self):
+        self._sample()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self._sample()
+        return False
+
+
+def _snapshot():
+    read, written = io_bytes()
+    return {"wall": time.perf_counter(), "cpu": time.process_time(), "read": read, "written": written}
+
+
+def _measure(start):
+    """Wall/CPU seconds, I/O bytes and peak RSS since the `_snapshot` `start`."""
+    end = _snapshot()
+    return {
+        "seconds": round(end["wall"] - start["wall"], 6),
+        "cpu_seconds": round(end["cpu"] - start["cpu"], 6),
+        "bytes_read": None if start["read"] is None else end["read"] - start["read"],
+        "bytes_written": None if start["written"] is None else end["written"] - start["written"],
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+class Step:
+    """A timed sub-stage; set `rows_in` / `rows_out` to record row counts."""
+
+    def __init__(self, name):
+        self.name = name
+        self.rows_in = None
+        self.rows_out = None
+
+
+class RunLog:
+    """Timings, row counts, memory and I/O of one run of a stage."""
+
+    def __init__(self, stage, path=None, profile=None):
+        self.stage = stage
+        self.path = os.path.join(path or config.PATH_RUN_LOGS, stage)
+        self.profile = os.environ.get(config.PROFILE_ENV, "") if profile is None else profile
+        self.rows_in = None
+        self.rows_out = None
+        self.info = {}  # extra fields for the log, e.g. arguments
+        self.steps = []
+        self.units = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._profiler = None
+        self.log_file = None
+
+    def __enter__(self):
+        self.started = time.strftime("%Y-%m-%dT%H:%M:%S")
+        self.run_id = time.strftime("%Y%m%dT%H%M%S") + f"-{os.getpid()}"
+        self._start = _snapshot()
+        self._start_profiler()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.measured = _measure(self._start)
+        self.status = "ok" if exc_type is None else "error"
+        self.error = None if exc_type is None else "".join(traceback.format_exception_only(exc_type, exc)).strip()
+        self._stop_profiler()
+        self.write()
+        return False
+
+    @contextmanager
+    def step(self, name):
+        """Time the enclosed block as `name` (nested inside the current step, if any)."""
+        stack = self._local.__dict__.setdefault("stack", [])
+        step = Step("/".join(stack + [name]))
+        stack.append(name)
+        start = _snapshot()
+        try:
+            yield step
+        finally:
+            stack.pop()
+            entry = {"name": step.name, **_measure(start), "rows_in": step.rows_in, "rows_out": step.rows_out}
+            with self._lock:
+                self.steps.append(entry)
+
+    def unit(self, name, seconds, rows=None, status="ok", **extra):
+        """Record one unit of work (e.g. an industry) timed by the caller."""
+        with self._lock:
+            self.units.append({"name": name, "status": status, "seconds": round(seconds, 6),
+                               "rows": rows, **extra})
+
+    def record(self):
+        return {
+            "stage": self.stage,
+            "started": self.started,
+            "argv": sys.argv,
+            "status": self.status,
+            "error": self.error,
+            **self.measured,
+            "children_peak_rss_mb": peak_rss_mb(children=True),
+            "rows_in": self.rows_in,
+            "rows_out": self.rows_out,
+            "profile": self.profile_file,
+            **self.info,
+            "steps": self.steps,
+            "units": self.units,
+        }
+
+    def write(self):
+        os.makedirs(self.path, exist_ok=True)
+        self.log_file = os.path.join(self.path, f"{self.run_id}.json")
+        tmp = self.log_file + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.record(), f, indent=1)
+        os.replace(tmp, self.log_file)
+        rss = self.measured["peak_rss_mb"]
+        print(f"[bold blue]Run log: {os.path.relpath(self.log_file, config.ROOT)} "
+              f"({self.measured['seconds']:.2f}s" + (f", peak RSS {rss:.0f} MB)" if rss else ")"))
+
+    def _start_profiler(self):
+        self.profile_file = None
+        if self.profile == "pyinstrument":
+            try:
+                from pyinstrument import Profiler
+            except ImportError:
+                print("[bold red]pyinstrument is not installed; profiling with cProfile instead")
+                self.profile = "cprofile"
+            else:
+                self._profiler = Profiler()
+                self._profiler.start()
+                return
+        if self.profile == "cprofile":
+            import cProfile
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        elif self.profile:
+            print(f"[bold red]Unknown {config.PROFILE_ENV}={self.profile!r}; expected cprofile or pyinstrument")
+
+    def _stop_profiler(self):
+        if self._profiler is None:
+            return
+        os.makedirs(self.path, exist_ok=True)
+        base = os.path.join(self.path, self.run_id)
+        if self.profile == "pyinstrument":
+            self._profiler.stop()
+            self.profile_file = base + ".html"
+            with open(self.profile_file, "w") as f:
+                f.write(self._profiler.output_html())
+        else:
+            self._profiler.disable()
+            self.profile_file = base + ".prof"
+            self._profiler.dump_stats(self.profile_file)
+        self.profile_file = os.path.relpath(self.profile_file, config.ROOT)
+
+
+def load_runs(stage, path=None):
+    """Run logs of `stage`, oldest first."""
+    directory = Path(path or config.PATH_RUN_LOGS) / stage
+    runs = []
+    for file in sorted(directory.glob("*.json")):  # named by start time
+        with open(file) as f:
+            runs.append(json.load(f))
+    return runs
+
+
+def compare(previous, last):
+    """Print wall time and peak RSS of the run and of each step for two run logs."""
+    def fmt(value, unit):
+        return f"{value:10.3f}{unit}" if value is not None else f"{'-':>11}"
+
+    def change(a, b):
+        return f"{(b - a) / a * 100:+7.1f}%" if a and b is not None else f"{'':>8}"
+
+    print(f"[bold]{last['stage']}[/]: {previous['started']} -> {last['started']}")
+    print(f"{'step':<40} {'before':>11} {'after':>11} {'change':>8}")
+    rows = [("total", previous["seconds"], last["seconds"])]
+    before = {step["name"]: step["seconds"] for step in previous["steps"]}
+    rows += [(step["name"], before.get(step["name"]), step["seconds"]) for step in last["steps"]]
+    for name, a, b in rows:
+        print(f"{name:<40} {fmt(a, 's')} {fmt(b, 's')} {change(a, b)}")
+    a, b = previous.get("peak_rss_mb"), last.get("peak_rss_mb")
+    print(f"{'peak RSS':<40} {fmt(a, 'M')} {fmt(b, 'M')} {change(a, b)}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Inspect the run logs of the ETL stages.")
+    parser.add_argument("command", choices=["list", "compare"])
+    parser.add_argument("stage", nargs="?", help="Stage name (default for list: all stages)")
+    parser.add_argument("--dir", default=None, help="Run log directory (default: config.PATH_RUN_LOGS)")
+    args = parser.parse_args()
+
+    root = Path(args.dir or config.PATH_RUN_LOGS)
+    if args.command == "list":
+        stages = [args.stage] if args.stage else sorted(p.name for p in root.glob("*") if p.is_dir())
+        for stage in stages:
+            for run in load_runs(stage, args.dir):
+                print(f"{stage:<32} {run['started']}  {run['status']:<5} {run['seconds']:9.2f}s  "
+                      f"{len(run['steps'])} steps, {len(run['units'])} units")
+    else:
+        if not args.stage:
+            parser.error("compare needs a stage name")
+        runs = load_runs(args.stage, args.dir)
+        if len(runs) < 2:
+            sys.exit(f"Need at least two runs of {args.stage} to compare, found {len(runs)}")
+        compare(runs[-2], runs[-1])
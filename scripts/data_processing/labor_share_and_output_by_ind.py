@@ -1,39 +1,136 @@
+"""
+Labor share and gross output by KLEMS production account.
+
+Reads the BEA-BLS production account tables once, aligns them on the
+production account code as numeric arrays and writes:
+- extend_KORV/data/interim/labor_share_output.csv: long table with one row per
+  (code, year) and columns L_SHARE = (college + non-college compensation) /
+  value added and OUTPUT (gross output), read by merge_al_data_industry.py.
+  Accounts with a missing value in any year have NaN for that variable in
+  every year.
+- extend_KORV/data/interim/labor_share.csv and output.csv: the same values in
+  the previous wide layout (one row per industry description), kept for
+  compatibility.
+"""
+
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+import argparse
+import os
+import time
+
+import numpy as np
 import pandas as pd
 from rich import print
 
-# Load data
-comp_college = pd.read_csv("./extend_KORV/data/raw/BEA-BLS-industry-level-production-account-1987-2020/Labor_Col Compensation.csv",
-                        header=1, usecols= range(35)).set_index("Industry Description")
+import schema
+from instrument import RunLog
+from manifest import Manifest, fingerprint
+
+PATH_KLEMS = "./extend_KORV/data/raw/BEA-BLS-industry-level-production-account-1987-2020/"
+PATH_INTERIM = "./extend_KORV/data/interim/"
+TABLES = {
+    "comp_college": "Labor_Col Compensation.csv",
+    "comp_no_college": "Labor_NoCol Compensation.csv",
+    "value_added": "Value Added.csv",
+    "output": "Gross Output.csv",
+}
+INPUTS = [PATH_KLEMS + f for f in TABLES.values()] + [PATH_KLEMS + "NAICS codes.csv"]
+OUTPUT_LONG = PATH_INTERIM + "labor_share_output.csv"
+OUTPUTS = [PATH_INTERIM + "labor_share.csv", PATH_INTERIM + "output.csv", OUTPUT_LONG]
+
+
+def load_codes(path_klems=PATH_KLEMS):
+    """Production account code and 2007 NAICS codes by industry description."""
+    codes = schema.read_csv(path_klems + "NAICS codes.csv", header=2, usecols=range(3)).set_index("Descriptions")
+    return codes.dropna()
+
+
+def load_tables(codes, path_klems=PATH_KLEMS):
+    """Read every production account table once as an (account, year) float array.
+
+    Returns (descriptions, years, arrays): the descriptions of the accounts
+    with a code, in table order, the years, and a dict of arrays whose rows
+    follow `descriptions`.
+    """
+    reference, descriptions, years, arrays = None, None, None, {}
+    for name, file in TABLES.items():
+        table = pd.read_csv(path_klems + file, header=1, usecols=range(35)).set_index("Industry Description")
+        if reference is None:
+            reference, years = table.index, list(table.columns)
+            has_code = reference.isin(codes.index)
+            descriptions = reference[has_code]
+        if table.index.equals(reference):
+            # The tables list the same accounts in the same order: align by position
+            arrays[name] = table[years].to_numpy(dtype=float)[has_code]
+        else:
+            arrays[name] = table.reindex(index=descriptions, columns=years).to_numpy(dtype=float)
+    return descriptions, years, arrays
 
-comp_no_college = pd.read_csv("./extend_KORV/data/raw/BEA-BLS-industry-level-production-account-1987-2020/Labor_NoCol Compensation.csv",
-                        header=1, usecols= range(35)).set_index("Industry Description")
-comp_VA = pd.read_csv("./extend_KORV/data/raw/BEA-BLS-industry-level-production-account-1987-2020/Value Added.csv",
-                        header=1, usecols= range(35)).set_index("Industry Description")
-output = pd.read_csv("./extend_KORV/data/raw/BEA-BLS-industry-level-production-account-1987-2020/Gross Output.csv",
-                        header=1, usecols= range(35)).set_index("Industry Description")
 
-codes = pd.read_csv("./extend_KORV/data/raw/BEA-BLS-industry-level-production-account-1987-2020/NAICS codes.csv",
-                    header=2, usecols= range(3)).set_index("Descriptions")
-codes.dropna(inplace=True)
+def build_long(codes, descriptions, years, arrays):
+    """Long (code, year, L_SHARE, OUTPUT) table from the aligned arrays."""
+    l_share = (arrays["comp_college"] + arrays["comp_no_college"]) / arrays["value_added"]
+    output = arrays["output"]
+    # Keep the previous convention: a series with any missing year is dropped entirely
+    l_share[np.isnan(l_share).any(axis=1)] = np.nan
+    output = np.where(np.isnan(output).any(axis=1, keepdims=True), np.nan, output)
 
+    account_codes = codes.loc[descriptions, "Production Account Codes"].to_numpy()
+    long = pd.DataFrame({
+        "code": np.repeat(account_codes, len(years)),
+        "year": np.tile(np.asarray(years, dtype=schema.YEAR_DTYPE), len(account_codes)),
+        "L_SHARE": l_share.ravel(),
+        "OUTPUT": output.ravel(),
+    })
+    long = long.dropna(subset=["L_SHARE", "OUTPUT"], how="all").reset_index(drop=True)
+    return schema.enforce(long)
 
-# Merge data
 
-L_SHARE = (comp_college + comp_no_college) / comp_VA
-L_SHARE.loc[:, "Production Account Codes"] = codes.loc[:, "Production Account Codes"].apply(lambda x: x.strip())
-L_SHARE.loc[:, "2007 NAICS codes"] = codes.loc[:, "2007 NAICS codes"]
-L_SHARE.dropna(inplace=True)
+def wide_table(values, codes, descriptions, years):
+    """Previous wide layout: description index, one column per year, then the codes."""
+    wide = pd.DataFrame(values, index=descriptions, columns=years)
+    wide["Production Account Codes"] = codes.loc[descriptions, "Production Account Codes"].to_numpy()
+    wide["2007 NAICS codes"] = codes.loc[descriptions, "2007 NAICS codes"].to_numpy()
+    return wide.dropna()
 
-output.loc[:, "Production Account Codes"] = codes.loc[:, "Production Account Codes"].apply(lambda x: x.strip())
-output.loc[:, "2007 NAICS codes"] = codes.loc[:, "2007 NAICS codes"]
-output.dropna(inplace=True)
 
+def main(force=False):
+    with RunLog("labor_share_and_output_by_ind") as run:
+        manifest = Manifest("labor_share_and_output_by_ind", force=force)
+        stage_fp = fingerprint(files=[__file__] + INPUTS)
+        if not manifest.is_stale("labor_share_and_output", stage_fp):
+            print("[bold green]KLEMS tables unchanged since the last run; nothing to do.")
+            return
 
-print(L_SHARE.head())
-print(output.head())
+        start = time.perf_counter()
+        with run.step("load") as step:
+            codes = load_codes()
+            descriptions, years, arrays = load_tables(codes)
+            step.rows_out = run.rows_in = len(descriptions)
+        with run.step("build") as step:
+            long = build_long(codes, descriptions, years, arrays)
+            step.rows_in, step.rows_out = len(descriptions), len(long)
+        print(f"[bold green]Built {len(long)} (code, year) rows for {long['code'].nunique()} accounts "
+              f"in {time.perf_counter() - start:.3f}s")
+        print(long.head())
 
+        # Save data
+        with run.step("write") as step:
+            os.makedirs(PATH_INTERIM, exist_ok=True)
+            schema.write_csv(long, OUTPUT_LONG, index=False)
+            l_share = (arrays["comp_college"] + arrays["comp_no_college"]) / arrays["value_added"]
+            schema.write_csv(wide_table(l_share, codes, descriptions, years), PATH_INTERIM + "labor_share.csv")
+            schema.write_csv(wide_table(arrays["output"], codes, descriptions, years), PATH_INTERIM + "output.csv")
+            step.rows_in = run.rows_out = len(long)
 
+        manifest.record("labor_share_and_output", stage_fp, OUTPUTS)
+        manifest.save()
 
-# Save data
-L_SHARE.to_csv("./extend_KORV/data/interim/labor_share.csv")
-output.to_csv("./extend_KORV/data/interim/output.csv")
\ No newline at end of file
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compute labor share and gross output by industry.")
+    parser.add_argument("--force", action="store_true", help="Rebuild even if the KLEMS tables are unchanged")
+    args = parser.parse_args()
+    main(force=args.force)
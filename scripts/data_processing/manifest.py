@@ -0,0 +1,120 @@
+"""
+Content-hashed build manifest for the ETL stages.
+
+Each stage keeps a JSON manifest in data/manifest/{stage}.json that maps a unit
+of work (an industry, a table, or the whole stage) to the fingerprint of the
+inputs it was built from and the outputs it wrote. A unit is rebuilt only when
+its fingerprint changes or one of its outputs is missing or was modified.
+
+Typical use inside a stage:
+
+    manifest = Manifest("merge_al_data_industry", force=args.force)
+    fp = fingerprint(files=[__file__, "./data/interim/ind_labor/22.csv"])
+    if manifest.is_stale("22", fp):
+        ...  # rebuild
+        manifest.record("22", fp, outputs=["./data/proc/ind/22.csv"])
+    manifest.save()
+"""
+
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+import hashlib
+import json
+import os
+
+import pandas as pd
+
+import config
+
+_file_hashes = {}
+
+
+def hash_file(path):
+    """SHA-256 of a file's contents, or None if it does not exist.
+
+    Hashes are memoized per (path, size, mtime) within a process.
+    """
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    key = (os.path.abspath(path), st.st_size, st.st_mtime_ns)
+    if key not in _file_hashes:
+        h = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+        _file_hashes[key] = h.hexdigest()
+    return _file_hashes[key]
+
+
+def hash_frame(df):
+    """SHA-256 of a DataFrame's index, columns and values."""
+    h = hashlib.sha256()
+    h.update(",".join(map(str, df.columns)).encode())
+    h.update(pd.util.hash_pandas_object(df, index=True).values.tobytes())
+    return h.hexdigest()
+
+
+def fingerprint(files=(), **values):
+    """Combine file contents and extra values (e.g. frame hashes) into one digest.
+
+    Missing files contribute a fixed marker, so they change the fingerprint
+    once they appear.
+    """
+    h = hashlib.sha256()
+    for path in files:
+        h.update(_relpath(path).encode())
+        h.update((hash_file(path) or "missing").encode())
+    for key, value in sorted(values.items()):
+        h.update(f"{key}={value}".encode())
+    return h.hexdigest()
+
+
+def _relpath(path):
+    return os.path.relpath(os.path.abspath(path), config.ROOT)
+
+
+class Manifest:
+    """Fingerprints and outputs of the units built by one stage."""
+
+    def __init__(self, stage, force=False):
+        self.stage = stage
+        self.force = force
+        self.path = os.path.join(config.PATH_MANIFEST, f"{stage}.json")
+        self.units = {}
+        if os.path.isfile(self.path):
+            with open(self.path) as f:
+                self.units = json.load(f)
+
+    def is_stale(self, unit, fp):
+        """True if `unit` must be rebuilt for inputs with fingerprint `fp`.
+
+        A unit is also stale when one of its recorded outputs was removed or
+        modified since it was built.
+        """
+        if self.force:
+            return True
+        entry = self.units.get(unit)
+        if entry is None or entry["fingerprint"] != fp:
+            return True
+        return any(hash_file(os.path.join(config.ROOT, path)) != digest
+                   for path, digest in entry["outputs"].items())
+
+    def record(self, unit, fp, outputs=()):
+        """Record that `unit` was built from `fp` and wrote `outputs`."""
+        self.units[unit] = {"fingerprint": fp,
+                            "outputs": {_relpath(p): hash_file(p) for p in outputs}}
+
+    def forget(self, unit):
+        """Drop `unit`, so it is stale on the next run."""
+        self.units.pop(unit, None)
+
+    def save(self):
+        os.makedirs(config.PATH_MANIFEST, exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.units, f, indent=1, sort_keys=True)
+        os.replace(tmp, self.path)
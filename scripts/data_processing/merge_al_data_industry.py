@@ -1,75 +1,148 @@
 # %%
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+import argparse
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+
 import pandas as pd
 from rich import print
 
-xwalk = pd.read_csv("./data/interim/cross_walk.csv")
-klems_code = xwalk["code_klems"].values.tolist()
-bea_code = xwalk["code_bea"].values.tolist()
+import config
+import schema
+from instrument import RunLog
+from manifest import Manifest, fingerprint, hash_frame
 
-gdp_def = pd.read_csv("./data/raw/gdpdef.csv")
+# Shared inputs for the per-industry build. Set once per process, either in
+# `main` or by `_init_worker` when running in a process pool.
+_klems = None
+_gdp_def = None
+_capital = None
 
-gdp_def.value = gdp_def.value / 100
-gdp_def.date = gdp_def.date.apply(lambda x : int(x[:4]))
-gdp_def = gdp_def.loc[ gdp_def.date >= 1987 , :]
-gdp_def = gdp_def.loc[ gdp_def.date <= 2018 , :]
-gdp_def.date = gdp_def.date.apply(lambda x : str(x))
-gdp_def.set_index("date", inplace=True)
+CAPITAL_YEARS = pd.Index(range(1947, 2021), dtype=schema.YEAR_DTYPE)
+CAPITAL_SUMS = ["K_STR", "K_EQ"]
+CAPITAL_MEANS = ["REL_P_EQ", "DPR_ST", "DPR_EQ"]
 
-# Read labor share and output data 
-labor_share = pd.read_csv("./data/interim/labor_share.csv")
-output = pd.read_csv("./data/interim/output.csv")
 
+def load_gdp_deflator():
+    gdp_def = schema.read_csv("./data/raw/gdpdef.csv")  # date -> int16 year
 
+    gdp_def.value = gdp_def.value / 100
+    gdp_def = gdp_def.loc[ gdp_def.date >= 1987 , :]
+    gdp_def = gdp_def.loc[ gdp_def.date <= 2018 , :]
+    gdp_def.set_index("date", inplace=True)
+    return gdp_def
 
-for (ind_bea, ind_klems) in zip(bea_code, klems_code):
-    # Select labor share data and output for the industry
-    labor_share_ind = labor_share.loc[labor_share["Production Account Codes"] == ind_klems]
-    output_ind = output.loc[output["Production Account Codes"] == ind_klems]
 
-    years = [y for y in labor_share_ind.columns if y.isdigit()]
+def load_klems_panel(long):
+    """Index the long labor share and output table on (code, YEAR).
+
+    `long` is extend_KORV/data/interim/labor_share_output.csv (code, year,
+    L_SHARE, OUTPUT), written by labor_share_and_output_by_ind.py. The frame
+    has columns L_SHARE and OUTPUT and a sorted MultiIndex, so the rows of
+    one production account code are a single slice (`panel.loc[code]`)
+    instead of a scan of the whole table. Only (code, year) pairs with both
+    values are kept, as in the wide tables.
+    """
+    panel = schema.enforce(long.rename(columns={"year": "YEAR"})).dropna(subset=["L_SHARE", "OUTPUT"])
+    panel = panel.set_index(["code", "YEAR"])[["L_SHARE", "OUTPUT"]].sort_index()
+    # Membership tests use the first level, so it must only list codes with rows
+    panel.index = panel.index.remove_unused_levels()
+    return panel
+
+
+def klems_industry(panel, ind_klems):
+    """L_SHARE and OUTPUT of one code indexed by YEAR (empty if the code is absent)."""
+    if ind_klems not in panel.index.levels[0]:
+        return panel.iloc[:0].droplevel("code")
+    return panel.loc[ind_klems]
+
+
+def load_capital_components(codes):
+    """Read each distinct `ind_capital/{code}.csv` once into one (code, YEAR) frame.
+
+    Codes whose file is missing are left out of the frame and reported.
+    """
+    frames = {}
+    for code in dict.fromkeys(codes):
+        try:
+            capital_data_temp = schema.read_csv(f"./data/interim/ind_capital/{code}.csv")
+        except FileNotFoundError:
+            print(f"[bold red]Missing capital data for BEA code {code}")
+            continue
+        frames[code] = capital_data_temp.set_index("YEAR")
+    if not frames:
+        # No file at all: every industry then fails on its own in `build_industry`
+        index = pd.MultiIndex.from_arrays([pd.Index([], dtype=str), pd.Index([], dtype=schema.YEAR_DTYPE)],
+                                          names=["code", "YEAR"])
+        return pd.DataFrame(columns=CAPITAL_SUMS + CAPITAL_MEANS, index=index, dtype=schema.FLOAT_DTYPE)
+    return pd.concat(frames, names=["code", "YEAR"])
+
 
-    labor_share_ind = labor_share_ind.T.loc[years]
-    output_ind = output_ind.T.loc[years]
+def aggregate_capital(bea_code, components):
+    """Aggregate capital components for every crosswalk `code_bea` entry at once.
 
-    labor_share_ind.rename(columns={labor_share_ind.columns[0] : "L_SHARE"}, inplace=True)
-    output_ind.rename(columns={output_ind.columns[0] : "OUTPUT"}, inplace=True)
+    Stocks (K_STR, K_EQ) are summed and scaled to millions; the relative price
+    and depreciation rates are averaged over the listed codes. The result is
+    indexed by (code_bea, YEAR) over 1947-2020; a year missing for any of the
+    codes is left as NaN, and entries referencing a code without data are
+    dropped.
+    """
+    pairs = pd.DataFrame({"code_bea": list(dict.fromkeys(bea_code))})
+    pairs["n_codes"] = pairs.code_bea.str.split(",").str.len()
+    pairs["code"] = pairs.code_bea.str.split(",")
+    pairs = pairs.explode("code")
+    pairs.code = pairs.code.str.strip()
 
+    available = components.index.unique(level="code")
+    missing = pairs.loc[~pairs.code.isin(available), "code_bea"].unique()
+    pairs = pairs.loc[~pairs.code_bea.isin(missing)]
 
-    # Merge both dataframes
-    merged = pd.merge(labor_share_ind, output_ind, left_index=True, right_index=True)
+    full_index = pd.MultiIndex.from_product([available, CAPITAL_YEARS], names=["code", "YEAR"])
+    components = components.reindex(full_index)[CAPITAL_SUMS + CAPITAL_MEANS]
+    components[CAPITAL_SUMS] = components[CAPITAL_SUMS] * 1000
+
+    joined = pairs.merge(components.reset_index(), on="code")
+    keys = [joined.code_bea, joined.YEAR]
+    capital = joined.groupby(keys, sort=False)[CAPITAL_SUMS + CAPITAL_MEANS].sum()
+    n_codes = joined.groupby(keys, sort=False).n_codes.first()
+    capital[CAPITAL_MEANS] = capital[CAPITAL_MEANS].div(n_codes, axis=0)
+    incomplete = joined[CAPITAL_SUMS + CAPITAL_MEANS].isna().groupby(keys, sort=False).any()
+    return capital.mask(incomplete)
+
+
+def _init_worker(klems, gdp_def, capital):
+    global _klems, _gdp_def, _capital
+    _klems, _gdp_def, _capital = klems, gdp_def, capital
+
+
+def build_industry(ind_bea, ind_klems):
+    """Build and save `data/proc/ind/{ind_klems}.csv`.
+
+    Returns the merged dataframe, or None when the industry has no labor data.
+    """
+    # Select labor share data and output for the industry
+    if ind_klems not in _klems.index.levels[0]:
+        raise KeyError(f"No labor share or output data for KLEMS code {ind_klems}")
+    merged = _klems.loc[ind_klems].copy()
+    merged.index.name = None
     # Deflate output
-    merged.OUTPUT = merged.OUTPUT.astype(float) /gdp_def.value
-
-    # Read Capital Data
-    code_list = ind_bea.split(",")
-    capital_data = pd.DataFrame({   "YEAR" : map(str , range(1947, 2021)), 
-                                    "K_STR" : [0]*len(range(1947, 2021)),
-                                    "K_EQ" :[0]*len(range(1947, 2021)),
-                                    "REL_P_EQ" : [0]*len(range(1947, 2021)),
-                                    "DPR_ST": [0]*len(range(1947, 2021)),
-                                    "DPR_EQ": [0]*len(range(1947, 2021))}).set_index("YEAR")
-
-    for ind_ in code_list:
-        capital_data_temp = pd.read_csv(f"./data/interim/ind_capital/{ind_.strip()}.csv")
-        capital_data_temp.YEAR = capital_data_temp.YEAR.astype(int).astype(str)
-        capital_data_temp.set_index("YEAR", inplace=True)
-        capital_data.K_STR += capital_data_temp.K_STR * 1000
-        capital_data.K_EQ += capital_data_temp.K_EQ * 1000
-        capital_data.DPR_ST += capital_data_temp.DPR_ST
-        capital_data.DPR_EQ += capital_data_temp.DPR_EQ
-        capital_data.REL_P_EQ += capital_data_temp.REL_P_EQ
-    
-    capital_data.REL_P_EQ /= len(code_list)
-    capital_data.DPR_ST /= len(code_list)
-    capital_data.DPR_EQ /= len(code_list)
+    merged.OUTPUT = merged.OUTPUT.astype(float) /_gdp_def.value
+
+    # Capital data, pre-aggregated over the BEA codes of the industry
+    if ind_bea not in _capital.index.levels[0]:
+        raise FileNotFoundError(f"Missing capital components for BEA code(s) {ind_bea}")
+    capital_data = _capital.loc[ind_bea]
 
     # Merge (again) both dataframes
     merged = pd.merge(merged, capital_data, left_index=True, right_index=True)
 
-    labor = pd.read_csv(f"./data/interim/ind_labor/{ind_klems}.csv")
+    labor = schema.read_csv(f"./data/interim/ind_labor/{ind_klems}.csv")
     if len(labor) == 0:
-        continue
-    labor.YEAR = labor.YEAR.astype(int).astype(str)
+        return None
     labor.set_index("YEAR", inplace=True)
 
     # Merge (again) both dataframes
@@ -83,22 +156,149 @@ for (ind_bea, ind_klems) in zip(bea_code, klems_code):
     merged.loc[:, ["OUTPUT"]] = merged.loc[:, ["OUTPUT"]] / 1000
     merged.loc[:, ["REL_P_EQ"]] = merged.loc[:, ["REL_P_EQ"]] / merged.loc[0, ["REL_P_EQ"]]
 
-    # print(ind_bea, ind_klems)
-    print(merged.head())
-    merged.to_csv("./data/proc/ind/{}.csv".format(ind_klems), index=False)
+    schema.write_csv(merged, "./data/proc/ind/{}.csv".format(ind_klems), index=False)
+    return merged
 
 
-# %%
-## Create exrtended dataframe for the whole economy
-### Read capital data
-capital_data = pd.read_csv("data/proc/capital_totl.csv")
-capital_data.YEAR = capital_data.YEAR.astype(int).astype(str)
-capital_data.set_index("YEAR", inplace=True)
-### Read labor data
-labor_data = pd.read_csv("data/proc/labor_totl.csv")
-labor_data.YEAR = labor_data.YEAR.astype(int).astype(str)
-labor_data.set_index("YEAR", inplace=True)
-### Merge both dataframes
-merged = pd.merge(capital_data, labor_data, left_index=True, right_index=True)
-merged.to_csv("./data/proc/data_updated.csv", index=False)
+def run_industry(ind_bea, ind_klems):
+    """Run `build_industry` and report its outcome instead of raising.
+
+    Returns a tuple (ind_klems, status, rows, seconds, error) where status is
+    one of "ok", "skipped" (no labor data) or "error".
+    """
+    start = time.perf_counter()
+    try:
+        merged = build_industry(ind_bea, ind_klems)
+    except Exception:
+        return ind_klems, "error", 0, time.perf_counter() - start, traceback.format_exc()
+    if merged is None:
+        return ind_klems, "skipped", 0, time.perf_counter() - start, None
+    return ind_klems, "ok", len(merged), time.perf_counter() - start, None
+
+
+def build_all_industries(bea_code, klems_code, klems, gdp_def, capital, workers=1):
+    """Build every crosswalk industry, in a process pool when `workers` > 1.
+
+    Results are returned in crosswalk order regardless of completion order.
+    """
+    if workers <= 1:
+        _init_worker(klems, gdp_def, capital)
+        return [run_industry(b, k) for (b, k) in zip(bea_code, klems_code)]
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(klems, gdp_def, capital)) as pool:
+        return list(pool.map(run_industry, bea_code, klems_code))
+
+
+def print_summary(results, wall):
+    colors = {"ok": "green", "skipped": "yellow", "error": "red"}
+    for (ind_klems, status, rows, seconds, _) in results:
+        print(f"[{colors[status]}]{status:>8}[/] {ind_klems:<8} {rows:>4} rows {seconds:8.3f}s")
+    for (ind_klems, status, _, _, error) in results:
+        if status == "error":
+            print(f"[bold red]Error building {ind_klems}:[/]\n{error}")
+
+    n_status = {s: sum(r[1] == s for r in results) for s in colors}
+    busy = sum(r[3] for r in results)
+    slowest = max(results, key=lambda r: r[3]) if results else None
+    print(f"[bold blue]Merged {len(results)} industries in {wall:.2f}s wall "
+          f"({busy:.2f}s summed over industries): "
+          f"{n_status['ok']} ok, {n_status['skipped']} skipped, {n_status['error']} errors")
+    if slowest is not None:
+        print(f"[bold blue]Slowest industry: {slowest[0]} ({slowest[3]:.3f}s)")
+
+
+def industry_fingerprint(ind_bea, ind_klems, klems):
+    """Fingerprint of everything `build_industry` reads for one industry."""
+    codes = [code.strip() for code in ind_bea.split(",")]
+    files = [__file__, "./data/raw/gdpdef.csv", f"./data/interim/ind_labor/{ind_klems}.csv"]
+    files += [f"./data/interim/ind_capital/{code}.csv" for code in codes]
+    return fingerprint(
+        files=files,
+        code_bea=ind_bea,
+        klems=hash_frame(klems_industry(klems, ind_klems)),
+    )
+
+
+def main(workers=1, store=False, force=False):
+    with RunLog("merge_al_data_industry") as run:
+        run.info["workers"] = workers
+        with run.step("load") as step:
+            xwalk = schema.read_csv("./data/interim/cross_walk.csv")
+            klems_code = xwalk["code_klems"].values.tolist()
+            bea_code = xwalk["code_bea"].values.tolist()
+
+            gdp_def = load_gdp_deflator()
+
+            # Read labor share and output data, indexed once on (code, YEAR)
+            klems = load_klems_panel(schema.read_csv("./extend_KORV/data/interim/labor_share_output.csv"))
+            step.rows_out = len(klems)
+
+        # Only rebuild industries whose inputs changed since the last run
+        with run.step("fingerprint"):
+            manifest = Manifest("merge_al_data_industry", force=force)
+            fps = {k: industry_fingerprint(b, k, klems) for (b, k) in zip(bea_code, klems_code)}
+            stale = [(b, k) for (b, k) in zip(bea_code, klems_code) if manifest.is_stale(k, fps[k])]
+        print(f"[bold blue]{len(stale)} of {len(klems_code)} industries need rebuilding")
+
+        results = []
+        if stale:
+            stale_bea, stale_klems = [list(x) for x in zip(*stale)]
+            # Read every capital component once and aggregate them for all industries
+            with run.step("capital") as step:
+                components = load_capital_components(
+                    code.strip() for codes in stale_bea for code in codes.split(","))
+                capital = aggregate_capital(stale_bea, components)
+                step.rows_in, step.rows_out = len(components), len(capital)
+
+            with run.step("industries") as step:
+                start = time.perf_counter()
+                results = build_all_industries(stale_bea, stale_klems, klems, gdp_def, capital, workers=workers)
+                print_summary(results, time.perf_counter() - start)
+                step.rows_out = sum(r[2] for r in results)
+
+            for (ind_klems, status, rows, seconds, _) in results:
+                run.unit(ind_klems, seconds, rows=rows, status=status)
+                if status == "ok":
+                    manifest.record(ind_klems, fps[ind_klems], ["./data/proc/ind/{}.csv".format(ind_klems)])
+                elif status == "skipped":
+                    manifest.record(ind_klems, fps[ind_klems])
+            manifest.save()
+        run.rows_out = sum(r[2] for r in results)
+
+        if store and (results or not config.store_is_fresh("ind")):
+            from industry_store import build_store
+            with run.step("store"):
+                build_store("ind")
+
+        # %%
+        ## Create exrtended dataframe for the whole economy
+        economy_fp = fingerprint(files=[__file__, "data/proc/capital_totl.csv", "data/proc/labor_totl.csv"])
+        if not manifest.is_stale("economy", economy_fp):
+            return results
+        with run.step("economy"):
+            ### Read capital data
+            capital_data = schema.read_csv("data/proc/capital_totl.csv")
+            capital_data.set_index("YEAR", inplace=True)
+            ### Read labor data
+            labor_data = schema.read_csv("data/proc/labor_totl.csv")
+            labor_data.set_index("YEAR", inplace=True)
+            ### Merge both dataframes
+            merged = pd.merge(capital_data, labor_data, left_index=True, right_index=True)
+            schema.write_csv(merged, "./data/proc/data_updated.csv", index=False)
+        manifest.record("economy", economy_fp, ["./data/proc/data_updated.csv"])
+        manifest.save()
+        return results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Merge labor share, output, capital and labor data by industry.")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Number of worker processes for the per-industry build (default: 1, sequential)")
+    parser.add_argument("--store", action="store_true",
+                        help="Also rebuild the Parquet store of data/proc/ind (requires pyarrow)")
+    parser.add_argument("--force", action="store_true",
+                        help="Rebuild every industry even if its inputs are unchanged")
+    args = parser.parse_args()
+    results = main(workers=args.workers, store=args.store, force=args.force)
+    # Failed industries are reported above; also signal them to the caller
+    sys.exit(1 if any(status == "error" for (_, status, _, _, _) in results) else 0)
 # %%
@@ -0,0 +1,266 @@
+"""
+Memory-mapped industry panel shared by the ETL and analysis code.
+
+`build` stacks every data/proc/ind/{IND}.csv into one contiguous float64 array
+of shape (industry, year, variable), written as raw little-endian bytes in C
+order to data/proc/panel/, next to a JSON header with the axis labels and the
+years present in each source file. `Panel.open()` maps the file read-only, so
+every process reading the panel shares the same physical pages and nothing is
+parsed or copied until a slice is used:
+
+    from panel import Panel
+    panel = Panel.open()
+    panel.sel(industry="22", variable="SKILL_PREMIUM")        # years of one industry (a view)
+    panel["CAPITAL_RATIO"]                                    # industry x year, derived lazily
+    panel.frame("22")                                         # one industry like its CSV
+
+Stored columns (SKILL_PREMIUM and LABOR_INPUT_RATIO included) are read as
+they are. Ratios in DERIVED that are not stored are computed on first use and
+cached per process. Years missing from a file are NaN.
+
+From Julia (column-major, so the axes are reversed):
+    header = JSON.parsefile("data/proc/panel/panel.json")
+    values = Mmap.mmap("data/proc/panel/" * header["data"], Array{Float64,3}, Tuple(reverse(header["shape"])))
+
+Usage (from the repository root):
+    python scripts/data_processing/panel.py build
+    python scripts/data_processing/panel.py info
+"""
+
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+import pandas as pd
+from rich import print
+
+import config
+import schema
+
+AXES = ("industry", "year", "variable")
+HEADER = "panel.json"
+DTYPE = "<f8"
+
+# Derived variable -> (numerator, denominator) columns, multiplied together
+# when there are several; zero denominators give NaN
+DERIVED = {
+    "SKILL_PREMIUM": (["W_S"], ["W_U"]),
+    "LABOR_INPUT_RATIO": (["L_S"], ["L_U"]),
+    "CAPITAL_RATIO": (["K_EQ"], ["K_STR"]),
+    "WAGE_BILL_RATIO": (["W_S", "L_S"], ["W_U", "L_U"]),
+}
+
+
+def header_path(path=None):
+    return os.path.join(path or config.PATH_PANEL, HEADER)
+
+
+def is_fresh(path=None):
+    """True if the panel holds exactly the industries of data/proc/ind and is newer than every CSV."""
+    header = header_path(path)
+    if not os.path.isfile(header):
+        return False
+    built = os.path.getmtime(header)
+    files = list(Path(config.PATH_PROC_IND).glob("*.csv"))
+    with open(header) as f:
+        industries = json.load(f)["industry"]
+    if set(industries) != {f.stem for f in files}:
+        return False
+    return all(f.stat().st_mtime <= built for f in files)
+
+
+def build_panel(path=None, csv_dir=None):
+    """(Re)build the memory-mapped panel from the per-industry CSVs; returns the header path."""
+    path = path or config.PATH_PANEL
+    files = sorted(Path(csv_dir or config.PATH_PROC_IND).glob("*.csv"))
+    if not files:
+        print("[bold red]No CSV files found in data/proc/ind")
+        return None
+
+    start = time.perf_counter()
+    frames = {f.stem: schema.read_csv(f, float_precision="round_trip") for f in files}
+    variables = []
+    for df in frames.values():
+        variables += [c for c in df.columns if c != "YEAR" and c not in variables]
+    years = np.unique(np.concatenate([df["YEAR"].to_numpy() for df in frames.values()]))
+
+    # Write the data under a new name and swap the header in last: readers that
+    # already mapped the previous file keep it until they close it
+    os.makedirs(path, exist_ok=True)
+    data = f"panel-{time.time_ns()}.f64"
+    values = np.memmap(os.path.join(path, data), dtype=DTYPE, mode="w+",
+                       shape=(len(frames), len(years), len(variables)))
+    values[:] = np.nan
+    for i, df in enumerate(frames.values()):
+        rows = np.searchsorted(years, df["YEAR"].to_numpy())
+        cols = [variables.index(c) for c in df.columns if c != "YEAR"]
+        values[i, rows[:, None], cols] = df.drop(columns="YEAR").to_numpy(dtype=np.float64)
+    values.flush()
+    del values
+
+    header = {
+        "data": data,
+        "dtype": DTYPE,
+        "shape": [len(frames), len(years), len(variables)],
+        "axes": list(AXES),
+        "industry": list(frames),
+        "year": years.tolist(),
+        "variable": variables,
+        "observed": {code: df["YEAR"].tolist() for (code, df) in frames.items()},
+    }
+    target = header_path(path)
+    previous = json.loads(Path(target).read_text())["data"] if os.path.isfile(target) else None
+    with open(target + ".tmp", "w") as f:
+        json.dump(header, f)
+    os.replace(target + ".tmp", target)
+    if previous and previous != data and os.path.isfile(os.path.join(path, previous)):
+        os.remove(os.path.join(path, previous))
+
+    print(f"[bold green]Panel of {len(frames)} industries x {len(years)} years x {len(variables)} variables "
+          f"in {os.path.relpath(target, config.ROOT)} [{time.perf_counter() - start:.2f}s]")
+    return target
+
+
+class Panel:
+    """Read-only (industry, year, variable) panel backed by a memory-mapped array.
+
+    `values` is the mapped array; `industries`, `years` and `variables` label
+    its axes. Selections by label return views of the mapping where NumPy
+    allows it (scalars and slices), so they copy nothing.
+    """
+
+    def __init__(self, values, industries, years, variables, observed=None):
+        self.values = values
+        self.industries = pd.Index(industries, name="industry")
+        self.years = pd.Index(np.asarray(years, dtype=schema.YEAR_DTYPE), name="YEAR")
+        self.variables = pd.Index(variables, name="variable")
+        self.observed = observed or {code: self.years.tolist() for code in self.industries}
+        self._derived = {}
+
+    @classmethod
+    def open(cls, path=None):
+        """Map the panel written by `build_panel` (data/proc/panel by default)."""
+        header = header_path(path)
+        if not os.path.isfile(header):
+            raise FileNotFoundError(f"No panel at {header}; run scripts/data_processing/panel.py build")
+        meta = json.loads(Path(header).read_text())
+        values = np.memmap(os.path.join(os.path.dirname(header), meta["data"]), dtype=meta["dtype"],
+                           mode="r", shape=tuple(meta["shape"]))
+        return cls(values, meta["industry"], meta["year"], meta["variable"], meta["observed"])
+
+    @property
+    def shape(self):
+        return self.values.shape
+
+    def __repr__(self):
+        return (f"Panel({len(self.industries)} industries x {len(self.years)} years "
+                f"[{self.years[0]}-{self.years[-1]}] x {len(self.variables)} variables)")
+
+    def __contains__(self, variable):
+        return variable in self.variables or variable in DERIVED
+
+    def __getitem__(self, variable):
+        """Industry x year DataFrame of a stored or derived variable."""
+        return pd.DataFrame(self.variable(variable), index=self.industries, columns=self.years, copy=False)
+
+    def variable(self, variable):
+        """Industry x year array of `variable`: a view for stored columns, cached for derived ones."""
+        if variable in self.variables:
+            return self.values[:, :, self.variables.get_loc(variable)]
+        if variable not in DERIVED:
+            raise KeyError(f"{variable!r} is neither stored in the panel nor derived")
+        if variable not in self._derived:
+            self._derived[variable] = self._derive(variable)
+        return self._derived[variable]
+
+    def _derive(self, variable):
+        num, den = (np.prod([self.variable(v) for v in columns], axis=0) for columns in DERIVED[variable])
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ratio = np.divide(num, den, out=np.full(num.shape, np.nan), where=den != 0)
+        ratio.flags.writeable = False
+        return ratio
+
+    def _locate(self, axis, labels):
+        index = {"industry": self.industries, "year": self.years, "variable": self.variables}[axis]
+        if labels is None:
+            return slice(None)
+        if isinstance(labels, slice):
+            return index.slice_indexer(labels.start, labels.stop, labels.step)
+        if np.ndim(labels) == 0:
+            return index.get_loc(labels)
+        labels = list(labels)
+        pos = index.get_indexer_for(labels)
+        if (pos < 0).any():
+            raise KeyError(f"Not in the panel's {axis} axis: {[l for l, p in zip(labels, pos) if p < 0]}")
+        return pos
+
+    @staticmethod
+    def _take(values, loc):
+        # Index one axis at a time (last first), so lists on several axes select
+        # their cross product instead of being paired up by NumPy
+        for axis in reversed(range(len(loc))):
+            values = values[(slice(None),) * axis + (loc[axis],)]
+        return values
+
+    def sel(self, industry=None, year=None, variable=None):
+        """Values selected by label on each axis.
+
+        Each argument is a label, a list of labels or a slice of labels (year
+        slices include both ends, like `.loc`); None keeps the whole axis.
+        Labels and slices of stored variables return views of the mapping;
+        a single derived variable comes from the per-process cache.
+        """
+        loc = [self._locate("industry", industry), self._locate("year", year)]
+        if isinstance(variable, str) and variable not in self.variables:
+            return self._take(self.variable(variable), loc)
+        return self._take(self.values, loc + [self._locate("variable", variable)])
+
+    def series(self, industry, variable):
+        """Year-indexed Series of one industry and variable (a view for stored variables)."""
+        return pd.Series(self.sel(industry=industry, variable=variable), index=self.years,
+                         name=variable, copy=False)
+
+    def frame(self, industry, variables=None):
+        """One industry as a DataFrame shaped like data/proc/ind/{IND}.csv (YEAR plus variables).
+
+        Only the years present in the industry's file are included.
+        `variables` may name derived variables as well as stored ones.
+        """
+        i = self.industries.get_loc(industry)
+        rows = self.years.get_indexer(self.observed[industry])
+        if len(rows) == len(self.years):
+            rows = slice(None)  # every year present: the block is a view of the mapping
+        if variables is None:
+            df = pd.DataFrame(self.values[i, rows], columns=self.variables.tolist(), copy=False)
+        else:
+            df = pd.DataFrame({v: self.variable(v)[i, rows] for v in variables})
+        df.insert(0, "YEAR", self.years[rows].to_numpy())
+        return df
+
+    def long(self, variables=None):
+        """All industries stacked with an `industry` column, like `config.load_industries()`."""
+        frames = [self.frame(code, variables).assign(**{config.STORE_PARTITION: code})
+                  for code in self.industries]
+        return schema.enforce(pd.concat(frames, ignore_index=True))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build or inspect the memory-mapped industry panel.")
+    parser.add_argument("command", choices=["build", "info"])
+    parser.add_argument("--path", default=None, help="Panel directory (default: data/proc/panel)")
+    args = parser.parse_args()
+
+    if args.command == "build":
+        build_panel(args.path)
+    else:
+        panel = Panel.open(args.path)
+        print(panel)
+        print(f"Stored: {', '.join(panel.variables)}")
+        print(f"Derived: {', '.join(v for v in DERIVED if v not in panel.variables)}")
+        print(f"Fresh: {is_fresh(args.path)}")
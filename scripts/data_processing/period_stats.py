@@ -0,0 +1,145 @@
+"""
+Window (decade, 5-year, custom period) summaries of annual panels.
+
+Every year is assigned to a window, and means and annualized growth rates of
+any number of variables are computed with one groupby over (group keys,
+window) using first/last/count aggregations, so the same call summarizes the
+aggregate KORV series or all industries at once:
+
+    summary = period_summary(korv_data, ['SKILL_PREMIUM', 'L_SHARE'], length=10)
+    summary = period_summary(panel, ['SKILL_PREMIUM'], by='industry', breaks=[1987, 2000, 2008])
+
+Usage (from the repository root), writing industry summaries for several
+windowings to data/results/industry_period_stats.csv:
+    python scripts/data_processing/period_stats.py --length 5 --length 10 --breaks 1987,2000,2008
+"""
+
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+from rich import print
+
+import config
+import schema
+from panel import Panel, is_fresh as panel_is_fresh
+
+
+def assign_windows(years, length=10, breaks=None):
+    """Start year of the window containing each year.
+
+    With `breaks`, windows start at each break year and run until the next
+    one (years before the first break get NaN). Otherwise windows are
+    `length` years long and aligned to multiples of `length` (decades for 10).
+    """
+    years = pd.Series(years)
+    if breaks is not None:
+        breaks = np.sort(np.asarray(breaks))
+        pos = np.searchsorted(breaks, years.values, side="right") - 1
+        return pd.Series(np.where(pos >= 0, breaks[np.maximum(pos, 0)], np.nan), index=years.index)
+    return (years // length) * length
+
+
+def period_summary(df, variables, length=10, breaks=None, by=None, year="YEAR"):
+    """Mean and annualized growth (%) of `variables` within each window.
+
+    Growth is ((last / first) ** (1 / span) - 1) * 100, where first and last
+    are the first and last non-missing values of the window and span the
+    number of years between them; it is NaN when the first value is not
+    positive or fewer than two values are observed.
+
+    Args:
+        df: annual data with a `year` column and optionally group columns.
+        variables: columns to summarize.
+        length, breaks: windowing, see `assign_windows`.
+        by: optional column name(s) identifying groups, e.g. 'industry'.
+
+    Returns:
+        DataFrame with one row per (group, window): the `by` columns, WINDOW
+        (start year), START and END (first and last year present), N (rows)
+        and {var}_mean, {var}_growth for every variable.
+    """
+    by = [] if by is None else ([by] if isinstance(by, str) else list(by))
+    values = df[variables]
+    keys = [df[k] for k in by] + [assign_windows(df[year], length, breaks).rename("WINDOW")]
+
+    # Year of each non-missing value, so first/last also give the span of the growth rate
+    obs_years = pd.DataFrame({v: df[year].where(values[v].notna()) for v in variables}, dtype=float)
+    frame = pd.concat([values, obs_years.add_suffix("__year"), df[year].rename("__year")], axis=1)
+    grouped = frame.groupby(keys, sort=True, dropna=True, observed=True)
+
+    means = grouped[variables].mean()
+    first = grouped.first()
+    last = grouped.last()
+    count = grouped[variables].count()
+
+    span = last[[v + "__year" for v in variables]].to_numpy() - first[[v + "__year" for v in variables]].to_numpy()
+    initial = first[variables].to_numpy()
+    final = last[variables].to_numpy()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        growth = ((final / initial) ** (1 / span) - 1) * 100
+    growth = np.where((initial > 0) & (span > 0) & (count.to_numpy() >= 2), growth, np.nan)
+
+    summary = pd.DataFrame({
+        "START": grouped["__year"].min(),
+        "END": grouped["__year"].max(),
+        "N": grouped.size(),
+    })
+    for i, v in enumerate(variables):
+        summary[f"{v}_mean"] = means[v]
+        summary[f"{v}_growth"] = growth[:, i]
+    summary = summary.reset_index()
+    summary["WINDOW"] = summary["WINDOW"].astype(int)
+    return summary
+
+
+INDUSTRY_VARIABLES = ["SKILL_PREMIUM", "LABOR_INPUT_RATIO", "CAPITAL_RATIO", "K_EQ", "K_STR", "L_SHARE", "OUTPUT"]
+
+
+def industry_panel():
+    """All industries in data/proc/ind stacked with an `industry` column and CAPITAL_RATIO."""
+    if panel_is_fresh():
+        ind_panel = Panel.open()
+        return ind_panel.long(list(ind_panel.variables) + ["CAPITAL_RATIO"])
+    if config.store_is_fresh("ind"):
+        panel = config.load_industries()
+    else:
+        panel = pd.concat(
+            {f.stem: schema.read_csv(f, float_precision="round_trip")
+             for f in sorted(Path(config.PATH_PROC_IND).glob("*.csv"))},
+            names=[config.STORE_PARTITION, None],
+        ).reset_index(level=0)
+        panel = schema.enforce(panel)
+    panel["CAPITAL_RATIO"] = panel["K_EQ"] / panel["K_STR"]
+    return panel
+
+
+def industry_period_stats(windowings):
+    """Summaries of every industry for each (name, length, breaks) windowing, stacked."""
+    panel = industry_panel()
+    variables = [v for v in INDUSTRY_VARIABLES if v in panel.columns]
+    return pd.concat(
+        {name: period_summary(panel, variables, length=length, breaks=breaks, by=config.STORE_PARTITION)
+         for (name, length, breaks) in windowings},
+        names=["WINDOWING", None],
+    ).reset_index(level=0).reset_index(drop=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Window summaries (means, annualized growth) for all industries.")
+    parser.add_argument("--length", type=int, action="append", help="Window length in years (repeatable, default 10)")
+    parser.add_argument("--breaks", action="append", default=[], help="Comma-separated window start years (repeatable)")
+    parser.add_argument("--out", default=os.path.join(config.PATH_RESULTS, "industry_period_stats.csv"))
+    args = parser.parse_args()
+
+    windowings = [(f"{n}y", n, None) for n in (args.length or ([] if args.breaks else [10]))]
+    windowings += [(f"breaks:{b}", None, [int(y) for y in b.split(",")]) for b in args.breaks]
+    stats = industry_period_stats(windowings)
+    stats.to_csv(args.out, index=False)
+    print(f"[bold green]Wrote {len(stats)} industry-window rows "
+          f"({stats[config.STORE_PARTITION].nunique()} industries, {len(windowings)} windowings) to {args.out}")
@@ -2,73 +2,166 @@ import sys
 from pathlib import Path
 sys.path.append(str(Path(__file__).parent.parent.parent))
 
-from curses.ascii import isdigit
-import pandas as pd 
+import argparse
+import os
+import time
+import pandas as pd
 from os import listdir
 import config
+import schema
+from instrument import RunLog
+from manifest import Manifest, fingerprint, hash_frame
 from rich import print
 
 # Path to data (centralized in config.py)
 path_raw_data = config.PATH_RAW_EXTEND + ""  # To read
 path_proc_data = config.PATH_PROC_IND + ""   # To write (estimation reads from here)
 
-print("[bold blue]Loading data...")
-file_list = [f for f in listdir(path_raw_data) if ".csv" in f]
-file_names = [f.split(".")[0] for f in file_list]
-data_dict = {}
-# Load all datafiles
-for i in range(len(file_list)):
-    try:
-        file = file_list[i]
-        file_name = file_names[i]
-        data = pd.read_csv(path_raw_data + file, sep=";") 
-        data.drop(columns=['TableName', 'LineNumber', 'METRIC_NAME', 'CL_UNIT', 'UNIT_MULT', "LineDescription"], inplace=True)
-        data.rename(columns=lambda x: x.split("_")[-1], inplace=True)
-        data["BEAIND"] = data.SeriesCode.apply(lambda x: x[3:7] )
-        data.drop(columns=['SeriesCode'], inplace=True)
-        print("[bold green] Loaded [bold white] {}".format(file))
-        data_dict[file_name] = data
-    except:
-        print("[bold red]Error loading {}".format(file))
-        continue
-print("[bold green] Data loaded.")
-
-# Get list of years
-years = data_dict[list(data_dict.keys())[0]].columns.to_list()[0:-1]
-years.sort()
-print("Data Available for {} years".format(len(years)))
-# print(years)
-# Get list of BEAINDs
-beainds = list(data_dict[list(data_dict.keys())[0]].BEAIND)
-# Create list of file names
-file_names = ["capital_" + bi + ".csv" for bi in beainds]
-
-print("[bold blue] Creating dataframes...")
-dict_ind = {
-    bi : {
-        "year" : years,
-    }
-    for bi in beainds
-}
-
-# Create dataframes for each BEAIND
-for (name, data) in data_dict.items():
-    for bi in beainds:
-        data_name = bi
-        col = data[data.BEAIND == bi][years].iloc[0].to_list()
-        col_name = name
-        dict_ind[bi][col_name] = list( map( lambda x : x.replace(",", "."), col ) )
-
-print("[bold green] Dataframes created.")
-
-# Save dataframes to csv
-print("[bold blue] Saving dataframes...")
-for (name, file_name) in zip(beainds, file_names):
-    try:
-        df = pd.DataFrame(dict_ind[name])
-        df.to_csv(path_proc_data + file_name, sep=";", index=False)
-        print("[bold green] Saved {}".format(file_name))
-    except:
-        print("[bold red]Error saving {}".format(file_name))
-        continue
-print("[bold green] Dataframes saved.")
\ No newline at end of file
+# Metadata columns of the raw BEA tables that are not needed downstream
+DROP_COLUMNS = ['TableName', 'LineNumber', 'METRIC_NAME', 'CL_UNIT', 'UNIT_MULT', "LineDescription"]
+
+
+def load_tables(path_raw):
+    """Load every raw BEA table in `path_raw` keyed by file name.
+
+    Values are read as text so that the decimal-comma strings written by the
+    R fetcher are kept verbatim until they are parsed in `reshape_tables`.
+    """
+    file_list = [f for f in listdir(path_raw) if ".csv" in f]
+    data_dict = {}
+    for file in file_list:
+        try:
+            data = pd.read_csv(path_raw + file, sep=";", dtype=str)
+            data.drop(columns=DROP_COLUMNS, inplace=True)
+            data.rename(columns=lambda x: x.split("_")[-1], inplace=True)
+            data["BEAIND"] = data.SeriesCode.str[3:7]
+            data.drop(columns=['SeriesCode'], inplace=True)
+            print("[bold green] Loaded [bold white] {}".format(file))
+            data_dict[file.split(".")[0]] = data
+        except Exception:
+            print("[bold red]Error loading {}".format(file))
+            continue
+    return data_dict
+
+
+def reshape_tables(data_dict):
+    """Reshape all tables into one (BEAIND, year) x table frame.
+
+    The tables are stacked into a single long series indexed by
+    (table, BEAIND, year), decimal commas are replaced in one vectorized
+    pass and the table level is unstacked into columns, which are then
+    parsed as numbers with the canonical dtypes of `schema`. Only the first
+    row of each BEAIND within a table is used and the years and industries
+    are taken from the first table loaded.
+    """
+    first = data_dict[list(data_dict.keys())[0]]
+    years = sorted(first.columns.to_list()[0:-1])
+    beainds = list(dict.fromkeys(first.BEAIND))
+
+    long = (
+        pd.concat(data_dict, names=["table", None])
+        .reset_index(level="table")
+        .drop_duplicates(subset=["table", "BEAIND"], keep="first")
+        .melt(id_vars=["table", "BEAIND"], value_vars=years, var_name="year")
+        .set_index(["table", "BEAIND", "year"])["value"]
+    )
+    long = long.str.replace(",", ".", regex=False)
+
+    wide = long.unstack("table").reindex(columns=list(data_dict.keys()))
+    wide = wide.reindex(pd.MultiIndex.from_product([beainds, years], names=["BEAIND", "year"]))
+    wide.columns.name = None
+    return schema.enforce(wide), years, beainds
+
+
+def save_industries(wide, path_proc, manifest=None, run=None):
+    """Write one `capital_{BEAIND}.csv` per industry from a single groupby.
+
+    With a manifest, industries whose data did not change since the last
+    run are not rewritten. With a RunLog, every industry is recorded as a unit.
+    Returns the paths written or left unchanged and the number of files whose
+    save failed.
+    """
+    n_skipped = 0
+    saved, n_failed = [], 0
+    for bi, df in wide.groupby(level="BEAIND", sort=False, observed=True):
+        file_name = "capital_" + bi + ".csv"
+        start = time.perf_counter()
+        status = "ok"
+        try:
+            df = df.droplevel("BEAIND").reset_index()
+            fp = fingerprint(files=[__file__], data=hash_frame(df))
+            if manifest is not None and not manifest.is_stale(path_proc + file_name, fp):
+                n_skipped += 1
+                status = "unchanged"
+                saved.append(path_proc + file_name)
+                continue
+            schema.write_csv(df, path_proc + file_name, sep=";", index=False)
+            if manifest is not None:
+                manifest.record(path_proc + file_name, fp, [path_proc + file_name])
+            saved.append(path_proc + file_name)
+            print("[bold green] Saved {}".format(file_name))
+        except Exception:
+            status = "error"
+            n_failed += 1
+            print("[bold red]Error saving {}".format(file_name))
+            continue
+        finally:
+            if run is not None:
+                run.unit(bi, time.perf_counter() - start, rows=len(df), status=status)
+    if n_skipped:
+        print("[bold green] {} industries unchanged.".format(n_skipped))
+    return saved, n_failed
+
+
+def main(path_raw=path_raw_data, path_proc=path_proc_data, force=False):
+    with RunLog("process_capital_data") as run:
+        # Skip the whole stage when no raw table changed and all outputs exist
+        # in the output directory (one entry per raw/output directory pair)
+        manifest = Manifest("process_capital_data", force=force)
+        raw_files = sorted(path_raw + f for f in listdir(path_raw) if ".csv" in f)
+        stage_fp = fingerprint(files=[__file__] + raw_files)
+        stage_unit = "{} -> {}".format(path_raw, path_proc)
+        if not manifest.is_stale(stage_unit, stage_fp):
+            print("[bold green]Raw tables unchanged since the last run; nothing to do.")
+            return
+
+        print("[bold blue]Loading data...")
+        with run.step("load") as step:
+            data_dict = load_tables(path_raw)
+            step.rows_out = run.rows_in = sum(len(df) for df in data_dict.values())
+        print("[bold green] Data loaded.")
+
+        print("[bold blue] Creating dataframes...")
+        with run.step("reshape") as step:
+            start = time.perf_counter()
+            wide, years, beainds = reshape_tables(data_dict)
+            elapsed = time.perf_counter() - start
+            n_rows = wide.size
+            step.rows_in, step.rows_out = run.rows_in, len(wide)
+        print("Data Available for {} years".format(len(years)))
+        print("[bold green] Dataframes created.")
+        print("Reshaped {:,} rows ({} tables x {} industries x {} years) in {:.3f}s ({:,.0f} rows/s)".format(
+            n_rows, len(data_dict), len(beainds), len(years), elapsed, n_rows / max(elapsed, 1e-9)))
+
+        # Save dataframes to csv
+        print("[bold blue] Saving dataframes...")
+        with run.step("save") as step:
+            saved, n_failed = save_industries(wide, path_proc, manifest, run)
+            step.rows_in = run.rows_out = len(wide)
+        print("[bold green] Dataframes saved.")
+
+        if n_failed:
+            # Keep the stage stale so the failed files are retried on the next run
+            print("[bold red]{} industries could not be saved.".format(n_failed))
+            manifest.forget(stage_unit)
+        else:
+            manifest.record(stage_unit, stage_fp, saved)
+        manifest.save()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Reshape raw BEA capital tables into per-industry files.")
+    parser.add_argument("--raw", default=path_raw_data, help="Directory with the raw BEA tables")
+    parser.add_argument("--out", default=path_proc_data, help="Directory to write capital_{BEAIND}.csv files")
+    parser.add_argument("--force", action="store_true", help="Rebuild every industry even if its inputs are unchanged")
+    args = parser.parse_args()
+    main(path_raw=os.path.join(args.raw, ""), path_proc=os.path.join(args.out, ""), force=args.force)
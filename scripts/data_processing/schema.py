@@ -0,0 +1,107 @@
+"""
+Canonical dtypes of the ETL frames.
+
+Every reader and writer in scripts/data_processing goes through this module,
+so the same column has the same dtype in every stage:
+- industry codes (BEAIND, Production Account Codes, KLEMS/BEA codes, the
+  store's `industry` column) are categoricals of their string values, read as
+  text so codes like "0110" keep their leading zeros;
+- years (YEAR, year, date) are int16;
+- values are float64; integer columns (counts) are kept as they are.
+  In-memory frames whose values are only summarized can use
+  `float_dtype=np.float32`; files read by the Julia estimator (data/proc/ind)
+  stay float64 so their values are written unchanged.
+
+    df = schema.read_csv("./data/interim/ind_labor/22.csv")   # enforced on read
+    schema.write_csv(df, path)                                  # enforced on write
+"""
+
+import numpy as np
+import pandas as pd
+
+CODE_COLUMNS = ["BEAIND", "Production Account Codes", "2007 NAICS codes", "code", "code_klems",
+                "code_bea", "code_census", "industry"]
+YEAR_COLUMNS = ["YEAR", "year", "date"]
+
+CODE_DTYPE = "category"
+YEAR_DTYPE = np.int16
+FLOAT_DTYPE = np.float64
+
+
+def dtype_for(column):
+    """Canonical dtype of `column`, or None for columns that are left as read."""
+    if column in CODE_COLUMNS:
+        return CODE_DTYPE
+    if column in YEAR_COLUMNS:
+        return YEAR_DTYPE
+    return None
+
+
+def to_years(values):
+    """Years as int16 from ints, floats or strings such as "1987" or "1987-01-01"."""
+    values = pd.Series(values) if not isinstance(values, (pd.Series, pd.Index)) else values
+    if values.dtype == object or pd.api.types.is_string_dtype(values.dtype):
+        values = values.astype(str).str[:4]
+    return values.astype(int).astype(YEAR_DTYPE)
+
+
+def to_codes(values):
+    """Industry codes as a categorical of stripped strings (missing codes stay NaN)."""
+    values = pd.Series(values) if not isinstance(values, (pd.Series, pd.Index)) else values
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        return values
+    text = values.where(values.isna(), values.astype(str).str.strip())
+    return text.astype(CODE_DTYPE)
+
+
+def enforce(df, numeric=True, float_dtype=FLOAT_DTYPE):
+    """Cast the columns (and index levels) of `df` to their canonical dtypes.
+
+    Code columns become categoricals and year columns int16. With `numeric`,
+    float columns and text columns that parse as numbers become `float_dtype`;
+    other text (descriptions, or values with decimal commas that were not
+    replaced) is left as is. Returns a new frame.
+    """
+    df = df.copy(deep=False)
+    for column in df.columns:
+        dtype = dtype_for(column)
+        if dtype == CODE_DTYPE:
+            df[column] = to_codes(df[column])
+        elif dtype == YEAR_DTYPE and df[column].dtype != YEAR_DTYPE:
+            df[column] = to_years(df[column])
+        elif numeric and pd.api.types.is_float_dtype(df[column].dtype):
+            if df[column].dtype != float_dtype:
+                df[column] = df[column].astype(float_dtype)
+        elif numeric and (pd.api.types.is_object_dtype(df[column].dtype)
+                          or pd.api.types.is_string_dtype(df[column].dtype)):
+            try:
+                df[column] = pd.to_numeric(df[column]).astype(float_dtype)
+            except (ValueError, TypeError):
+                pass
+    if isinstance(df.index, pd.MultiIndex):
+        df.index = df.index.set_levels(
+            [_index_level(level) for level in df.index.levels], level=range(df.index.nlevels))
+    else:
+        df.index = _index_level(df.index)
+    return df
+
+
+def _index_level(index):
+    dtype = dtype_for(index.name)
+    if dtype == CODE_DTYPE:
+        return pd.Index(to_codes(pd.Series(index)), name=index.name)
+    if dtype == YEAR_DTYPE:
+        return pd.Index(to_years(pd.Series(index)), name=index.name)
+    return index
+
+
+def read_csv(path, numeric=True, float_dtype=FLOAT_DTYPE, **kwargs):
+    """`pd.read_csv` with the canonical dtypes (codes are read as text first)."""
+    dtype = {column: str for column in CODE_COLUMNS}
+    dtype.update(kwargs.pop("dtype", {}))
+    return enforce(pd.read_csv(path, dtype=dtype, **kwargs), numeric=numeric, float_dtype=float_dtype)
+
+
+def write_csv(df, path, numeric=True, **kwargs):
+    """Enforce the canonical dtypes, then `df.to_csv(path, **kwargs)`."""
+    enforce(df, numeric=numeric).to_csv(path, **kwargs)
@@ -0,0 +1,105 @@
+"""
+Batched OLS trend statistics (regressions of a variable on year).
+
+Series are stacked in one array whose last axis is the year, e.g.
+(industry, variable, year); every other axis indexes an independent
+regression. Slopes, intercepts, standard errors and R^2 for all series are
+computed in a single vectorized pass. The arithmetic follows
+`scipy.stats.linregress` step by step, so for series on a common year grid the
+results match it to the last bit.
+
+Missing data:
+- `observed` marks which (series, year) cells exist at all (e.g. padding for
+  industries with shorter samples, or the years inside a sub-period window).
+- NaN values in observed cells propagate to the result like in `linregress`,
+  unless `dropna=True`, in which case they are left out of the regression.
+
+Rolling-window and sub-period slopes are the same computation with an extra
+window axis, see `window_masks`:
+
+    masks = window_masks(years, [(1987, 2000), (2001, 2018)])   # (W, T)
+    stats = trend_stats(years, values[..., None, :], observed=masks)
+"""
+
+import numpy as np
+
+
+def trend_stats(years, values, observed=None, dropna=False):
+    """OLS of `values` on `years` for every series along the last axis.
+
+    Args:
+        years: array of shape (T,).
+        values: array of shape (..., T).
+        observed: optional boolean array broadcastable against `values`;
+            cells that are False are excluded from the regression.
+        dropna: if True, NaN values are excluded like unobserved cells;
+            otherwise a NaN makes every statistic of its series NaN.
+
+    Returns:
+        dict of arrays shaped like the broadcast inputs without the year
+        axis: "slope", "intercept", "rvalue", "r2", "stderr",
+        "intercept_stderr" and "nobs". Series with fewer than two
+        observations are NaN.
+    """
+    years = np.asarray(years, dtype=float)
+    values = np.asarray(values, dtype=float)
+    if observed is None:
+        observed = np.ones(values.shape, dtype=bool)
+    observed = np.asarray(observed, dtype=bool)
+    shape = np.broadcast_shapes(values.shape, observed.shape)
+    values = np.broadcast_to(values, shape)
+    observed = np.broadcast_to(observed, shape)
+    x = np.broadcast_to(years, shape)
+
+    valid = observed & ~np.isnan(values)
+    has_nan = (observed & np.isnan(values)).any(axis=-1)
+    n = valid.sum(axis=-1)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        xmean = np.where(valid, x, 0.0).sum(axis=-1) / n
+        ymean = np.where(valid, values, 0.0).sum(axis=-1) / n
+
+        # Centered data, stacked as (..., 2, T) so one matmul gives every
+        # 2x2 second-moment matrix, the same product np.cov forms in linregress
+        xm = np.where(valid, x - xmean[..., None], 0.0)
+        ym = np.where(valid, values - ymean[..., None], 0.0)
+        z = np.stack([xm, ym], axis=-2)
+        cov = np.matmul(z, np.swapaxes(z, -1, -2)) * (1.0 / n)[..., None, None]
+        ssxm, ssxym, ssym = cov[..., 0, 0], cov[..., 0, 1], cov[..., 1, 1]
+
+        degenerate = (ssxm == 0.0) | (ssym == 0.0)
+        r = np.where(degenerate, np.where(ssxym == 0, np.nan, 0.0), ssxym / np.sqrt(ssxm * ssym))
+        r = np.clip(r, -1.0, 1.0)
+
+        slope = ssxym / ssxm
+        intercept = ymean - slope * xmean
+        stderr = np.where(n == 2, 0.0, np.sqrt((1 - r**2) * ssym / ssxm / (n - 2)))
+        intercept_stderr = np.where(n == 2, 0.0, stderr * np.sqrt(ssxm + xmean**2))
+
+    stats = {
+        "slope": slope,
+        "intercept": intercept,
+        "rvalue": r,
+        "r2": r**2,
+        "stderr": stderr,
+        "intercept_stderr": intercept_stderr,
+    }
+    undefined = n < 2
+    if not dropna:
+        undefined = undefined | has_nan
+    for key in stats:
+        stats[key] = np.where(undefined, np.nan, stats[key])
+    stats["nobs"] = n
+    return stats
+
+
+def window_masks(years, windows):
+    """Boolean (W, T) masks selecting the years of each (start, end) window (inclusive)."""
+    years = np.asarray(years)
+    return np.array([(years >= start) & (years <= end) for (start, end) in windows], dtype=bool)
+
+
+def rolling_windows(years, length):
+    """All (start, end) windows of `length` consecutive years within `years`."""
+    years = np.unique(np.asarray(years))
+    return [(int(y), int(y) + length - 1) for y in years if y + length - 1 <= years.max()]
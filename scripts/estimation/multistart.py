@@ -0,0 +1,409 @@
+"""
+Resumable multi-start estimation sweeps over industries and starting values.
+
+The work list is every (industry, start) of the grid of starting values
+(config.MULTISTART_GRID, or --grid) that has no row yet in
+data/results/{IND}.csv, so an interrupted sweep picks up exactly the starts
+it had not recorded. Units are handed out one at a time to a pool of local
+Julia workers (estimation/multistart_worker.jl), each of which loads the
+model once and then estimates one start after another; a worker that
+finishes takes the next unit right away, so no core idles while work is
+left.
+
+Only this process writes the results: every finished start is appended to
+its industry's file by writing a copy next to it and swapping it in, so the
+file always holds complete rows, also after a crash. A worker that dies or
+exceeds --timeout is restarted and its unit retried up to --retries times.
+Each sweep writes a run log (data/logs/runs/multistart/) with one unit per
+start.
+
+Runs stop early (see StartMonitor in estimation/do_estimation.jl) when their
+objective stays well above the best one recorded for the industry
+("dominated") or when they approach a minimizer that was already found
+("duplicate"). Every row records its `stop_reason` (converged, maxiter,
+dominated, duplicate or failed) and the `cluster` of its minimizer: the
+converged minimizers of an industry are grouped so that minimizers within
+--cluster-tol of each other (relative, per parameter) share a cluster id.
+The best start, and so the reported fit, comes from converged runs as before.
+
+Usage (from the repository root):
+    python scripts/estimation/multistart.py --workers 8                     # all industries in data/proc/ind
+    python scripts/estimation/multistart.py 22 323 --grid eta_0=0.01,0.3 --tol 0.005
+    python scripts/estimation/multistart.py --list                          # pending starts per industry
+    python scripts/estimation/multistart.py --workers 8 --store             # also rebuild the results store
+    python scripts/estimation/multistart.py --workers 8 --no-early-stop     # full iteration budget for every start
+"""
+
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+sys.path.append(str(Path(__file__).parent.parent / "data_processing"))
+
+import argparse
+import itertools
+import os
+import queue
+import shlex
+import subprocess
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+from rich import print
+
+import config
+from fit_stats import PARAMETERS, START_COLUMNS
+from instrument import RunLog
+
+# Columns of data/results/{IND}.csv, in the order estimation/do_estimation.jl writes them
+RESULT_COLUMNS = START_COLUMNS + PARAMETERS + ["fit_rr", "fit_wbr", "fit_lbr", "fit_sp", "obj_val", "tol",
+                                                "stop_reason", "cluster"]
+# Columns added after the first sweeps; older files get them (blank) on their next append
+ADDED_COLUMNS = ["stop_reason", "cluster"]
+# The parameters Nelder-Mead moves (eta and phi_H are fixed), compared to cluster minimizers
+MINIMIZER_COLUMNS = ["alpha", "sigma", "rho", "mu", "lambda", "phi_L"]
+# Stop reasons of runs that ended at a minimizer (blank: written before stop reasons were recorded)
+CLUSTERED_REASONS = ["converged", "duplicate", ""]
+EARLY_STOP = {"margin": 0.5, "stall": 0.01, "window": 20, "warmup": 50, "cluster_tol": 0.01}
+KEY_DIGITS = 10  # starts are matched on values rounded to this many digits
+
+
+class WorkerError(RuntimeError):
+    """A worker process died, timed out or answered out of protocol."""
+
+
+def starting_grid(grid=None):
+    """Starting values (tuples in START_COLUMNS order) of the product of `grid`.
+
+    Starts with sigma_0 <= rho_0 are dropped, as in estimation/runfile_ind.jl.
+    """
+    grid = grid or config.MULTISTART_GRID
+    starts = itertools.product(*(grid[c] for c in START_COLUMNS))
+    sigma, rho = START_COLUMNS.index("sigma_0"), START_COLUMNS.index("rho_0")
+    return [tuple(float(v) for v in s) for s in starts if s[sigma] > s[rho]]
+
+
+def unit_key(start, tol):
+    return tuple(round(float(v), KEY_DIGITS) for v in (*start, tol))
+
+
+def results_path(industry, results_dir=None):
+    return os.path.join(results_dir or config.PATH_RESULTS, f"{industry}.csv")
+
+
+def recorded_keys(industry, results_dir=None):
+    """Keys of the (start, tol) already recorded for `industry`, failed estimations included."""
+    path = results_path(industry, results_dir)
+    if not os.path.isfile(path):
+        return set()
+    recorded = pd.read_csv(path, usecols=START_COLUMNS + ["tol"], float_precision="round_trip")
+    return {unit_key(row[:-1], row[-1]) for row in recorded.itertuples(index=False)}
+
+
+def pending_units(industries, starts, tol, results_dir=None):
+    """(industry, start, tol) units of the sweep that are not recorded yet, in industry order."""
+    units = []
+    for industry in industries:
+        done = recorded_keys(industry, results_dir)
+        units += [(industry, start, tol) for start in starts if unit_key(start, tol) not in done]
+    return units
+
+
+def same_minimum(x, centers, tol):
+    """(n, k) booleans: row i of `x` is within `tol` of center j, relative to max(|center|, 1) per parameter."""
+    x, centers = np.atleast_2d(x), np.atleast_2d(centers)
+    scale = np.maximum(np.abs(centers), 1.0)
+    return (np.abs(x[:, None, :] - centers[None, :, :]) <= tol * scale[None]).all(axis=2)
+
+
+def cluster_minimizers(x, obj, tol, ids=None):
+    """Cluster ids of the minimizers `x` (n, parameters) with objectives `obj`.
+
+    Leader clustering in order of objective: a minimizer joins the cluster of
+    the first leader (the best member of a cluster) within `tol`, and starts a
+    new cluster otherwise. Entries of `ids` that are >= 0 are kept, so new
+    minimizers are added to existing clusters without renumbering them.
+    """
+    x, obj = np.asarray(x, dtype=float), np.asarray(obj, dtype=float)
+    ids = np.full(len(x), -1) if ids is None else np.asarray(ids, dtype=int).copy()
+    for i in np.argsort(obj, kind="stable"):
+        if ids[i] >= 0:
+            continue
+        known = np.flatnonzero(ids >= 0)
+        leaders = [known[ids[known] == c][np.argmin(obj[known][ids[known] == c])] for c in np.unique(ids[known])]
+        hit = same_minimum(x[i], x[leaders], tol)[0] if leaders else np.zeros(0, dtype=bool)
+        ids[i] = ids[leaders[int(np.argmax(hit))]] if hit.any() else (ids.max() + 1 if len(known) else 0)
+    return ids
+
+
+def _format(value):
+    """Text of one field, written like Julia's CSV.write (NaN, Inf, shortest round-trip floats)."""
+    if isinstance(value, (str, int, np.integer)):
+        return str(value)
+    if value is None:
+        return ""
+    value = float(value)
+    if np.isnan(value):
+        return "NaN"
+    if np.isinf(value):
+        return "Inf" if value > 0 else "-Inf"
+    return repr(value)
+
+
+def append_result(industry, values, results_dir=None, cluster_tol=EARLY_STOP["cluster_tol"]):
+    """Append one row to data/results/{industry}.csv atomically (copy, append, rename).
+
+    `values` are the columns of RESULT_COLUMNS up to stop_reason; the cluster
+    is assigned here from the rows already in the file. A file written before
+    stop reasons were recorded gets the new columns, with the clusters of its
+    rows filled in. Returns the cluster id (None if the run did not converge).
+    """
+    path = results_path(industry, results_dir)
+    row = dict(zip(RESULT_COLUMNS, values))
+    if os.path.isfile(path):
+        with open(path) as f:
+            lines = f.read().splitlines()
+        recorded = pd.read_csv(path, float_precision="round_trip", keep_default_na=False,
+                               na_values=["", "NaN", "nan"], dtype={"stop_reason": str})
+    else:
+        lines, recorded = [",".join(RESULT_COLUMNS)], pd.DataFrame(columns=RESULT_COLUMNS)
+
+    missing = [c for c in ADDED_COLUMNS if c not in recorded.columns]
+    for column in missing:
+        recorded[column] = "" if column == "stop_reason" else np.nan
+    recorded = pd.concat([recorded, pd.DataFrame([row])], ignore_index=True)
+    reason = recorded["stop_reason"].fillna("").astype(str)
+    clustered = (reason.isin(CLUSTERED_REASONS) & np.isfinite(recorded["obj_val"].astype(float))).to_numpy()
+    ids = recorded["cluster"].fillna(-1).astype(int).to_numpy().copy()
+    ids[clustered] = cluster_minimizers(recorded.loc[clustered, MINIMIZER_COLUMNS], recorded.loc[clustered, "obj_val"],
+                                        cluster_tol, ids[clustered])
+    cluster = int(ids[-1]) if clustered[-1] else None
+
+    if missing:
+        # Rewrite the old rows with the added columns; their values are kept as written
+        lines[0] += "," + ",".join(missing)
+        for i in range(1, len(lines)):
+            extra = {"stop_reason": "", "cluster": str(ids[i - 1]) if clustered[i - 1] else ""}
+            lines[i] += "," + ",".join(extra[c] for c in missing)
+    row["cluster"] = cluster
+    lines.append(",".join(_format(row[c]) for c in RESULT_COLUMNS))
+
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        f.write("\n".join(lines) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+    return cluster
+
+
+class JuliaWorker:
+    """One estimator process that answers `estimate` calls over stdin/stdout."""
+
+    def __init__(self, command, log=None, timeout=None):
+        self.timeout = timeout
+        self.proc = subprocess.Popen(command, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                     stderr=log or subprocess.DEVNULL, text=True, bufsize=1, cwd=config.ROOT)
+        # Loading the packages and the model can take minutes; wait without a timeout
+        self._read("READY")
+
+    def _read(self, prefix, timeout=None):
+        timer = threading.Timer(timeout, self.proc.kill) if timeout else None
+        if timer:
+            timer.start()
+        try:
+            for line in self.proc.stdout:
+                if line.startswith(prefix):
+                    return line.rstrip("\n")
+        finally:
+            if timer:
+                timer.cancel()
+        code = self.proc.wait()
+        raise WorkerError(f"worker exited with code {code}" + (" (timeout)" if code == -9 and timeout else ""))
+
+    def estimate(self, industry, start, tol):
+        """Estimate one start; returns the values of its results row."""
+        try:
+            self.proc.stdin.write(",".join([industry] + [repr(float(v)) for v in (*start, tol)]) + "\n")
+            self.proc.stdin.flush()
+        except (BrokenPipeError, OSError) as e:
+            raise WorkerError(f"worker is gone: {e}") from e
+        fields = self._read("RESULT,", self.timeout).split(",")[1:]
+        if len(fields) != len(RESULT_COLUMNS) - 1:
+            raise WorkerError(f"expected {len(RESULT_COLUMNS) - 1} values, got {len(fields)}")
+        return [float(v) for v in fields[:-1]] + [fields[-1]]
+
+    def close(self):
+        if self.proc.poll() is None:
+            try:
+                self.proc.stdin.close()
+                self.proc.wait(timeout=10)
+            except (OSError, subprocess.TimeoutExpired):
+                self.proc.kill()
+                self.proc.wait()
+
+    def kill(self):
+        if self.proc.poll() is None:
+            self.proc.kill()
+            self.proc.wait()
+
+
+def run_sweep(units, command, workers=1, timeout=None, retries=1, results_dir=None, run=None, log=None,
+              cluster_tol=EARLY_STOP["cluster_tol"]):
+    """Estimate `units` on `workers` Julia processes and record each finished row.
+
+    Returns a dict of counts per stop reason of the recorded rows, plus
+    "error" for starts that were not recorded because the worker failed on
+    every attempt.
+    """
+    todo = queue.Queue()
+    done = queue.Queue()
+    for unit in units:
+        todo.put((unit, 0))
+    alive = []
+    lock = threading.Lock()
+
+    def work():
+        worker = None
+        while True:
+            item = todo.get()
+            if item is None:
+                break
+            (industry, start, tol), attempt = item
+            t0 = time.perf_counter()
+            try:
+                if worker is None:
+                    worker = JuliaWorker(command, log=log, timeout=timeout)
+                    with lock:
+                        alive.append(worker)
+                values = worker.estimate(industry, start, tol)
+                done.put((item, values, time.perf_counter() - t0, None))
+            except (WorkerError, OSError) as e:
+                if worker is not None:
+                    worker.kill()
+                    with lock:
+                        alive.remove(worker)
+                worker = None
+                done.put((item, None, time.perf_counter() - t0, e))
+        if worker is not None:
+            worker.close()
+
+    threads = [threading.Thread(target=work, daemon=True) for _ in range(min(workers, len(units)))]
+    for t in threads:
+        t.start()
+
+    counts = {}
+    remaining = len(units)
+    try:
+        while remaining:
+            ((industry, start, tol), attempt), values, seconds, error = done.get()
+            if error is not None and attempt < retries:
+                print(f"[bold yellow]{industry} {start}: {error}; retrying ({attempt + 1}/{retries})")
+                todo.put(((industry, start, tol), attempt + 1))
+                continue
+            remaining -= 1
+            cluster, obj_val = None, None
+            if error is not None:
+                status = "error"
+                print(f"[bold red]{industry} {start}: {error}")
+            else:
+                cluster = append_result(industry, values, results_dir, cluster_tol=cluster_tol)
+                status = values[RESULT_COLUMNS.index("stop_reason")]
+                obj_val = values[RESULT_COLUMNS.index("obj_val")]
+                obj_val = obj_val if np.isfinite(obj_val) else None
+            counts[status] = counts.get(status, 0) + 1
+            if run is not None:
+                run.unit(industry, seconds, status=status, start=list(start), tol=tol, attempts=attempt + 1,
+                         obj_val=obj_val, cluster=cluster)
+            print(f"[{len(units) - remaining}/{len(units)}] {industry} {status}"
+                  + (f" (cluster {cluster})" if cluster is not None else "") + f" ({seconds:.1f}s)")
+    except KeyboardInterrupt:
+        print(f"[bold red]Interrupted; {remaining} starts not recorded (they are rerun by the next sweep)")
+        raise
+    finally:
+        for _ in threads:
+            todo.put(None)
+        if remaining:
+            with lock:
+                for worker in alive:
+                    worker.kill()
+        for t in threads:
+            t.join(timeout=10)
+    return counts
+
+
+def parse_grid(items):
+    """--grid overrides like "eta_0=0.01,0.3" on top of config.MULTISTART_GRID."""
+    grid = dict(config.MULTISTART_GRID)
+    for item in items:
+        column, _, values = item.partition("=")
+        if column not in START_COLUMNS or not values:
+            raise ValueError(f"bad --grid {item!r}; expected COLUMN=V1,V2 with COLUMN one of {', '.join(START_COLUMNS)}")
+        grid[column] = [float(v) for v in values.split(",")]
+    return grid
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a resumable multi-start estimation sweep.")
+    parser.add_argument("industries", nargs="*", help="KLEMS industry codes (default: every file in data/proc/ind)")
+    parser.add_argument("--grid", nargs="+", default=[], metavar="COLUMN=V1,V2",
+                        help="Starting values replacing those of config.MULTISTART_GRID for a column")
+    parser.add_argument("--tol", type=float, default=config.MULTISTART_TOL, help="Nelder-Mead tolerance")
+    parser.add_argument("--workers", type=int, default=1, help="Number of Julia worker processes")
+    parser.add_argument("--timeout", type=float, default=None, help="Seconds allowed per start")
+    parser.add_argument("--retries", type=int, default=1, help="Retries of a start whose worker died or timed out")
+    parser.add_argument("--julia", default=f"{config.JULIA_CMD} --project={config.ROOT} {config.MULTISTART_WORKER}",
+                        help="Command that starts one worker")
+    parser.add_argument("--list", action="store_true", help="List the pending starts per industry and exit")
+    parser.add_argument("--store", action="store_true", help="Rebuild the Parquet results store after the sweep")
+    parser.add_argument("--no-early-stop", action="store_true", help="Run every start to convergence or maxiter")
+    parser.add_argument("--margin", type=float, default=EARLY_STOP["margin"],
+                        help="Stop a run whose objective is this much (relative) above the industry's best ...")
+    parser.add_argument("--stall", type=float, default=EARLY_STOP["stall"],
+                        help="... and fell by less than this (relative) over the last --window iterations")
+    parser.add_argument("--window", type=int, default=EARLY_STOP["window"])
+    parser.add_argument("--warmup", type=int, default=EARLY_STOP["warmup"], help="Iterations before a run can be stopped")
+    parser.add_argument("--cluster-tol", type=float, default=EARLY_STOP["cluster_tol"],
+                        help="Relative distance per parameter under which two minimizers are the same")
+    args = parser.parse_args()
+
+    industries = args.industries or sorted(f.stem for f in Path(config.PATH_PROC_IND).glob("*.csv"))
+    try:
+        starts = starting_grid(parse_grid(args.grid))
+    except ValueError as e:
+        parser.error(str(e))
+    units = pending_units(industries, starts, args.tol)
+
+    if args.list:
+        pending = pd.Series([u[0] for u in units], dtype=object).value_counts()
+        for industry in industries:
+            print(f"{industry:<8} {pending.get(industry, 0):>4} of {len(starts)} starts pending")
+        sys.exit(0)
+
+    print(f"[bold]{len(units)} of {len(industries) * len(starts)} starts pending "
+          f"({len(industries)} industries x {len(starts)} starts), {args.workers} workers")
+    if not units:
+        sys.exit(0)
+
+    with RunLog("multistart") as run:
+        run.info.update(workers=args.workers, tol=args.tol, industries=industries, n_starts=len(starts))
+        run.rows_in = len(units)
+        os.makedirs(run.path, exist_ok=True)
+        early_stop = {"margin": args.margin, "stall": args.stall, "window": args.window, "warmup": args.warmup,
+                      "cluster_tol": args.cluster_tol}
+        run.info["early_stop"] = None if args.no_early_stop else early_stop
+        command = shlex.split(args.julia) + (["early_stop=false"] if args.no_early_stop else
+                                             [f"{k}={v}" for k, v in early_stop.items()])
+        with open(os.path.join(run.path, f"{run.run_id}.workers.log"), "w") as log, run.step("estimate"):
+            counts = run_sweep(units, command, workers=args.workers, timeout=args.timeout,
+                               retries=args.retries, run=run, log=log, cluster_tol=args.cluster_tol)
+        errors = counts.pop("error", 0)
+        run.rows_out = sum(counts.values())
+        print(f"[bold green]Recorded {run.rows_out} starts: "
+              + ", ".join(f"{n} {reason}" for reason, n in sorted(counts.items()))
+              + (f"; [bold red]{errors} starts not recorded" if errors else ""))
+        if args.store:
+            from industry_store import build_store
+            with run.step("store"):
+                build_store("results")